@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.api.v1.auth import require_roles
-from app.database import get_db
+from app.database import get_async_engine, get_db, get_engine, pool_stats
 from app.crud import get_user_by_email, update_user_role
 from app.exceptions import NotFoundError, BadRequestError
 
@@ -27,3 +27,9 @@ def promote_user(
     updated_user = update_user_role(db, user.id, new_role)
 
     return {"id": str(updated_user.id), "email": updated_user.email, "role": updated_user.role}
+
+
+@router.get("/db/pool")
+def get_pool_stats(user_role: str = Depends(require_roles("admin", "service"))):
+    """Connection pool occupancy and checkout/wait metrics. Requires admin or service role."""
+    return {"sync": pool_stats(get_engine()), "async": pool_stats(get_async_engine())}
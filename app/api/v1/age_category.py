@@ -1,25 +1,23 @@
 # api/v1/age_category.py
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app import schemas, models
-from app.database import get_db
+from app import schemas
 from app.exceptions import NotFoundError
+from app.http_cache import reference_cache
+from app.reference_data import reference_data
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[schemas.AgeCategoryOut])
-def get_age_categories(db: Session = Depends(get_db)):
+@router.get("/", response_model=list[schemas.AgeCategoryOut], dependencies=[Depends(reference_cache)])
+def get_age_categories():
     """Get all age categories. Public endpoint."""
-    return db.query(models.AgeCategory).all()
+    return reference_data.get().age_categories
 
 
-@router.get("/{age_category_id}", response_model=schemas.AgeCategoryOut)
-def get_age_category(age_category_id: int, db: Session = Depends(get_db)):
+@router.get("/{age_category_id}", response_model=schemas.AgeCategoryOut, dependencies=[Depends(reference_cache)])
+def get_age_category(age_category_id: int):
     """Get an age category by ID. Public endpoint."""
-    age_category = db.query(models.AgeCategory).filter(
-        models.AgeCategory.id == age_category_id
-    ).first()
+    age_category = reference_data.get().age_category(age_category_id)
     if age_category is None:
         raise NotFoundError("Age category", age_category_id)
     return age_category
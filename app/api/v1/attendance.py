@@ -0,0 +1,101 @@
+# api/v1/attendance.py
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+from app import attendance, crud, schemas
+from app.database import get_db
+from app.api.v1.auth import require_roles
+from app.exceptions import BadRequestError
+
+router = APIRouter()
+
+# Default read window, ending today
+DEFAULT_RANGE_DAYS = 30
+
+
+def date_range(
+    start_date: Optional[date] = Query(None, description=f"Inclusive; defaults to {DEFAULT_RANGE_DAYS} days before end_date"),
+    end_date: Optional[date] = Query(None, description="Inclusive; defaults to today"),
+) -> tuple[date, date]:
+    end = end_date or date.today()
+    start = start_date or end - timedelta(days=DEFAULT_RANGE_DAYS)
+    if start > end:
+        raise BadRequestError("start_date must not be after end_date")
+    return start, end
+
+
+@router.post("/", response_model=schemas.AttendanceOut, status_code=status.HTTP_201_CREATED)
+def check_in(
+    record: schemas.AttendanceCreate,
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Record that a person attended a class (today unless attendance_date is given).
+    Checking in twice for the same class and day returns the existing record.
+    Only instructors, admins, and service roles can record attendance.
+    """
+    return crud.check_in(db, [record])[0]
+
+
+@router.post("/bulk", response_model=list[schemas.AttendanceOut], status_code=status.HTTP_201_CREATED)
+def bulk_check_in(
+    request: schemas.BulkAttendanceCreate,
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Record a whole class's attendance in one request, e.g. from the register.
+    Only instructors, admins, and service roles can record attendance.
+    """
+    records = [
+        schemas.AttendanceCreate(person_id=person_id, class_id=request.class_id, attendance_date=request.attendance_date)
+        for person_id in request.person_ids
+    ]
+    return crud.check_in(db, records)
+
+
+@router.post("/check-in", response_model=schemas.AttendanceQueued, status_code=status.HTTP_202_ACCEPTED)
+def queue_check_in(
+    record: schemas.AttendanceCreate,
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Door tablet check-in: validated now, written with the rest of the
+    burst a moment later (see app/attendance.py).
+    Only instructors, admins, and service roles can record attendance.
+    """
+    crud.require_attendance_refs(db, [record])
+    return schemas.AttendanceQueued(queued=attendance.buffer.add([record]))
+
+
+@router.get("/class/{class_id}", response_model=list[schemas.AttendanceOut])
+def get_class_attendance(
+    class_id: int,
+    window: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Attendance for a class between two dates, by date.
+    Only instructors, admins, and service roles can access this.
+    """
+    attendance.buffer.flush()
+    return crud.get_attendance(db, *window, class_id=class_id)
+
+
+@router.get("/person/{person_id}", response_model=list[schemas.AttendanceOut])
+def get_person_attendance(
+    person_id: int,
+    window: tuple[date, date] = Depends(date_range),
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Attendance for a person between two dates, by date.
+    Only instructors, admins, and service roles can access this.
+    """
+    attendance.buffer.flush()
+    return crud.get_attendance(db, *window, person_id=person_id)
@@ -1,56 +1,80 @@
 # auth.py
-from fastapi import Depends, HTTPException
+from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-import requests
-from dotenv import load_dotenv
+import logging
 import os
-from typing import Callable
+from typing import Callable, Optional
+from app.config import load_env
 from app.database import get_db
 from app.exceptions import NotFoundError, ForbiddenError, UnauthorizedError
+from app.cache import TTLCache
+from app.token_verifier import TokenVerifier
+from app.role_resolver import ResolvedUser, role_resolver
 
 security = HTTPBearer()
-load_dotenv()
+load_env()
+logger = logging.getLogger(__name__)
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+token_verifier = TokenVerifier(
+    SUPABASE_URL,
+    SUPABASE_ANON_KEY,
+    jwt_secret=os.getenv("SUPABASE_JWT_SECRET"),
+    jwks_url=os.getenv("SUPABASE_JWKS_URL"),
+    cache=TTLCache(
+        maxsize=int(os.getenv("AUTH_CACHE_MAX_SIZE", "4096")),
+        ttl=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "300")),
+    ),
+    timeout=float(os.getenv("AUTH_HTTP_TIMEOUT_SECONDS", "10")),
+    max_connections=int(os.getenv("AUTH_HTTP_MAX_CONNECTIONS", "20")),
+    max_concurrency=int(os.getenv("AUTH_HTTP_MAX_CONCURRENCY", "20")),
+)
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
-    print(f"Received token (first 20 chars): {token[:20] if token else 'None'}")
-    
+
     # service key bypass
     if token == os.getenv("SUPABASE_SERVICE_ROLE_KEY"):
-        print("Service role authenticated")
+        logger.debug("Service role authenticated")
         return {"role": "service"}
-    
-    # normal user check
-    supabase_url = SUPABASE_URL
-    auth_url = f"{supabase_url}/auth/v1/user"
-    print(f"Verifying user token with Supabase at: {auth_url}")
-    
-    resp = requests.get(
-        auth_url,
-        headers={
-            "Authorization": f"Bearer {token}",
-            "apikey": os.getenv("SUPABASE_ANON_KEY")
-        }
-    )
-    
-    print(f"Supabase auth response status: {resp.status_code}")
-    
-    if resp.status_code != 200:
-        print(f"Auth failed. Response: {resp.text}")
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user_data = resp.json()
-    print(f"User authenticated: {user_data.get('email')}")
+
+    # normal user check - verified locally, Supabase is only a fallback
+    user_data = await token_verifier.verify(token)
+    logger.debug("User authenticated", extra={"user_id": user_data.get("id")})
     return user_data
 
 
-def get_user_role(
+def get_db_user(
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
+) -> Optional[ResolvedUser]:
+    """
+    Resolve the authenticated user's database record.
+
+    Every role dependency depends on this one, so FastAPI resolves the user
+    at most once per request; across requests the lookup is served from the
+    shared role cache. Returns None for the service role.
+
+    Raises:
+        NotFoundError: If the user is not found in the database.
+    """
+    if current_user.get("role") == "service":
+        return None
+
+    user = role_resolver.resolve(db, current_user["email"])
+
+    if not user:
+        raise NotFoundError("User")
+
+    return user
+
+
+def get_user_role(
+    current_user: dict = Depends(get_current_user),
+    user: Optional[ResolvedUser] = Depends(get_db_user)
 ) -> str:
     """
     Helper dependency to get the user's role from the database.
@@ -60,13 +84,6 @@ def get_user_role(
     if current_user.get("role") == "service":
         return "service"
 
-    # Regular user - fetch role from database
-    from app.crud import get_user_by_email  # Import here to avoid circular imports
-    user = get_user_by_email(db, current_user["email"])
-
-    if not user:
-        raise NotFoundError("User")
-
     return user.role
 
 
@@ -95,7 +112,7 @@ def require_roles(*allowed_roles: str) -> Callable:
     """
     def role_checker(
         current_user: dict = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        user: Optional[ResolvedUser] = Depends(get_db_user)
     ) -> str:
         # Service role bypass
         if current_user.get("role") == "service":
@@ -103,13 +120,6 @@ def require_roles(*allowed_roles: str) -> Callable:
                 return "service"
             raise ForbiddenError()
 
-        # Regular user - fetch role from database
-        from app.crud import get_user_by_email  # Import here to avoid circular imports
-        user = get_user_by_email(db, current_user["email"])
-
-        if not user:
-            raise NotFoundError("User")
-
         if user.role not in allowed_roles:
             raise ForbiddenError()
 
@@ -120,22 +130,13 @@ def require_roles(*allowed_roles: str) -> Callable:
 
 def get_current_user_with_db(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
-) -> tuple[dict, any]:
+    user: Optional[ResolvedUser] = Depends(get_db_user)
+) -> tuple[dict, Optional[ResolvedUser]]:
     """
-    Returns both the current_user dict and the database user object.
+    Returns both the current_user dict and the resolved database user.
     Useful when you need both the Supabase user info and the database user.
 
     Returns:
-        Tuple of (current_user dict, database User object or None for service)
+        Tuple of (current_user dict, ResolvedUser or None for service)
     """
-    if current_user.get("role") == "service":
-        return current_user, None
-
-    from app.crud import get_user_by_email
-    user = get_user_by_email(db, current_user["email"])
-
-    if not user:
-        raise NotFoundError("User")
-
-    return current_user, user
\ No newline at end of file
+    return current_user, user
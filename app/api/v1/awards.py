@@ -1,10 +1,15 @@
 # api/v1/awards.py
-from fastapi import APIRouter, Depends, status
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from app import crud, schemas, models
+from app import crud, leaderboard, matviews, schemas, tournament_import
 from app.database import get_db
 from app.api.v1.auth import require_roles
-from app.exceptions import NotFoundError
+from app.exceptions import BadRequestError, NotFoundError
+from app.pagination import Page
+from app.person_import import detect_format
+from app.response_cache import response_cache
 
 router = APIRouter()
 
@@ -15,22 +20,59 @@ def get_awards_for_student(student_id: int, db: Session = Depends(get_db)):
     Get all awards for a specific student.
     Any authenticated user can view awards.
     """
-    result = db.query(models.t_full_award).filter(
-        models.t_full_award.c.person_id == student_id
-    ).all()
-    return result if result else []
+    return response_cache.json(
+        "awards.student", student_id, [f"person:{student_id}", "event", matviews.full_award.name],
+        lambda: db.query(matviews.full_award).filter(
+            matviews.full_award.c.person_id == student_id
+        ).all(),
+        list[schemas.FullAwardOut],
+    )
 
 
 @router.get("/", response_model=list[schemas.FullAwardOut])
 def get_awards(
+    page: Page = Depends(),
     db: Session = Depends(get_db),
     user_role: str = Depends(require_roles("instructor", "admin", "service"))
 ):
     """
-    Get all awards in the system.
+    Get all awards in the system, a page at a time.
     Only instructors, admins, and service roles can access this.
     """
-    return db.query(models.t_full_award).all()
+    return page.apply(db.query(matviews.full_award), [matviews.full_award.c.id])
+
+
+@router.get("/leaderboard", response_model=list[schemas.LeaderboardEntryOut])
+def get_leaderboard(
+    limit: int = Query(10, ge=1, le=100),
+    age_category_id: Optional[int] = Query(None, description="Only people in this age category"),
+    belt_id: Optional[list[int]] = Query(None, description="Belt band: only people currently at one of these belts"),
+    season: Optional[int] = Query(None, ge=1, le=9999, description="Only awards from this calendar year"),
+    start_date: Optional[date] = Query(None, description="Only awards from this month on"),
+    end_date: Optional[date] = Query(None, description="Only awards up to this month"),
+    event_id: Optional[int] = Query(None, description="Only awards from this event"),
+    db: Session = Depends(get_db)
+):
+    """
+    Top people by award points; the filters combine.
+    Served from the award points aggregates, so the cost does not grow with
+    the award history. Date windows count whole months.
+    """
+    if season is not None:
+        if start_date is not None or end_date is not None:
+            raise BadRequestError("Use either season or start_date/end_date")
+        start_date, end_date = date(season, 1, 1), date(season, 12, 31)
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise BadRequestError("start_date must be on or before end_date")
+
+    return leaderboard.top(
+        db, limit,
+        age_category_id=age_category_id,
+        belt_ids=belt_id,
+        start=start_date,
+        end=end_date,
+        event_id=event_id,
+    )
 
 
 @router.get("/{award_id}", response_model=schemas.FullAwardOut)
@@ -39,8 +81,8 @@ def get_award(award_id: int, db: Session = Depends(get_db)):
     Get a specific award by ID.
     Any authenticated user can view an award.
     """
-    award = db.query(models.t_full_award).filter(
-        models.t_full_award.c.id == award_id
+    award = db.query(matviews.full_award).filter(
+        matviews.full_award.c.id == award_id
     ).first()
 
     if not award:
@@ -62,6 +104,49 @@ def create_award(
     return crud.create_award(db, award)
 
 
+@router.post("/bulk", response_model=schemas.BulkAwardResponse)
+def bulk_create_awards(
+    request: schemas.BulkAwardRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Create many awards at once, e.g. a whole tournament's medal table.
+    Returns a result per item; atomic requests that fail write nothing (400).
+    Only instructors, admins, and service roles can create awards.
+    """
+    result = crud.bulk_create_awards(db, request)
+    if request.atomic and not result.committed and result.failed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return result
+
+
+@router.post("/import", response_model=schemas.TournamentImportResult)
+async def import_tournament_results(
+    request: Request,
+    response: Response,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults from Content-Type"),
+    event_id: Optional[int] = Query(None, description="Event for rows that do not name one"),
+    date_achieved: Optional[date] = Query(None, description="Date for rows that do not give one; defaults to today"),
+    atomic: bool = Query(False, description="If any row is rejected, import nothing"),
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Import a tournament's results from a CSV (with header row) or NDJSON body:
+    person, award_type (name or id), category (name or id), rank_at_time.
+    Each competitor's belt must be eligible for their category. All awards
+    are written in one batch; rejected rows are reported by line number.
+    Only instructors, admins, and service roles can create awards.
+    """
+    fmt = detect_format(request, format)
+    result = await tournament_import.import_results(request, fmt, db, event_id, date_achieved, atomic)
+    if atomic and not result.committed and result.failed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return result
+
+
 @router.put("/{award_id}", response_model=schemas.AwardOut)
 def update_award(
     award_id: int,
@@ -1,23 +1,23 @@
 # api/v1/belts.py
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app import schemas, models
-from app.database import get_db
+from app import schemas
 from app.exceptions import NotFoundError
+from app.http_cache import reference_cache
+from app.reference_data import reference_data
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[schemas.BeltOut])
-def get_belts(db: Session = Depends(get_db)):
+@router.get("/", response_model=list[schemas.BeltOut], dependencies=[Depends(reference_cache)])
+def get_belts():
     """Get all belts. Public endpoint."""
-    return db.query(models.Belt).all()
+    return reference_data.get().belts
 
 
-@router.get("/{belt_id}", response_model=schemas.BeltOut)
-def get_belt(belt_id: int, db: Session = Depends(get_db)):
+@router.get("/{belt_id}", response_model=schemas.BeltOut, dependencies=[Depends(reference_cache)])
+def get_belt(belt_id: int):
     """Get a belt by ID. Public endpoint."""
-    belt = db.query(models.Belt).filter(models.Belt.id == belt_id).first()
+    belt = reference_data.get().belt(belt_id)
     if belt is None:
         raise NotFoundError("Belt", belt_id)
     return belt
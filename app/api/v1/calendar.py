@@ -1,23 +1,80 @@
 # app/api/v1/calendar.py
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import models, schemas
-from sqlalchemy import extract
+from app import matviews, schemas
+from app.calendar_engine import calendar_engine
+from app.exceptions import BadRequestError
+from app.http_cache import conditional
+from app.response_cache import response_cache
+from app.pagination import Page
 
 router = APIRouter()
 
+# Longest window the range endpoint will serve
+MAX_RANGE_DAYS = 366
+# Last servable year: month ends are computed as the first day of the next month
+MAX_YEAR = date.max.year - 1
+
+
+def calendar_version(db: Session = Depends(get_db)) -> str:
+    return calendar_engine.snapshot(db).version
+
+
+calendar_cache = conditional(calendar_version, max_age=60, stale_while_revalidate=600)
+
+
+def validate_month(year: int, month: int) -> None:
+    """Reject a month the calendar engine cannot expand."""
+    if not 1 <= month <= 12:
+        raise BadRequestError(f"Invalid month: {month}. Must be between 1 and 12")
+    if not 1 <= year <= MAX_YEAR:
+        raise BadRequestError(f"Invalid year: {year}. Must be between 1 and {MAX_YEAR}")
+
+
 # Get full_calendar entries
 @router.get("/", response_model=list[schemas.FullCalendarOut])
-def get_calendar(db: Session = Depends(get_db)):
-    return db.query(models.t_full_calendar).all()
+def get_calendar(page: Page = Depends(), db: Session = Depends(get_db)):
+    calendar = matviews.full_calendar
+    entry_id = func.coalesce(calendar.c.class_id, calendar.c.event_id)
+    return page.apply(
+        db.query(calendar),
+        [calendar.c.date, calendar.c.start_time, calendar.c.calendar_type, entry_id],
+        key_values=lambda row: (row.date, row.start_time, row.calendar_type, row.class_id if row.class_id is not None else row.event_id),
+    )
 
 # Get full_calendar entries for a given month
-@router.get("/year/{year}/month/{month}", response_model=list[schemas.FullCalendarOut])
-def get_calendar_month(year: int, month: int, db: Session = Depends(get_db)):
-    return (
-        db.query(models.t_full_calendar)
-        .filter(extract('year', models.t_full_calendar.c.date) == year)
-        .filter(extract('month', models.t_full_calendar.c.date) == month)
-        .all()
-    )
\ No newline at end of file
+@router.get("/year/{year}/month/{month}", response_model=list[schemas.FullCalendarOut], dependencies=[Depends(calendar_cache)])
+def get_calendar_month(year: int, month: int, response: Response, db: Session = Depends(get_db)):
+    validate_month(year, month)
+    version = calendar_engine.snapshot(db).version
+    return response_cache.json(
+        "calendar.month", [year, month, version], ["calendar"],
+        lambda: calendar_engine.month(db, year, month),
+        list[schemas.FullCalendarOut],
+        headers=response.headers,
+    )
+
+# Get full_calendar entries between two dates (both inclusive)
+@router.get("/range", response_model=list[schemas.FullCalendarOut], dependencies=[Depends(calendar_cache)])
+def get_calendar_range(
+    response: Response,
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    db: Session = Depends(get_db),
+):
+    if to_date < from_date:
+        raise BadRequestError("'to' must not be before 'from'")
+    if to_date.year > MAX_YEAR:
+        raise BadRequestError(f"'to' must not be after {MAX_YEAR}-12-31")
+    if (to_date - from_date).days >= MAX_RANGE_DAYS:
+        raise BadRequestError(f"Date range must not exceed {MAX_RANGE_DAYS} days")
+    version = calendar_engine.snapshot(db).version
+    return response_cache.json(
+        "calendar.range", [from_date, to_date, version], ["calendar"],
+        lambda: calendar_engine.between(db, from_date, to_date + timedelta(days=1)),
+        list[schemas.FullCalendarOut],
+        headers=response.headers,
+    )
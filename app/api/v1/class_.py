@@ -5,6 +5,8 @@ from app import crud, schemas, models
 from app.database import get_db
 from app.api.v1.auth import require_roles
 from app.exceptions import NotFoundError
+from app.pagination import Page
+from app.http_cache import cacheable
 
 router = APIRouter()
 
@@ -19,6 +21,16 @@ def create_class(
     return crud.create_class(db, class_)
 
 
+# Registered before /{class_id} so "cancelled" isn't parsed as a class id
+@router.get("/cancelled", response_model=list[schemas.ClassExceptionOut])
+def get_all_class_exceptions(page: Page = Depends(), db: Session = Depends(get_db)):
+    """Get all class exceptions/cancellations, a page at a time. Public endpoint."""
+    return page.apply(
+        db.query(models.ClassException),
+        [models.ClassException.date, models.ClassException.id],
+    )
+
+
 @router.get("/{class_id}", response_model=schemas.ClassOut)
 def get_class(class_id: int, db: Session = Depends(get_db)):
     """Get a class by ID. Public endpoint."""
@@ -28,7 +40,7 @@ def get_class(class_id: int, db: Session = Depends(get_db)):
     return class_
 
 
-@router.get("/", response_model=list[schemas.ClassOut])
+@router.get("/", response_model=list[schemas.ClassOut], dependencies=[Depends(cacheable())])
 def get_all_classes(db: Session = Depends(get_db)):
     """Get all active classes. Public endpoint."""
     return db.query(models.Class).filter(models.Class.is_active == True).all()
@@ -55,8 +67,3 @@ def update_class(
     """Update a class. Requires admin or service role."""
     return crud.update_class(db, class_id, class_)
 
-
-@router.get("/cancelled", response_model=list[schemas.ClassExceptionOut])
-def get_all_class_exceptions(db: Session = Depends(get_db)):
-    """Get all class exceptions/cancellations. Public endpoint."""
-    return db.query(models.ClassException).all()
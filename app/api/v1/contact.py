@@ -1,8 +1,8 @@
 # api/v1/contact.py
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_async_db
 from app.api.v1.auth import get_current_user, get_user_role, require_roles
 from app.exceptions import NotFoundError, ForbiddenError
 from typing import List
@@ -14,14 +14,14 @@ router = APIRouter()
 @router.get("/", response_model=List[schemas.ContactOut])
 async def get_my_contacts(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all contacts for the currently logged-in user.
     Any authenticated user can access their own contacts.
     """
     user_id = UUID(current_user["id"])
-    return crud.get_contacts_by_user(db, user_id)
+    return await crud.get_contacts_by_user_async(db, user_id)
 
 
 @router.get("/{contact_id}", response_model=schemas.ContactOut)
@@ -29,7 +29,7 @@ async def get_contact(
     contact_id: int,
     current_user: dict = Depends(get_current_user),
     user_role: str = Depends(get_user_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific contact by ID.
@@ -39,9 +39,9 @@ async def get_contact(
     user_id = UUID(current_user["id"])
 
     if user_role in ["admin", "service"]:
-        contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
+        contact = await db.get(models.Contact, contact_id)
     else:
-        contact = crud.get_contact(db, contact_id, user_id)
+        contact = await crud.get_contact_async(db, contact_id, user_id)
 
     if not contact:
         raise NotFoundError("Contact", contact_id)
@@ -54,7 +54,7 @@ async def create_contact(
     contact: schemas.ContactCreate,
     current_user: dict = Depends(get_current_user),
     user_role: str = Depends(get_user_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new contact.
@@ -66,7 +66,7 @@ async def create_contact(
     if user_role not in ["admin", "service"] and contact.user_id != user_id:
         raise ForbiddenError("You can only create contacts for yourself")
 
-    return crud.create_contact(db, contact)
+    return await crud.create_contact_async(db, contact)
 
 
 @router.put("/{contact_id}", response_model=schemas.ContactOut)
@@ -75,7 +75,7 @@ async def update_contact(
     contact_update: schemas.ContactUpdate,
     current_user: dict = Depends(get_current_user),
     user_role: str = Depends(get_user_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a contact.
@@ -85,7 +85,7 @@ async def update_contact(
     user_id = UUID(current_user["id"])
 
     if user_role in ["admin", "service"]:
-        db_contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
+        db_contact = await db.get(models.Contact, contact_id)
         if not db_contact:
             raise NotFoundError("Contact", contact_id)
 
@@ -93,14 +93,14 @@ async def update_contact(
         for field, value in update_data.items():
             setattr(db_contact, field, value)
 
-        db.commit()
-        db.refresh(db_contact)
+        await db.commit()
+        await db.refresh(db_contact)
         return db_contact
     else:
         if contact_update.user_id is not None and contact_update.user_id != user_id:
             raise ForbiddenError("You cannot reassign contacts to other users")
 
-        updated_contact = crud.update_contact(db, contact_id, user_id, contact_update)
+        updated_contact = await crud.update_contact_async(db, contact_id, user_id, contact_update)
 
         if not updated_contact:
             raise NotFoundError("Contact", contact_id)
@@ -113,7 +113,7 @@ async def delete_contact(
     contact_id: int,
     current_user: dict = Depends(get_current_user),
     user_role: str = Depends(get_user_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a contact.
@@ -123,13 +123,13 @@ async def delete_contact(
     user_id = UUID(current_user["id"])
 
     if user_role in ["admin", "service"]:
-        db_contact = db.query(models.Contact).filter(models.Contact.id == contact_id).first()
+        db_contact = await db.get(models.Contact, contact_id)
         if not db_contact:
             raise NotFoundError("Contact", contact_id)
-        db.delete(db_contact)
-        db.commit()
+        await db.delete(db_contact)
+        await db.commit()
     else:
-        success = crud.delete_contact(db, contact_id, user_id)
+        success = await crud.delete_contact_async(db, contact_id, user_id)
         if not success:
             raise NotFoundError("Contact", contact_id)
 
@@ -139,11 +139,11 @@ async def delete_contact(
 @router.get("/user/{target_user_id}", response_model=List[schemas.ContactOut])
 async def get_contacts_for_user(
     target_user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_role: str = Depends(require_roles("admin", "service"))
 ):
     """
     Get all contacts for a specific user.
     Only accessible by admins.
     """
-    return crud.get_contacts_by_user(db, target_user_id)
+    return await crud.get_contacts_by_user_async(db, target_user_id)
@@ -5,6 +5,8 @@ from app import crud, schemas, models
 from app.database import get_db
 from app.api.v1.auth import require_roles
 from app.exceptions import NotFoundError
+from app.pagination import Page
+from app.http_cache import cacheable
 
 router = APIRouter()
 
@@ -28,10 +30,10 @@ def get_event(event_id: int, db: Session = Depends(get_db)):
     return event
 
 
-@router.get("/", response_model=list[schemas.EventOut])
-def get_all_events(db: Session = Depends(get_db)):
-    """Get all events. Public endpoint."""
-    return db.query(models.Event).all()
+@router.get("/", response_model=list[schemas.EventOut], dependencies=[Depends(cacheable())])
+def get_all_events(page: Page = Depends(), db: Session = Depends(get_db)):
+    """Get all events, a page at a time. Public endpoint."""
+    return page.apply(db.query(models.Event), [models.Event.id])
 
 
 @router.delete("/{event_id}")
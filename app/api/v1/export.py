@@ -0,0 +1,97 @@
+# api/v1/export.py
+import csv
+import io
+import json
+from typing import Iterator
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+
+from app import matviews, models, promotion_reads
+from app.api.v1.auth import require_roles
+from app.database import get_sessionmaker
+from app.exceptions import BadRequestError, NotFoundError
+
+router = APIRouter()
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+EXPORTS = {
+    "promotions": lambda: promotion_reads.promotions_select().order_by(models.Promotions.id),
+    "awards": lambda: select(matviews.full_award).order_by(matviews.full_award.c.id),
+    "people": lambda: select(matviews.full_person).order_by(matviews.full_person.c.id),
+}
+
+
+def _json_default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(stmt: Select, fmt: str) -> Iterator[str]:
+    """
+    Yield an export a batch of rows at a time.
+
+    Opens its own session: the response body is produced after the request's
+    dependencies have been closed. `yield_per` makes the driver use a
+    server-side cursor, so only one batch is held in memory at a time.
+    """
+    with get_sessionmaker()() as db:
+        result = db.execute(stmt, execution_options={"yield_per": EXPORT_BATCH_SIZE})
+        columns = list(result.keys())
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+
+        if writer:
+            writer.writerow(columns)
+
+        for batch in result.partitions():
+            if writer:
+                writer.writerows([_csv_value(v) for v in row] for row in batch)
+            else:
+                for row in batch:
+                    buffer.write(json.dumps(dict(zip(columns, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+@router.get("/{resource}")
+def export_resource(
+    resource: str,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Stream every row of a resource (promotions, awards or people) as NDJSON or CSV.
+    Requires instructor, admin, or service role.
+    """
+    make_query = EXPORTS.get(resource)
+    if make_query is None:
+        raise NotFoundError("Export", resource)
+    if format not in MEDIA_TYPES:
+        raise BadRequestError(f"Invalid format: {format}. Must be one of: ndjson, csv")
+
+    return StreamingResponse(
+        stream_rows(make_query(), format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format}"'},
+    )
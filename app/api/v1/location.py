@@ -1,10 +1,12 @@
 # api/v1/location.py
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app import crud, schemas, models
+from app import crud, schemas
 from app.database import get_db
 from app.api.v1.auth import require_roles
 from app.exceptions import NotFoundError
+from app.http_cache import reference_cache
+from app.reference_data import reference_data
 
 router = APIRouter()
 
@@ -19,16 +21,16 @@ def create_location(
     return crud.create_location(db, location)
 
 
-@router.get("/", response_model=list[schemas.LocationOut])
-def get_locations(db: Session = Depends(get_db)):
+@router.get("/", response_model=list[schemas.LocationOut], dependencies=[Depends(reference_cache)])
+def get_locations():
     """Get all locations. Public endpoint."""
-    return db.query(models.Location).all()
+    return reference_data.get().locations
 
 
-@router.get("/{location_id}", response_model=schemas.LocationOut)
-def get_location(location_id: int, db: Session = Depends(get_db)):
+@router.get("/{location_id}", response_model=schemas.LocationOut, dependencies=[Depends(reference_cache)])
+def get_location(location_id: int):
     """Get a location by ID. Public endpoint."""
-    location = db.query(models.Location).filter(models.Location.id == location_id).first()
+    location = reference_data.get().location(location_id)
     if location is None:
         raise NotFoundError("Location", location_id)
     return location
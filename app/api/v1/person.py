@@ -1,11 +1,17 @@
 # api/v1/person.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas, models
-from app.api.v1.auth import get_current_user, get_user_role, require_roles
-from app.database import get_db
+from app.api.v1.auth import get_current_user, get_db_user, get_user_role, require_roles
+from app.role_resolver import ResolvedUser
+from app.database import get_db, get_async_db
 from app.exceptions import NotFoundError, ForbiddenError
+from app.pagination import Page
+from app import matviews, person_import
+from app.response_cache import response_cache
 from uuid import UUID
+from typing import Optional
 
 router = APIRouter()
 
@@ -20,6 +26,24 @@ def enroll_student(
     return crud.enroll_person(db, person)
 
 
+@router.post("/import", response_model=schemas.PersonImportResult)
+async def import_people(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv or ndjson; defaults from Content-Type"),
+    location_id: int = Query(1, description="Location recorded on the initial promotions"),
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("admin", "service"))
+):
+    """
+    Enroll a whole roster from a CSV (with header row) or NDJSON request body.
+    Rows are streamed, validated and inserted in chunks; invalid rows are
+    reported by line number without stopping the import.
+    Requires admin or service role.
+    """
+    fmt = person_import.detect_format(request, format)
+    return await person_import.import_people(request, fmt, db, location_id)
+
+
 @router.get("/{person_id}", response_model=schemas.FullPersonOut)
 def get_person(
     person_id: int,
@@ -27,29 +51,32 @@ def get_person(
     user_role: str = Depends(require_roles("user", "instructor", "admin", "service"))
 ):
     """Get a student by ID. Any authenticated user can view."""
-    person = db.query(models.t_full_person).filter(
-        models.t_full_person.c.id == person_id
-    ).first()
-
-    if person is None:
-        raise NotFoundError("Person", person_id)
+    def load():
+        person = db.query(matviews.full_person).filter(
+            matviews.full_person.c.id == person_id
+        ).first()
+        if person is None:
+            raise NotFoundError("Person", person_id)
+        return person
 
-    return person
+    return response_cache.json("person", person_id, [f"person:{person_id}", matviews.full_person.name], load, schemas.FullPersonOut)
 
 
 @router.get("/", response_model=list[schemas.PersonOut])
 def get_all_people(
+    page: Page = Depends(),
     db: Session = Depends(get_db),
     user_role: str = Depends(require_roles("instructor", "admin", "service"))
 ):
-    """Get all students. Requires instructor, admin, or service role."""
-    return db.query(models.Person).all()
+    """Get all students, a page at a time. Requires instructor, admin, or service role."""
+    return page.apply(db.query(models.Person), [models.Person.id])
 
 
 @router.get("/me/persons", response_model=list[int])
 def get_my_persons(
     db: Session = Depends(get_db),
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    user: Optional[ResolvedUser] = Depends(get_db_user)
 ):
     """
     Get all person IDs linked to the currently authenticated user.
@@ -61,11 +88,6 @@ def get_my_persons(
     if current_user.get("role") == "service":
         raise ForbiddenError("Service role cannot access user-specific data")
 
-    from app.crud import get_user_by_email
-    user = get_user_by_email(db, current_user["email"])
-    if not user:
-        raise NotFoundError("User")
-
     user_id = current_user.get("id")
 
     try:
@@ -82,13 +104,13 @@ def get_my_persons(
         )
 
 
-@router.put("/{person_id}", response_model=schemas.ContactOut)
+@router.put("/{person_id}", response_model=schemas.PersonOut)
 async def update_person(
     person_id: int,
     person_update: schemas.PersonUpdate,
     current_user: dict = Depends(get_current_user),
     user_role: str = Depends(get_user_role),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a person.
@@ -97,25 +119,8 @@ async def update_person(
     """
     user_id = UUID(current_user["id"])
 
-    if user_role in ["admin", "service"]:
-        db_person = db.query(models.Person).filter(models.Person.id == person_id).first()
-        if not db_person:
-            raise NotFoundError("Person", person_id)
-
-        update_data = person_update.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_person, field, value)
-
-        db.commit()
-        db.refresh(db_person)
-        return db_person
-    else:
-        if person_update.id is not None and person_update.id != user_id:
-            raise ForbiddenError("You cannot edit other students' information")
-
-        updated_person = crud.update_person(db, person_id, person_update)
-
-        if not updated_person:
-            raise NotFoundError("Person", person_id)
+    if user_role not in ["admin", "service"] and person_update.id is not None and person_update.id != user_id:
+        raise ForbiddenError("You cannot edit other students' information")
 
-        return updated_person
+    # One write path for every role, so cache and calendar invalidation stay in crud
+    return await crud.update_person_async(db, person_id, person_update)
@@ -1,10 +1,12 @@
 # api/v1/promotions.py
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
-from app import crud, schemas, models
+from app import crud, promotion_reads, schemas, models
 from app.database import get_db
 from app.api.v1.auth import require_roles
 from app.exceptions import NotFoundError
+from app.pagination import Page
+from app.response_cache import response_cache
 
 router = APIRouter()
 
@@ -46,6 +48,24 @@ def set_belt(
     )
 
 
+@router.post("/bulk", response_model=schemas.BulkPromotionResponse)
+def bulk_promotion(
+    request: schemas.BulkPromotionRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """
+    Promote many students at once, e.g. a whole class on grading day.
+    Returns a result per item; atomic requests that fail write nothing (400).
+    Requires instructor, admin, or service role.
+    """
+    result = crud.bulk_promote(db, request)
+    if request.atomic and not result.committed and result.failed:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return result
+
+
 @router.delete("/delete_promotion/{promotion_id}")
 def delete_promotion(
     promotion_id: int,
@@ -59,27 +79,41 @@ def delete_promotion(
 
 @router.get("/", response_model=list[schemas.PromotionOut])
 def get_promotions(
+    page: Page = Depends(),
+    db: Session = Depends(get_db),
+    user_role: str = Depends(require_roles("instructor", "admin", "service"))
+):
+    """Get all promotions, a page at a time. Requires instructor, admin, or service role."""
+    return page.apply(promotion_reads.promotions_query(db), [models.Promotions.id])
+
+
+@router.get("/current", response_model=list[schemas.PromotionOut])
+def get_current_promotions(
+    page: Page = Depends(),
     db: Session = Depends(get_db),
     user_role: str = Depends(require_roles("instructor", "admin", "service"))
 ):
-    """Get all promotions. Requires instructor, admin, or service role."""
-    return db.query(models.Promotions).all()
+    """
+    Current rank of every student (their latest promotion), ordered by student,
+    a page at a time. Requires instructor, admin, or service role.
+    """
+    return page.apply(promotion_reads.current_query(db), [models.Promotions.student_id])
 
 
 @router.get("/student/{student_id}", response_model=list[schemas.PromotionOut])
 def get_promotions_for_student(student_id: int, db: Session = Depends(get_db)):
-    """Get all promotions for a student. Public endpoint."""
-    result = db.query(models.Promotions).filter(models.Promotions.student_id == student_id).all()
-    return result if result else []
+    """Get all promotions for a student, oldest first. Public endpoint."""
+    return response_cache.json(
+        "promotions.student", student_id, [f"person:{student_id}"],
+        lambda: promotion_reads.for_student(db, student_id),
+        list[schemas.PromotionOut],
+    )
 
 
 @router.get("/student/{student_id}/promotion/{promotion_id}", response_model=schemas.PromotionOut)
 def get_promotion_for_student(student_id: int, promotion_id: int, db: Session = Depends(get_db)):
     """Get a specific promotion for a student. Public endpoint."""
-    result = db.query(models.Promotions).filter(
-        models.Promotions.student_id == student_id,
-        models.Promotions.id == promotion_id
-    ).first()
+    result = promotion_reads.get(db, student_id, promotion_id)
     if result is None:
         raise NotFoundError("Promotion", promotion_id)
     return result
@@ -88,17 +122,10 @@ def get_promotion_for_student(student_id: int, promotion_id: int, db: Session =
 @router.get("/current/student/{student_id}/", response_model=schemas.PromotionOut)
 def get_current_promotion_for_student(student_id: int, db: Session = Depends(get_db)):
     """Get the current rank for a student. Public endpoint."""
-    result = db.query(models.Promotions).filter(
-        models.Promotions.student_id == student_id
-    ).order_by(
-        models.Promotions.promotion_date.desc(),
-        models.Promotions.id.desc()
-    ).first()
-
-    if result is None:
-        raise NotFoundError("Promotion for student", student_id)
+    def load():
+        result = promotion_reads.current_for_student(db, student_id)
+        if result is None:
+            raise NotFoundError("Promotion for student", student_id)
+        return result
 
-    belt_name = db.query(models.Belt).filter(models.Belt.id == result.belt_id).first()
-    response_data = result.__dict__.copy()
-    response_data["belt_name"] = belt_name.name if belt_name else None
-    return response_data
+    return response_cache.json("promotions.current", student_id, [f"person:{student_id}"], load, schemas.PromotionOut)
@@ -4,12 +4,11 @@ User-specific endpoints for the authenticated user.
 This handles getting the current user's role and profile information.
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.api.v1.auth import get_current_user
-from app.database import get_db
-from app.crud import get_user_by_email
-from app.exceptions import ForbiddenError, NotFoundError
+from app.api.v1.auth import get_current_user, get_db_user
+from app.role_resolver import ResolvedUser
+from app.exceptions import ForbiddenError
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter()
 
@@ -26,7 +25,7 @@ class UserRoleResponse(BaseModel):
 @router.get("/me/role", response_model=UserRoleResponse)
 def get_my_role(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user: Optional[ResolvedUser] = Depends(get_db_user)
 ):
     """
     Get the current authenticated user's role.
@@ -44,11 +43,6 @@ def get_my_role(
     if current_user.get("role") == "service":
         raise ForbiddenError("Service role cannot access user-specific endpoints")
 
-    user = get_user_by_email(db, current_user["email"])
-
-    if not user:
-        raise NotFoundError("User")
-
     return UserRoleResponse(
         email=user.email,
         role=user.role
@@ -0,0 +1,184 @@
+# app/attendance.py
+"""
+Write-behind buffer for door check-ins.
+
+A class taps in at the tablet within a couple of minutes, one request per
+student. `POST /attendance/check-in` validates the person and class, adds
+the check-in to `buffer` and returns 202 without writing. The buffer
+collects check-ins for ATTENDANCE_FLUSH_DELAY_SECONDS after the first one
+(or until ATTENDANCE_BUFFER_SIZE are waiting) and writes them with one
+multi-row upsert (`crud.upsert_attendance`), so a class costs a handful of
+statements rather than one transaction per tap. Repeated taps collapse in
+the buffer and in the upsert.
+
+Pending check-ins live in process memory: they are flushed on shutdown, and
+before the attendance reads in this process, but a crash loses at most one
+delay's worth. A failed write (e.g. a dropped connection) puts the batch
+back and retries it with exponential backoff; a check-in that has failed
+ATTENDANCE_MAX_ATTEMPTS writes is logged and dropped, as are check-ins the
+database rejects outright (e.g. for a person deleted meanwhile). The buffer
+never holds more than ATTENDANCE_BUFFER_SIZE check-ins: while writes are
+failing, further check-ins are refused with 503 so the tablet can retry.
+Use `POST /attendance/` or `/attendance/bulk` when the caller needs the
+stored rows back.
+"""
+import logging
+import os
+import threading
+from typing import Iterable, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app import crud, schemas
+from app.exceptions import ServiceUnavailableError
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries of a failing write
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class AttendanceBuffer:
+    """
+    Coalescing, time- and size-bounded buffer of check-ins.
+
+    Args:
+        delay: Seconds between the first check-in of a burst and the write.
+        max_size: Pending check-ins that trigger an immediate write, and the
+                  most the buffer holds while writes are failing.
+        max_attempts: Failed writes after which a check-in is dropped.
+    """
+
+    def __init__(self, delay: float = 1.0, max_size: int = 200, max_attempts: int = 5):
+        self.delay = delay
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.flushes = 0
+        self.written = 0
+        self.dropped = 0
+        self._pending: dict[tuple, dict] = {}
+        # Failed writes per pending check-in
+        self._attempts: dict[tuple, int] = {}
+        # Consecutive failed flushes, for the backoff
+        self._failures = 0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, records: Iterable[schemas.AttendanceCreate]) -> int:
+        """Queue check-ins (already validated); returns how many were queued."""
+        rows = crud.attendance_rows(records)
+        with self._lock:
+            if self._failures:
+                # Writes are failing: retries are left to the backoff timer, and
+                # the buffer does not grow past max_size
+                new = sum(1 for row in rows if _key(row) not in self._pending)
+                if len(self._pending) + new > self.max_size:
+                    raise ServiceUnavailableError("Check-ins cannot be saved right now; try again shortly")
+                self._merge(rows)
+                self._arm(self.delay)
+                return len(rows)
+            self._merge(rows)
+            full = len(self._pending) >= self.max_size
+            if not full:
+                self._arm(self.delay)
+        if full:
+            self.flush()
+        return len(rows)
+
+    def _merge(self, rows: list[dict]) -> None:
+        for row in rows:
+            key = _key(row)
+            pending = self._pending.get(key)
+            if pending is None or row["start_time"] < pending["start_time"]:
+                self._pending[key] = row
+
+    def _arm(self, delay: float) -> None:
+        if self._timer is None:
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> None:
+        """Write everything pending now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            rows, self._pending, self._timer = list(self._pending.values()), {}, None
+        if not rows:
+            return
+
+        # One write at a time; check-ins arriving meanwhile start the next burst
+        with self._write_lock:
+            try:
+                self._write(rows)
+            except Exception:
+                self._failed(rows)
+                return
+        with self._lock:
+            self._failures = 0
+            for row in rows:
+                self._attempts.pop(_key(row), None)
+
+    def _failed(self, rows: list[dict]) -> None:
+        """Put an acknowledged batch back for a later retry, dropping check-ins out of attempts."""
+        with self._lock:
+            self._failures += 1
+            backoff = min(self.delay * 2 ** self._failures, MAX_BACKOFF_SECONDS)
+            retry, dropped = [], []
+            for row in rows:
+                key = _key(row)
+                self._attempts[key] = self._attempts.get(key, 0) + 1
+                if self._attempts[key] >= self.max_attempts:
+                    del self._attempts[key]
+                    dropped.append(row)
+                else:
+                    retry.append(row)
+            self._merge(retry)
+            self.dropped += len(dropped)
+            if self._pending:
+                self._arm(backoff)
+        logger.exception("Writing %d buffered check-ins failed; retrying %d in %.1fs", len(rows), len(retry), backoff)
+        for row in dropped:
+            logger.error(
+                "Dropping check-in after %d failed writes: person %s, class %s, date %s, start %s",
+                self.max_attempts, row["person_id"], row["class_id"], row["attendance_date"], row["start_time"],
+            )
+
+    def _write(self, rows: list[dict]) -> None:
+        from app.database import get_sessionmaker
+
+        with get_sessionmaker()() as db:
+            try:
+                crud.upsert_attendance(db, rows)
+                db.commit()
+                written = len(rows)
+            except IntegrityError:
+                # E.g. a person deleted since the check-in was queued: keep the rest
+                db.rollback()
+                written = 0
+                for row in rows:
+                    try:
+                        with db.begin_nested():
+                            crud.upsert_attendance(db, [row])
+                        written += 1
+                    except IntegrityError:
+                        logger.exception("Dropping check-in for person %s, class %s", row["person_id"], row["class_id"])
+                db.commit()
+        self.flushes += 1
+        self.written += written
+        logger.info("Wrote %d of %d buffered check-ins", written, len(rows))
+
+
+def _key(row: dict) -> tuple:
+    return row["person_id"], row["class_id"], row["attendance_date"]
+
+
+buffer = AttendanceBuffer(
+    delay=float(os.getenv("ATTENDANCE_FLUSH_DELAY_SECONDS", "1")),
+    max_size=int(os.getenv("ATTENDANCE_BUFFER_SIZE", "200")),
+    max_attempts=int(os.getenv("ATTENDANCE_MAX_ATTEMPTS", "5")),
+)
@@ -0,0 +1,215 @@
+# app/calendar_engine.py
+"""
+In-process expansion of the class timetable into calendar entries.
+
+The `full_calendar` view expands every recurring class into one row per date
+inside Postgres on each read. The inputs are tiny (a handful of active
+classes, their cancellations and the events), so instead they are loaded once
+into a snapshot and expanded in Python, a day at a time, for whatever range is
+asked for. Expanded months are cached until the snapshot changes.
+
+The snapshot is dropped by the class/event crud functions after they commit
+and otherwise expires after a TTL, which picks up changes made outside the
+API (e.g. cancellations added in the Supabase dashboard).
+"""
+import calendar
+import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session, aliased
+
+from app import models
+from app.cache import TTLCache
+
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+@dataclass(frozen=True)
+class CalendarSnapshot:
+    """Everything needed to expand the calendar, as loaded from the database."""
+
+    # weekday (0 = Monday, like Class.day_number) -> class entries sorted by start time
+    classes_by_weekday: dict[int, tuple[dict, ...]]
+    # (class_id, date) pairs of cancelled occurrences
+    cancellations: frozenset
+    # date -> event entries sorted by start time
+    events_by_date: dict[date, tuple[dict, ...]]
+    # Content hash, stable across processes for the same data
+    version: str
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+def _entry(day: date, template: dict) -> dict:
+    return {
+        **template,
+        "date": day,
+        "day_name": DAY_NAMES[day.weekday()],
+        # Output follows the view: 0 is Sunday
+        "day_of_week": (day.weekday() + 1) % 7,
+    }
+
+
+def load_snapshot(db: Session) -> CalendarSnapshot:
+    """Load active classes, cancellations and active events in three queries."""
+    instructor = aliased(models.Person)
+    class_rows = (
+        db.query(models.Class, instructor.first_name, instructor.last_name, models.Location.title, models.Location.is_dojang)
+        .outerjoin(instructor, instructor.id == models.Class.instructor_id)
+        .outerjoin(models.Location, models.Location.id == models.Class.location_id)
+        .filter(models.Class.is_active == True)
+        .all()
+    )
+    classes: dict[int, list[dict]] = {}
+    for class_, first_name, last_name, location_name, is_dojang in class_rows:
+        instructor_name = f"{first_name} {last_name}" if first_name is not None and last_name is not None else None
+        classes.setdefault(class_.day_number, []).append({
+            "class_id": class_.id,
+            "event_id": None,
+            "class_name": class_.title,
+            "start_time": class_.start_time,
+            "end_time": class_.end_time,
+            "instructor_id": class_.instructor_id,
+            "instructor_name": instructor_name,
+            "description": class_.description,
+            "location_id": class_.location_id,
+            "location_name": location_name,
+            "is_dojang": is_dojang,
+            "event_type": None,
+            "calendar_type": "class",
+            "active_from": class_.active_from,
+            "active_to": class_.active_to,
+        })
+
+    cancellations = frozenset(
+        db.query(models.ClassException.class_id, models.ClassException.date)
+        .filter(
+            models.ClassException.cancelled == True,
+            models.ClassException.class_id.isnot(None),
+            models.ClassException.date.isnot(None),
+        )
+        .all()
+    )
+
+    event_rows = (
+        db.query(models.Event, models.EventType.title, models.Location.title, models.Location.is_dojang)
+        .join(models.EventType, models.EventType.id == models.Event.event_type_id)
+        .outerjoin(models.Location, models.Location.id == models.Event.location_id)
+        .filter(models.Event.is_active == True, models.Event.event_start.isnot(None))
+        .all()
+    )
+    events: dict[date, list[dict]] = {}
+    for event, event_type, location_name, is_dojang in event_rows:
+        events.setdefault(event.event_start.date(), []).append({
+            "class_id": None,
+            "event_id": event.id,
+            "class_name": event.title,
+            "start_time": event.event_start.time(),
+            "end_time": event.event_end.time() if event.event_end else None,
+            "instructor_id": None,
+            "instructor_name": None,
+            "description": event.description,
+            "location_id": event.location_id,
+            "location_name": location_name,
+            "is_dojang": is_dojang,
+            "event_type": event_type,
+            "calendar_type": "event",
+        })
+
+    def by_start(entries: list[dict]) -> tuple[dict, ...]:
+        return tuple(sorted(entries, key=lambda e: (e["start_time"], e["class_id"] or 0, e["event_id"] or 0)))
+
+    classes_by_weekday = {weekday: by_start(entries) for weekday, entries in classes.items()}
+    events_by_date = {day: by_start(entries) for day, entries in events.items()}
+    digest = hashlib.sha256(
+        repr((sorted(classes_by_weekday.items()), sorted(cancellations), sorted(events_by_date.items()))).encode()
+    ).hexdigest()[:16]
+    return CalendarSnapshot(classes_by_weekday, cancellations, events_by_date, digest)
+
+
+def expand(snapshot: CalendarSnapshot, start: date, end: date) -> Iterator[dict]:
+    """Yield calendar entries for start <= date < end, in date then start time order."""
+    day = start
+    one_day = timedelta(days=1)
+    while day < end:
+        entries = []
+        for template in snapshot.classes_by_weekday.get(day.weekday(), ()):
+            if template["active_from"] is not None and day < template["active_from"]:
+                continue
+            if template["active_to"] is not None and day > template["active_to"]:
+                continue
+            if (template["class_id"], day) in snapshot.cancellations:
+                continue
+            entry = _entry(day, template)
+            del entry["active_from"], entry["active_to"]
+            entries.append(entry)
+        entries.extend(_entry(day, template) for template in snapshot.events_by_date.get(day, ()))
+        entries.sort(key=lambda e: e["start_time"])
+        yield from entries
+        day += one_day
+
+
+class CalendarEngine:
+    """
+    Serves calendar months and ranges from an in-memory snapshot.
+
+    Args:
+        ttl: Seconds before the snapshot is reloaded even without a write.
+        max_months: Number of expanded months kept in memory.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_months: int = 120):
+        self.ttl = ttl
+        self._months = TTLCache(maxsize=max_months, ttl=ttl)
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self, db: Session) -> CalendarSnapshot:
+        """Current snapshot, loading it with `db` when missing or stale."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                snapshot = load_snapshot(db)
+                if self._snapshot is None or snapshot.version != self._snapshot.version:
+                    self._months.clear()
+                self._snapshot = snapshot
+        return snapshot
+
+    def month(self, db: Session, year: int, month: int) -> tuple[dict, ...]:
+        snapshot = self.snapshot(db)
+        key = (snapshot.version, year, month)
+        entries = self._months.get(key)
+        if entries is None:
+            first = date(year, month, 1)
+            last = first + timedelta(days=calendar.monthrange(year, month)[1])
+            entries = tuple(expand(snapshot, first, last))
+            self._months.set(key, entries)
+        return entries
+
+    def between(self, db: Session, start: date, end: date) -> list[dict]:
+        """Entries for start <= date < end, assembled from cached months."""
+        entries = []
+        year, month = start.year, start.month
+        while date(year, month, 1) < end:
+            entries.extend(e for e in self.month(db, year, month) if start <= e["date"] < end)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return entries
+
+    def invalidate(self) -> None:
+        """Drop the snapshot and expanded months; the next read reloads."""
+        with self._lock:
+            self._snapshot = None
+            self._months.clear()
+
+
+calendar_engine = CalendarEngine(
+    ttl=float(os.getenv("CALENDAR_SNAPSHOT_TTL_SECONDS", "300")),
+    max_months=int(os.getenv("CALENDAR_MONTH_CACHE_SIZE", "120")),
+)
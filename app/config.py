@@ -0,0 +1,16 @@
+# app/config.py
+"""
+Process configuration.
+
+`load_env()` reads `.env` into the environment, once per process; modules
+that read settings at import time call it first. On Vercel the variables
+come from the project settings, so there is normally no `.env` to read.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
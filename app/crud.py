@@ -1,10 +1,18 @@
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
 from app import models, schemas
 from app.exceptions import NotFoundError, BadRequestError
-from sqlalchemy.exc import SQLAlchemyError
+from app.role_resolver import role_resolver
+from app.calendar_engine import calendar_engine
+from app.reference_data import reference_data
+from app.response_cache import response_cache
+from app import current_rank, foreign_keys, leaderboard, matviews
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 import uuid
-from typing import Optional, List
+from typing import Iterable, Optional, List
 
 days_of_week = {0: "Monday", 1: "Tuesday", 2: "Wednesday", 3: "Thursday", 4: "Friday", 5: "Saturday", 6: "Sunday"}
 
@@ -13,6 +21,7 @@ def create_belt(db: Session, belt: schemas.BeltCreate) -> models.Belt:
     db.add(db_belt)
     db.commit()
     db.refresh(db_belt)
+    reference_data.invalidate()
     return db_belt
 
 def standard_promotion(db: Session, person_id: int, location_id:int, promotions_date: datetime | None = None):
@@ -23,12 +32,12 @@ def standard_promotion(db: Session, person_id: int, location_id:int, promotions_
     if person.belt_level_id is None:
         raise BadRequestError("Person has no belt level assigned")
 
-    max_belt_id = db.query(models.Belt.id).order_by(models.Belt.id.desc()).first()
-    if max_belt_id and person.belt_level_id >= max_belt_id[0]:
+    next_belt_id = reference_data.get(db).next_belt_id(person.belt_level_id)
+    if next_belt_id is None:
         raise BadRequestError("Person is already at the highest belt level")
 
-    # Increment the belt level
-    person.belt_level_id += 1
+    # Move up to the next belt
+    person.belt_level_id = next_belt_id
     person.modified_at = datetime.now()
 
     # If promotions_date is not provided, use the current date
@@ -44,9 +53,14 @@ def standard_promotion(db: Session, person_id: int, location_id:int, promotions_
         tabs=0  # Assuming tabs is a field in Promotions, set to 0 or a default value
     )
     db.add(promotion)
+    if not current_rank.record(db, promotion):
+        db.rollback()
+        raise BadRequestError("Promotion date is earlier than the person's latest promotion")
 
     db.commit()
     db.refresh(promotion)
+    response_cache.invalidate(f"person:{person_id}")
+    matviews.refresher.refresh_later(models.t_full_person)
     return promotion
 
 def tab_promotion(db: Session, person_id: int, location_id:int, promotion_date: datetime | None = None):
@@ -60,9 +74,9 @@ def tab_promotion(db: Session, person_id: int, location_id:int, promotion_date:
     if promotion_date is None:
         promotion_date = datetime.now()
 
-    last_promotion = db.query(models.Promotions).filter(models.Promotions.student_id == person_id).order_by(models.Promotions.id.desc(), models.Promotions.promotion_date.desc()).first()
+    rank = current_rank.get(db, person_id)
 
-    if last_promotion is None:
+    if rank is None:
         raise BadRequestError("Person has no previous promotion record")
 
     # Log promotion
@@ -71,12 +85,17 @@ def tab_promotion(db: Session, person_id: int, location_id:int, promotion_date:
         location_id=location_id,
         promotion_date=promotion_date,
         belt_id=person.belt_level_id,
-        tabs=last_promotion.tabs + 1 
+        tabs=rank.tabs + 1
     )
     db.add(promotion)
+    if not current_rank.record(db, promotion):
+        db.rollback()
+        raise BadRequestError("Promotion date is earlier than the person's latest promotion")
 
     db.commit()
     db.refresh(promotion)
+    response_cache.invalidate(f"person:{person_id}")
+    matviews.refresher.refresh_later(models.t_full_person)
     return promotion
 
 def set_belt(db: Session, person_id: int, belt_toset_id: int, tabs_toset: int, location_id: int, promotion_date: datetime | None = None):
@@ -97,9 +116,15 @@ def set_belt(db: Session, person_id: int, belt_toset_id: int, tabs_toset: int, l
         tabs=tabs_toset
     )
     db.add(promotion)
+    # Also brings Person.belt_level_id in line with the new belt
+    if not current_rank.record(db, promotion):
+        db.rollback()
+        raise BadRequestError("Promotion date is earlier than the person's latest promotion")
 
     db.commit()
     db.refresh(promotion)
+    response_cache.invalidate(f"person:{person_id}")
+    matviews.refresher.refresh_later(models.t_full_person)
     return promotion
 
 def remove_promotion(db: Session, promotion_id: int):
@@ -110,28 +135,128 @@ def remove_promotion(db: Session, promotion_id: int):
     student_id = promotion.student_id
 
     db.delete(promotion)
+    # Fall back to the latest remaining promotion (belt level NULL if none)
+    current_rank.recompute(db, [student_id])
     db.commit()
 
-    # Find the most recent remaining promotion for this student
-    last_promotion = (
-        db.query(models.Promotions)
-        .filter(models.Promotions.student_id == student_id)
-        .order_by(models.Promotions.promotion_date.desc(), models.Promotions.id.desc())
-        .first()
-    )
+    response_cache.invalidate(f"person:{student_id}")
+    matviews.refresher.refresh_later(models.t_full_person)
+    return promotion
+
+def _as_aware(value: datetime) -> datetime:
+    """Naive datetimes are taken as local time, for comparing with timestamptz values."""
+    return value if value.tzinfo is not None else value.astimezone()
 
-    # Update the student's belt_level_id
-    student = db.query(models.Person).filter(models.Person.id == student_id).first()
-    if student:  # Make sure student exists
-        if last_promotion:
-            student.belt_level_id = last_promotion.belt_id
+def bulk_promote(db: Session, request: schemas.BulkPromotionRequest) -> schemas.BulkPromotionResponse:
+    """
+    Apply many promotions in one transaction.
+
+    Items follow the same rules as standard_promotion, tab_promotion and
+    set_belt, and are applied in order, so a person can appear more than once.
+    Persons and current ranks are loaded with one query each (belts and
+    locations come from the reference data registry), and all promotions are
+    written with a single multi-row INSERT; current_rank.recompute then
+    brings ranks and belt levels in line. Invalid items are reported
+    per item. With `atomic`, one invalid item means nothing is written.
+    """
+    items = request.items
+    person_ids = {item.person_id for item in items}
+    persons = {
+        p.id: p for p in db.query(models.Person.id, models.Person.belt_level_id).filter(models.Person.id.in_(person_ids))
+    }
+    refs = reference_data.get(db)
+    if any(refs.location(item.location_id or request.location_id) is None for item in items):
+        # Possibly a location created since the snapshot was taken
+        refs = reference_data.load(db)
+
+    # Current tabs and latest promotion date per person
+    ranks = current_rank.get_many(db, persons)
+    last_tabs = {person_id: rank.tabs for person_id, rank in ranks.items()}
+    latest_dates = {person_id: _as_aware(rank.promotion_date) for person_id, rank in ranks.items()}
+
+    default_date = request.promotion_date or datetime.now()
+    belt_levels = {person_id: person.belt_level_id for person_id, person in persons.items()}
+    rows, results = [], []
+
+    for index, item in enumerate(items):
+        location_id = item.location_id or request.location_id
+        promotion_date = item.promotion_date or default_date
+        latest_date = latest_dates.get(item.person_id)
+        error = None
+        if item.person_id not in persons:
+            error = f"Person not found: {item.person_id}"
+        elif refs.location(location_id) is None:
+            error = f"Location not found: {location_id}"
+        elif latest_date is not None and _as_aware(promotion_date) < latest_date:
+            error = "Promotion date is earlier than the person's latest promotion"
+        elif item.kind == "standard":
+            if belt_levels[item.person_id] is None:
+                error = "Person has no belt level assigned"
+            elif refs.next_belt_id(belt_levels[item.person_id]) is None:
+                error = "Person is already at the highest belt level"
+            else:
+                belt_id, tabs = refs.next_belt_id(belt_levels[item.person_id]), 0
+        elif item.kind == "tab":
+            if belt_levels[item.person_id] is None:
+                error = "Person has no belt level assigned"
+            elif item.person_id not in last_tabs:
+                error = "Person has no previous promotion record"
+            else:
+                belt_id, tabs = belt_levels[item.person_id], last_tabs[item.person_id] + 1
         else:
-            student.belt_level_id = None  # or lowest belt id if you prefer
+            if item.belt_id is None:
+                error = "belt_id is required for a set promotion"
+            elif refs.belt(item.belt_id) is None:
+                error = f"Belt not found: {item.belt_id}"
+            else:
+                belt_id, tabs = item.belt_id, item.tabs or 0
+
+        if error:
+            results.append(schemas.BulkPromotionResult(index=index, person_id=item.person_id, status="failed", error=error))
+            continue
+
+        belt_levels[item.person_id] = belt_id
+        last_tabs[item.person_id] = tabs
+        latest_dates[item.person_id] = _as_aware(promotion_date)
+        rows.append({
+            "student_id": item.person_id,
+            "location_id": location_id,
+            "promotion_date": promotion_date,
+            "belt_id": belt_id,
+            "tabs": tabs,
+        })
+        results.append(schemas.BulkPromotionResult(index=index, person_id=item.person_id, status="created"))
+
+    failed = sum(1 for r in results if r.status == "failed")
+    if not rows or (request.atomic and failed):
+        for result in results:
+            if result.status == "created":
+                result.status = "skipped"
+        return schemas.BulkPromotionResponse(committed=False, created=0, failed=failed, results=results)
+
+    try:
+        promotions = db.scalars(
+            insert(models.Promotions).returning(models.Promotions, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        # Ranks and belt levels from the promotions just written
+        current_rank.recompute(db, (row["student_id"] for row in rows))
+
+        # Serialise from the RETURNING rows before commit expires them
+        created = iter(promotions)
+        for result in results:
+            if result.status == "created":
+                result.promotion = schemas.PromotionOut.model_validate(next(created))
 
         db.commit()
-        db.refresh(student)
+    except SQLAlchemyError as e:
+        db.rollback()
+        raise BadRequestError(f"Bulk promotion failed: {str(e)}")
 
-    return promotion
+    response_cache.invalidate(*(f"person:{row['student_id']}" for row in rows))
+    matviews.refresher.refresh_later(models.t_full_person)
+
+    return schemas.BulkPromotionResponse(committed=True, created=len(promotions), failed=failed, results=results)
 
 def enroll_person(db: Session, person: schemas.PersonCreate) -> models.Person:
     try:
@@ -152,15 +277,71 @@ def enroll_person(db: Session, person: schemas.PersonCreate) -> models.Person:
             location_id=1
         )
         db.add(promotion)
+        current_rank.record(db, promotion)
 
         db.commit()
         db.refresh(db_person)
+        matviews.refresher.refresh_later(models.t_full_person)
         return db_person
 
     except SQLAlchemyError as e:
         db.rollback()
         raise BadRequestError(f"Enrollment failed: {str(e)}")
     
+def import_persons(
+    db: Session,
+    people: List[tuple[int, schemas.PersonCreate]],
+    location_id: int = 1,
+) -> List[tuple[int, Optional[int], Optional[str]]]:
+    """
+    Enroll a chunk of validated people, as enroll_person does for one.
+
+    `people` pairs each person with its source line. Persons are inserted with
+    one multi-row INSERT ... RETURNING id and their initial promotions with
+    another, inside a savepoint, then committed. If the batch is rejected (e.g.
+    an unknown age category) each row is retried in its own savepoint so only
+    the offending rows fail. Returns (line, person_id, error) per row.
+    """
+    def person_row(person: schemas.PersonCreate) -> dict:
+        return {**person.model_dump(), "role_id": 2, "belt_level_id": 1, "active": True}
+
+    def insert_batch(batch: List[tuple[int, schemas.PersonCreate]]) -> List[int]:
+        person_ids = db.scalars(
+            insert(models.Person).returning(models.Person.id, sort_by_parameter_order=True),
+            [person_row(person) for _, person in batch],
+        ).all()
+        now = datetime.now()
+        db.execute(
+            insert(models.Promotions),
+            [
+                {"student_id": person_id, "promotion_date": now, "belt_id": 1, "tabs": 0, "location_id": location_id}
+                for person_id in person_ids
+            ],
+        )
+        current_rank.recompute(db, person_ids)
+        return person_ids
+
+    if not people:
+        return []
+
+    try:
+        with db.begin_nested():
+            person_ids = insert_batch(people)
+        outcomes = [(line, person_id, None) for (line, _), person_id in zip(people, person_ids)]
+    except SQLAlchemyError:
+        outcomes = []
+        for line, person in people:
+            try:
+                with db.begin_nested():
+                    (person_id,) = insert_batch([(line, person)])
+                outcomes.append((line, person_id, None))
+            except SQLAlchemyError as e:
+                outcomes.append((line, None, f"Enrollment failed: {str(getattr(e, 'orig', None) or e).strip()}"))
+
+    db.commit()
+    matviews.refresher.refresh_later(models.t_full_person)
+    return outcomes
+
 def create_class(db: Session, class_: schemas.ClassCreate) -> models.Class:
     try:
         # exclude age_categories when creating Class
@@ -180,6 +361,9 @@ def create_class(db: Session, class_: schemas.ClassCreate) -> models.Class:
 
         db.commit()
         db.refresh(db_class)
+        calendar_engine.invalidate()
+        response_cache.invalidate("calendar")
+        matviews.refresher.refresh_later(models.t_full_calendar)
         return db_class
 
     except SQLAlchemyError as e:
@@ -201,6 +385,12 @@ def update_person(db: Session, person_id: int, person_update: schemas.PersonUpda
         db.add(db_person)
         db.commit()
         db.refresh(db_person)
+        response_cache.invalidate(f"person:{person_id}")
+        if update_data.keys() & {"first_name", "last_name"}:
+            # Instructor names are part of the calendar snapshot
+            calendar_engine.invalidate()
+            response_cache.invalidate("calendar")
+        matviews.refresher.refresh_later(models.t_full_person, models.t_full_award, models.t_full_calendar)
 
         return db_person
 
@@ -213,6 +403,7 @@ def create_location(db: Session, location: schemas.LocationCreate) -> models.Loc
     db.add(db_location)
     db.commit()
     db.refresh(db_location)
+    reference_data.invalidate()
     return db_location
 
 def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
@@ -233,6 +424,9 @@ def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
 
         db.commit()
         db.refresh(db_event)
+        calendar_engine.invalidate()
+        response_cache.invalidate("calendar")
+        matviews.refresher.refresh_later(models.t_full_calendar)
         return db_event
 
     except SQLAlchemyError as e:
@@ -246,6 +440,9 @@ def delete_event(db: Session, event_id: int):
 
     db.delete(event)
     db.commit()
+    calendar_engine.invalidate()
+    response_cache.invalidate("calendar", "event")
+    matviews.refresher.refresh_later(models.t_full_calendar, models.t_full_award)
     return event
 
 def delete_class(db: Session, class_id: int):
@@ -255,6 +452,9 @@ def delete_class(db: Session, class_id: int):
 
     db.delete(class_)
     db.commit()
+    calendar_engine.invalidate()
+    response_cache.invalidate("calendar")
+    matviews.refresher.refresh_later(models.t_full_calendar)
     return class_
 
 def get_user_by_email(db: Session, email: str):
@@ -267,6 +467,7 @@ def update_user_role(db: Session, user_id: uuid.UUID, new_role: str):
     user.role = new_role
     db.commit()
     db.refresh(user)
+    role_resolver.invalidate(user_id=user.id, email=user.email)
     return user
 
 def update_class(db: Session, class_id: int, class_: schemas.ClassUpdate) -> models.Class:
@@ -305,125 +506,285 @@ def update_class(db: Session, class_id: int, class_: schemas.ClassUpdate) -> mod
 
         db.commit()
         db.refresh(db_class)
+        calendar_engine.invalidate()
+        response_cache.invalidate("calendar")
+        matviews.refresher.refresh_later(models.t_full_calendar)
         return db_class
 
     except SQLAlchemyError as e:
         db.rollback()
         raise BadRequestError(f"Update failed: {str(e)}")
 
-def create_award(db: Session, award: schemas.AwardCreate) -> models.Award:
+def _award_refs(persons, award_types, belts=(), events=(), categories=()) -> list[foreign_keys.Ref]:
+    """What an award refers to, for one-round-trip validation."""
+    return [
+        foreign_keys.Ref("Person", models.Person.id, persons, models.Person.belt_level_id),
+        foreign_keys.Ref("Award type", models.AwardType.id, award_types, models.AwardType.points),
+        foreign_keys.Ref("Belt", models.Belt.id, belts),
+        foreign_keys.Ref("Event", models.Event.id, events),
+        foreign_keys.Ref("Tournament category", models.TournamentCategory.id, categories),
+    ]
+
+
+def _get_award_with_points(db: Session, award_id: int) -> tuple[models.Award, Optional[int]]:
+    row = db.execute(
+        select(models.Award, models.AwardType.points)
+        .join(models.AwardType, models.AwardType.id == models.Award.award_type)
+        .where(models.Award.id == award_id)
+    ).first()
+    if not row:
+        raise NotFoundError("Award", award_id)
+    return row.Award, row.points
+
+
+def create_award(db: Session, award: schemas.AwardCreate) -> schemas.AwardOut:
     """
     Create a new award.
     Automatically pulls current rank from person table if rank_at_time is not provided.
+    Every referenced id is checked in one query.
     """
-    person = db.query(models.Person).filter(models.Person.id == award.person).first()
-    if not person:
-        raise NotFoundError("Person", award.person)
+    found = foreign_keys.require(db, *_award_refs(
+        [award.person], [award.award_type], [award.rank_at_time], [award.event], [award.tournament_category]
+    ))
 
     rank_at_time = award.rank_at_time
     if rank_at_time is None:
-        if person.belt_level_id is None:
+        rank_at_time = found["Person"][award.person]
+        if rank_at_time is None:
             raise BadRequestError("Person has no belt level assigned")
-        rank_at_time = person.belt_level_id
 
-    award_type = db.query(models.AwardType).filter(
-        models.AwardType.id == award.award_type
-    ).first()
-    if not award_type:
-        raise NotFoundError("Award type", award.award_type)
-
-    if award.event is not None:
-        event = db.query(models.Event).filter(models.Event.id == award.event).first()
-        if not event:
-            raise NotFoundError("Event", award.event)
-
-    if award.tournament_category is not None:
-        category = db.query(models.TournamentCategory).filter(
-            models.TournamentCategory.id == award.tournament_category
-        ).first()
-        if not category:
-            raise NotFoundError("Tournament category", award.tournament_category)
-    
-    # Create the award
-    new_award = models.Award(
-        award_type=award.award_type,
-        person=award.person,
-        rank_at_time=rank_at_time,
-        event=award.event,
-        date_achieved=award.date_achieved if award.date_achieved else datetime.now(),
-        tournament_category=award.tournament_category
-    )
-    db.add(new_award)
-    db.commit()
-    db.refresh(new_award)
-    return new_award
+    try:
+        new_award = db.scalars(
+            insert(models.Award).values(
+                award_type=award.award_type,
+                person=award.person,
+                rank_at_time=rank_at_time,
+                event=award.event,
+                date_achieved=award.date_achieved if award.date_achieved else datetime.now(),
+                tournament_category=award.tournament_category
+            ).returning(models.Award)
+        ).one()
+        leaderboard.add(db, leaderboard.contribution(new_award, found["Award type"][award.award_type]))
+        # Serialise from the RETURNING row before commit expires it
+        result = schemas.AwardOut.model_validate(new_award)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise BadRequestError(foreign_keys.violation(e))
+
+    response_cache.invalidate(f"person:{result.person}")
+    matviews.refresher.refresh_later(models.t_full_award)
+    return result
+
+
+def bulk_create_awards(db: Session, request: schemas.BulkAwardRequest) -> schemas.BulkAwardResponse:
+    """
+    Create many awards in one transaction, e.g. a tournament's medal table.
+
+    Items default to the request's event and date, and take the person's
+    current belt when rank_at_time is missing, as in create_award. Every
+    referenced id across all items is checked in one query, the belt against
+    the tournament category's eligible belts in the reference data, and the
+    awards are written with a single multi-row INSERT. Invalid items are
+    reported per item. With `atomic`, one invalid item means nothing is
+    written.
+    """
+    items = request.items
+    found = foreign_keys.lookup(db, *_award_refs(
+        {item.person for item in items},
+        {item.award_type for item in items},
+        {item.rank_at_time for item in items},
+        {item.event if item.event is not None else request.event for item in items},
+        {item.tournament_category for item in items},
+    ))
+
+    categories = found["Tournament category"]
+    refs = reference_data.get(db)
+    if any(refs.tournament_category(id) is None for id in categories):
+        # Possibly a category created since the snapshot was taken
+        refs = reference_data.load(db)
+
+    default_date = request.date_achieved or datetime.now().date()
+    rows, results = [], []
+    for index, item in enumerate(items):
+        event = item.event if item.event is not None else request.event
+        checks = [
+            ("Person", item.person), ("Award type", item.award_type), ("Belt", item.rank_at_time),
+            ("Event", event), ("Tournament category", item.tournament_category),
+        ]
+        error = next((f"{entity} not found: {id}" for entity, id in checks if id is not None and id not in found[entity]), None)
+        rank_at_time = item.rank_at_time
+        if error is None and rank_at_time is None:
+            rank_at_time = found["Person"][item.person]
+            if rank_at_time is None:
+                error = "Person has no belt level assigned"
+        if error is None and item.tournament_category is not None and not refs.belt_eligible(item.tournament_category, rank_at_time):
+            error = f"Belt {rank_at_time} is not eligible for tournament category {item.tournament_category}"
+
+        if error:
+            results.append(schemas.BulkAwardResult(index=index, person=item.person, status="failed", error=error))
+            continue
+
+        rows.append({
+            "award_type": item.award_type,
+            "person": item.person,
+            "rank_at_time": rank_at_time,
+            "event": event,
+            "date_achieved": item.date_achieved or default_date,
+            "tournament_category": item.tournament_category,
+        })
+        results.append(schemas.BulkAwardResult(index=index, person=item.person, status="created"))
+
+    failed = sum(1 for r in results if r.status == "failed")
+    if not rows or (request.atomic and failed):
+        for result in results:
+            if result.status == "created":
+                result.status = "skipped"
+        return schemas.BulkAwardResponse(committed=False, created=0, failed=failed, results=results)
+
+    try:
+        awards = db.scalars(
+            insert(models.Award).returning(models.Award, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        leaderboard.add(db, *(leaderboard.contribution(a, found["Award type"][a.award_type]) for a in awards))
+
+        # Serialise from the RETURNING rows before commit expires them
+        created = iter(awards)
+        for result in results:
+            if result.status == "created":
+                result.award = schemas.AwardOut.model_validate(next(created))
+
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        if isinstance(e, IntegrityError):
+            raise BadRequestError(foreign_keys.violation(e))
+        raise BadRequestError(f"Bulk award creation failed: {str(e)}")
+
+    response_cache.invalidate(*{f"person:{row['person']}" for row in rows})
+    matviews.refresher.refresh_later(models.t_full_award)
+
+    return schemas.BulkAwardResponse(committed=True, created=len(awards), failed=failed, results=results)
+
 
+def import_tournament_results(
+    db: Session,
+    rows: List[tuple[int, schemas.TournamentResultRow]],
+    event: Optional[int] = None,
+    date_achieved: Optional[date] = None,
+    atomic: bool = False,
+) -> tuple[bool, List[tuple[int, Optional[int], Optional[str]]]]:
+    """
+    Record a tournament's results, as one bulk_create_awards batch.
 
-def update_award(db: Session, award_id: int, award_update: schemas.AwardUpdate) -> models.Award:
+    `rows` pairs each result with its source line. Award types are matched by
+    name (case-insensitive) or id with one query; tournament categories by
+    name or id from the reference data, whose eligibility index then checks
+    each competitor's belt. Returns whether the batch was committed and
+    (line, award_id, error) for every row created or rejected.
+    """
+    award_types = {}
+    for id, name in db.query(models.AwardType.id, models.AwardType.award_name):
+        award_types[str(id)] = id
+        award_types.setdefault(name.strip().casefold(), id)
+
+    refs = reference_data.get(db)
+
+    def category_id(name: str) -> Optional[int]:
+        if name.strip().isdigit():
+            return int(name)
+        category = refs.find_tournament_category(name)
+        return category.id if category is not None else None
+
+    if any(row.category is not None and category_id(row.category) is None for _, row in rows):
+        # Possibly a category created since the snapshot was taken
+        refs = reference_data.load(db)
+
+    outcomes, items, item_lines = [], [], []
+    for line, row in rows:
+        award_type = award_types.get(row.award_type.strip().casefold())
+        category = category_id(row.category) if row.category is not None else None
+        if award_type is None:
+            outcomes.append((line, None, f"Award type not found: {row.award_type}"))
+        elif row.category is not None and category is None:
+            outcomes.append((line, None, f"Tournament category not found: {row.category}"))
+        else:
+            items.append(schemas.BulkAwardItem(
+                award_type=award_type,
+                person=row.person,
+                rank_at_time=row.rank_at_time,
+                event=row.event,
+                tournament_category=category,
+                date_achieved=row.date_achieved,
+            ))
+            item_lines.append(line)
+
+    if not items or (atomic and outcomes):
+        return False, outcomes
+
+    response = bulk_create_awards(db, schemas.BulkAwardRequest(
+        event=event, date_achieved=date_achieved, atomic=atomic, items=items,
+    ))
+    for result in response.results:
+        if result.status == "created":
+            outcomes.append((item_lines[result.index], result.award.id, None))
+        elif result.status == "failed":
+            outcomes.append((item_lines[result.index], None, result.error))
+    outcomes.sort(key=lambda outcome: outcome[0])
+    return response.committed, outcomes
+
+
+def update_award(db: Session, award_id: int, award_update: schemas.AwardUpdate) -> schemas.AwardOut:
     """
     Update an existing award.
     Only updates fields that are provided (not None).
+    Every referenced id is checked in one query.
     """
-    award = db.query(models.Award).filter(models.Award.id == award_id).first()
-    if not award:
-        raise NotFoundError("Award", award_id)
-
+    award, previous_points = _get_award_with_points(db, award_id)
     update_data = award_update.model_dump(exclude_unset=True)
 
-    if "person" in update_data:
-        person = db.query(models.Person).filter(
-            models.Person.id == update_data["person"]
-        ).first()
-        if not person:
-            raise NotFoundError("Person", update_data["person"])
-
-    if "award_type" in update_data:
-        award_type = db.query(models.AwardType).filter(
-            models.AwardType.id == update_data["award_type"]
-        ).first()
-        if not award_type:
-            raise NotFoundError("Award type", update_data["award_type"])
-
-    if "rank_at_time" in update_data and update_data["rank_at_time"] is not None:
-        belt = db.query(models.Belt).filter(
-            models.Belt.id == update_data["rank_at_time"]
-        ).first()
-        if not belt:
-            raise NotFoundError("Belt", update_data["rank_at_time"])
-
-    if "event" in update_data and update_data["event"] is not None:
-        event = db.query(models.Event).filter(
-            models.Event.id == update_data["event"]
-        ).first()
-        if not event:
-            raise NotFoundError("Event", update_data["event"])
-
-    if "tournament_category" in update_data and update_data["tournament_category"] is not None:
-        category = db.query(models.TournamentCategory).filter(
-            models.TournamentCategory.id == update_data["tournament_category"]
-        ).first()
-        if not category:
-            raise NotFoundError("Tournament category", update_data["tournament_category"])
+    found = foreign_keys.require(db, *_award_refs(
+        [update_data.get("person")],
+        [update_data.get("award_type")],
+        [update_data.get("rank_at_time")],
+        [update_data.get("event")],
+        [update_data.get("tournament_category")],
+    ))
 
+    previous_person = award.person
+    before = leaderboard.contribution(award, previous_points)
     for field, value in update_data.items():
         setattr(award, field, value)
 
-    db.commit()
-    db.refresh(award)
+    try:
+        db.flush()
+        points = found["Award type"].get(award.award_type, previous_points)
+        leaderboard.replace(db, before, leaderboard.contribution(award, points))
+        result = schemas.AwardOut.model_validate(award)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise BadRequestError(foreign_keys.violation(e))
 
-    return award
+    response_cache.invalidate(f"person:{previous_person}", f"person:{result.person}")
+    matviews.refresher.refresh_later(models.t_full_award)
+
+    return result
 
 
 def delete_award(db: Session, award_id: int):
     """
     Delete an award by ID.
     """
-    award = db.query(models.Award).filter(models.Award.id == award_id).first()
-    if not award:
-        raise NotFoundError("Award", award_id)
+    award, points = _get_award_with_points(db, award_id)
 
+    person_id = award.person
+    leaderboard.subtract(db, leaderboard.contribution(award, points))
     db.delete(award)
     db.commit()
+    response_cache.invalidate(f"person:{person_id}")
+    matviews.refresher.refresh_later(models.t_full_award)
 
     return award
 
@@ -475,3 +836,169 @@ def delete_contact(db: Session, contact_id: int, user_id: uuid.UUID) -> bool:
     db.delete(db_contact)
     db.commit()
     return True
+
+
+def attendance_rows(records: Iterable[schemas.AttendanceCreate], now: Optional[datetime] = None) -> List[dict]:
+    """
+    Insert rows for check-ins, dated today and timed now unless given. Taps
+    for the same person, class and day collapse into one, keeping the
+    earliest start_time.
+    """
+    now = now or datetime.now()
+    rows = {}
+    for record in records:
+        row = {
+            "person_id": record.person_id,
+            "class_id": record.class_id,
+            "attendance_date": record.attendance_date or now.date(),
+            "start_time": record.start_time or now.time().replace(microsecond=0),
+        }
+        key = (row["person_id"], row["class_id"], row["attendance_date"])
+        if key not in rows or row["start_time"] < rows[key]["start_time"]:
+            rows[key] = row
+    return list(rows.values())
+
+
+def upsert_attendance(db: Session, rows: List[dict]) -> List[models.Attendance]:
+    """
+    Write check-ins with one multi-row INSERT ... ON CONFLICT on
+    (person_id, attendance_date, class_id), so repeating a check-in is
+    harmless: the existing row keeps the earlier start_time and gets a new
+    modified_at. `rows` come from attendance_rows (caller commits).
+    """
+    if not rows:
+        return []
+    attendance = models.Attendance
+    statement = pg_insert(attendance).values(rows)
+    statement = statement.on_conflict_do_update(
+        index_elements=[attendance.person_id, attendance.attendance_date, attendance.class_id],
+        set_={
+            "start_time": func.least(attendance.start_time, statement.excluded.start_time),
+            "modified_at": func.now(),
+        },
+    ).returning(attendance)
+    return db.scalars(statement, execution_options={"populate_existing": True}).all()
+
+
+def require_attendance_refs(db: Session, records: Iterable[schemas.AttendanceCreate]) -> None:
+    """Check every person and class a batch of check-ins refers to, in one query."""
+    records = list(records)
+    foreign_keys.require(
+        db,
+        foreign_keys.Ref("Person", models.Person.id, {record.person_id for record in records}),
+        foreign_keys.Ref("Class", models.Class.id, {record.class_id for record in records}),
+    )
+
+
+def check_in(db: Session, records: List[schemas.AttendanceCreate]) -> List[schemas.AttendanceOut]:
+    """
+    Record attendance now: one query to check the people and classes, one
+    upsert for the whole batch.
+    """
+    require_attendance_refs(db, records)
+    try:
+        result = [schemas.AttendanceOut.model_validate(row) for row in upsert_attendance(db, attendance_rows(records))]
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise BadRequestError(foreign_keys.violation(e))
+    return result
+
+
+def get_attendance(
+    db: Session,
+    start: date,
+    end: date,
+    class_id: Optional[int] = None,
+    person_id: Optional[int] = None,
+) -> List[models.Attendance]:
+    """Attendance between two dates (inclusive) for a class or a person, by date."""
+    attendance = models.Attendance
+    query = db.query(attendance).filter(attendance.attendance_date.between(start, end))
+    if class_id is not None:
+        query = query.filter(attendance.class_id == class_id)
+    if person_id is not None:
+        query = query.filter(attendance.person_id == person_id)
+    return query.order_by(attendance.attendance_date, attendance.start_time, attendance.id).all()
+
+
+# --- Async variants for `async def` routes (AsyncSession from get_async_db) ---
+
+async def get_contacts_by_user_async(db: AsyncSession, user_id: uuid.UUID) -> List[models.Contact]:
+    """Get all contacts for a specific user"""
+    result = await db.scalars(select(models.Contact).where(models.Contact.user_id == user_id))
+    return list(result.all())
+
+async def get_contact_async(db: AsyncSession, contact_id: int, user_id: uuid.UUID) -> Optional[models.Contact]:
+    """Get a specific contact - ensures it belongs to the user"""
+    return await db.scalar(
+        select(models.Contact).where(
+            models.Contact.id == contact_id,
+            models.Contact.user_id == user_id
+        )
+    )
+
+async def create_contact_async(db: AsyncSession, contact: schemas.ContactCreate) -> models.Contact:
+    """Create a new contact"""
+    db_contact = models.Contact(**contact.model_dump())
+    db.add(db_contact)
+    await db.commit()
+    await db.refresh(db_contact)
+    return db_contact
+
+async def update_contact_async(
+    db: AsyncSession,
+    contact_id: int,
+    user_id: uuid.UUID,
+    contact_update: schemas.ContactUpdate
+) -> Optional[models.Contact]:
+    """Update a contact - ensures it belongs to the user"""
+    db_contact = await get_contact_async(db, contact_id, user_id)
+    if not db_contact:
+        return None
+
+    # Only update fields that were provided
+    update_data = contact_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_contact, field, value)
+
+    await db.commit()
+    await db.refresh(db_contact)
+    return db_contact
+
+async def delete_contact_async(db: AsyncSession, contact_id: int, user_id: uuid.UUID) -> bool:
+    """Delete a contact - ensures it belongs to the user"""
+    db_contact = await get_contact_async(db, contact_id, user_id)
+    if not db_contact:
+        return False
+
+    await db.delete(db_contact)
+    await db.commit()
+    return True
+
+async def update_person_async(db: AsyncSession, person_id: int, person_update: schemas.PersonUpdate) -> models.Person:
+    try:
+        db_person = await db.get(models.Person, person_id)
+        if not db_person:
+            raise NotFoundError("Person", person_id)
+
+        update_data = person_update.model_dump(exclude_unset=True)
+        for key, value in update_data.items():
+            setattr(db_person, key, value)
+
+        db_person.modified_at = datetime.now()
+
+        await db.commit()
+        await db.refresh(db_person)
+        response_cache.invalidate(f"person:{person_id}")
+        if update_data.keys() & {"first_name", "last_name"}:
+            # Instructor names are part of the calendar snapshot
+            calendar_engine.invalidate()
+            response_cache.invalidate("calendar")
+        matviews.refresher.refresh_later(models.t_full_person, models.t_full_award, models.t_full_calendar)
+
+        return db_person
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise BadRequestError(f"Update failed: {str(e)}")
@@ -0,0 +1,127 @@
+# app/current_rank.py
+"""
+The person_current_rank projection: each person's latest promotion (belt,
+tabs, date), so a current-rank read is a primary-key lookup instead of a
+sort over their promotions.
+
+Promotion writes keep it up to date in their own transaction: inserts call
+`record`, deletes and bulk writes call `recompute`. `Person.belt_level_id` is
+synced from it at the same time. `rebuild` reconciles the whole table (and
+belt levels) from `promotions`, for data edited outside the API:
+
+    python -m app.manage ranks rebuild
+
+"Latest" means highest promotion_date, then highest id, throughout.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, delete, exists, func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+Rank = models.PersonCurrentRank
+Promotion = models.Promotions
+
+RANK_COLUMNS = ["person_id", "promotion_id", "belt_id", "tabs", "promotion_date", "location_id"]
+
+
+def _upsert(stmt, only_if_newer: bool):
+    excluded = stmt.excluded
+    newer = or_(
+        excluded.promotion_date > Rank.promotion_date,
+        and_(excluded.promotion_date == Rank.promotion_date, excluded.promotion_id > Rank.promotion_id),
+    )
+    changed = tuple_(*(Rank.__table__.c[name] for name in RANK_COLUMNS[1:])).is_distinct_from(
+        tuple_(*(excluded[name] for name in RANK_COLUMNS[1:]))
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[Rank.person_id],
+        set_={name: excluded[name] for name in RANK_COLUMNS[1:]} | {"updated_at": excluded.updated_at},
+        where=newer if only_if_newer else changed,
+    )
+
+
+def _sync_belt_levels(db: Session, person_ids: Optional[list[int]] = None, only_ranked: bool = False) -> int:
+    """
+    Set Person.belt_level_id from the projection (NULL without promotions),
+    stamping modified_at on the persons that change. With `only_ranked`,
+    persons with no projection row keep their belt level, e.g. people
+    created before promotions were recorded.
+    """
+    current = select(Rank.belt_id).where(Rank.person_id == models.Person.id).scalar_subquery()
+    stmt = update(models.Person).where(models.Person.belt_level_id.is_distinct_from(current))
+    if person_ids is not None:
+        stmt = stmt.where(models.Person.id.in_(person_ids))
+    if only_ranked:
+        stmt = stmt.where(exists().where(Rank.person_id == models.Person.id))
+    return db.execute(stmt.values(belt_level_id=current, modified_at=func.now()), execution_options={"synchronize_session": False}).rowcount
+
+
+def record(db: Session, promotion: models.Promotions) -> bool:
+    """
+    Fold a newly added promotion into the projection. Returns False, leaving
+    the projection and belt level alone, when the promotion is backdated
+    (not the person's latest).
+    """
+    db.flush()
+    latest = db.execute(_upsert(insert(Rank).values(
+        person_id=promotion.student_id,
+        promotion_id=promotion.id,
+        belt_id=promotion.belt_id,
+        tabs=promotion.tabs,
+        promotion_date=promotion.promotion_date,
+        location_id=promotion.location_id,
+    ), only_if_newer=True).returning(Rank.person_id)).first() is not None
+    if latest:
+        _sync_belt_levels(db, [promotion.student_id])
+    return latest
+
+
+def _recompute(db: Session, person_ids: Optional[list[int]], only_ranked: bool = False) -> tuple[int, int]:
+    latest = (
+        select(Promotion.student_id, Promotion.id, Promotion.belt_id, Promotion.tabs, Promotion.promotion_date, Promotion.location_id)
+        .distinct(Promotion.student_id)
+        .order_by(Promotion.student_id, Promotion.promotion_date.desc(), Promotion.id.desc())
+    )
+    orphans = delete(Rank).where(~exists().where(Promotion.student_id == Rank.person_id))
+    if person_ids is not None:
+        latest = latest.where(Promotion.student_id.in_(person_ids))
+        orphans = orphans.where(Rank.person_id.in_(person_ids))
+
+    upserted = db.execute(_upsert(insert(Rank).from_select(RANK_COLUMNS, latest), only_if_newer=False)).rowcount
+    deleted = db.execute(orphans).rowcount
+    return upserted + deleted, _sync_belt_levels(db, person_ids, only_ranked)
+
+
+def recompute(db: Session, person_ids: Iterable[int]) -> None:
+    """Re-derive the projection for `person_ids` from their promotions, e.g. after a delete."""
+    person_ids = list(set(person_ids))
+    if person_ids:
+        db.flush()
+        _recompute(db, person_ids)
+
+
+def rebuild(db: Session) -> tuple[int, int]:
+    """
+    Reconcile the whole projection with `promotions` in bulk (caller commits).
+    Persons without promotions keep their belt level.
+    Returns (projection rows changed, belt levels corrected).
+    """
+    return _recompute(db, None, only_ranked=True)
+
+
+def get_many(db: Session, person_ids: Iterable[int]) -> dict[int, models.PersonCurrentRank]:
+    """Current ranks by person id; persons missing from the projection are derived first."""
+    person_ids = set(person_ids)
+    ranks = {rank.person_id: rank for rank in db.query(Rank).filter(Rank.person_id.in_(person_ids))}
+    missing = person_ids - ranks.keys()
+    if missing:
+        _recompute(db, list(missing), only_ranked=True)
+        ranks.update((rank.person_id, rank) for rank in db.query(Rank).filter(Rank.person_id.in_(missing)))
+    return ranks
+
+
+def get(db: Session, person_id: int) -> Optional[models.PersonCurrentRank]:
+    return get_many(db, [person_id]).get(person_id)
@@ -1,10 +1,17 @@
+import logging
 import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine, MetaData
+import threading
+import time
+from sqlalchemy import create_engine, event, MetaData, exc
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
-# Load environment variables
-load_dotenv()
+from app.config import load_env
+
+load_env()
+logger = logging.getLogger(__name__)
 
 # Define a global naming convention
 naming_convention = {
@@ -17,19 +24,242 @@ naming_convention = {
 
 metadata = MetaData(naming_convention=naming_convention)
 
-DATABASE_URL = os.getenv("SUPABASE_DATABASE_URL")
-print("DATABASE_URL =", repr(DATABASE_URL))
+# Supabase's transaction-mode pooler (Supavisor/pgbouncer) listens on 6543
+TRANSACTION_POOLER_PORT = 6543
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class PoolMetrics:
+    """Counters for one engine's connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / self.waits * 1000, 3) if self.waits else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class _TimedCheckoutMixin:
+    """Times how long checkouts wait for a pooled connection."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.incr("timeouts")
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_transaction_pooler(url: URL) -> bool:
+    """Whether connections go through a transaction-mode pooler (DB_TRANSACTION_POOLER overrides)."""
+    return _env_bool("DB_TRANSACTION_POOLER", url.port == TRANSACTION_POOLER_PORT)
+
+
+def create_db_engine(url: str | URL, is_async: bool = False):
+    """
+    Build an engine whose pool is configured from the environment.
+
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds), DB_POOL_RECYCLE
+    (seconds) and DB_POOL_PRE_PING tune the queue pool. Behind a
+    transaction-mode pooler (port 6543, or DB_TRANSACTION_POOLER=true) the
+    app keeps no pool of its own (NullPool) and psycopg3 prepared statements
+    are disabled, since consecutive statements may run on different backend
+    connections.
+    """
+    url = make_url(url)
+    metrics = PoolMetrics()
+    kwargs = {"pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True)}
+    connect_args = {}
+
+    if is_transaction_pooler(url):
+        kwargs["poolclass"] = NullPool
+        if url.get_driver_name() == "psycopg":
+            connect_args["prepare_threshold"] = None
+    else:
+        kwargs.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        )
+
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+
+    if is_async:
+        db_engine = create_async_engine(url, **kwargs)
+        pool = db_engine.sync_engine.pool
+    else:
+        db_engine = create_engine(url, future=True, **kwargs)
+        pool = db_engine.pool
+
+    pool.metrics = metrics
+    _attach_pool_events(pool, metrics)
+    return db_engine
+
+
+def _attach_pool_events(pool, metrics: PoolMetrics) -> None:
+    event.listen(pool, "connect", lambda *args: metrics.incr("connects"))
+    event.listen(pool, "checkout", lambda *args: metrics.incr("checkouts"))
+    event.listen(pool, "checkin", lambda *args: metrics.incr("checkins"))
+    event.listen(pool, "invalidate", lambda *args: metrics.incr("invalidations"))
+
+
+def pool_stats(db_engine) -> dict:
+    """Current pool occupancy plus cumulative checkout/wait metrics."""
+    pool = getattr(db_engine, "sync_engine", db_engine).pool
+    stats = {"pool": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+    stats.update(pool.metrics.snapshot())
+    return stats
 
-if not DATABASE_URL:
-    raise ValueError("SUPABASE_DATABASE_URL is not set")
 
-engine = create_engine(DATABASE_URL, future=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 Base = declarative_base()
 
+# Engines and session factories are created on first use, not at import:
+# importing the app (e.g. on a serverless cold start, or in unit tests) never
+# needs SUPABASE_DATABASE_URL or touches the database. `engine`,
+# `async_engine`, `SessionLocal` and `AsyncSessionLocal` remain importable
+# names via the module __getattr__ below.
+_lazy: dict = {}
+_lazy_lock = threading.RLock()
+
+
+def _get_or_create(name: str, factory):
+    value = _lazy.get(name)
+    if value is None:
+        with _lazy_lock:
+            value = _lazy.get(name)
+            if value is None:
+                value = _lazy[name] = factory()
+    return value
+
+
+def database_url() -> str:
+    url = os.getenv("SUPABASE_DATABASE_URL")
+    if not url:
+        raise ValueError("SUPABASE_DATABASE_URL is not set")
+    return url
+
+
+def async_database_url() -> URL:
+    # psycopg3's native async driver
+    return make_url(database_url()).set(drivername="postgresql+psycopg")
+
+
+def _create_engine():
+    url = make_url(database_url())
+    logger.info("Creating database engine for %s", url.render_as_string(hide_password=True))
+    return create_db_engine(url)
+
+
+def get_engine():
+    """The sync engine, created on first use."""
+    return _get_or_create("engine", _create_engine)
+
+
+def get_async_engine():
+    """The async engine for `async def` routes, created on first use."""
+    return _get_or_create("async_engine", lambda: create_db_engine(async_database_url(), is_async=True))
+
+
+def get_sessionmaker() -> sessionmaker:
+    return _get_or_create(
+        "SessionLocal", lambda: sessionmaker(autocommit=False, autoflush=False, bind=get_engine(), future=True)
+    )
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    return _get_or_create(
+        "AsyncSessionLocal", lambda: async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    )
+
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "async_engine": get_async_engine,
+    "SessionLocal": get_sessionmaker,
+    "AsyncSessionLocal": get_async_sessionmaker,
+    "DATABASE_URL": database_url,
+    "ASYNC_DATABASE_URL": async_database_url,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def dispose_engines() -> None:
+    """Close the pools of whichever engines were created (on shutdown)."""
+    sync_engine, async_engine = _lazy.get("engine"), _lazy.get("async_engine")
+    if sync_engine is not None:
+        sync_engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
 def get_db():
-    db = SessionLocal()
+    db = get_sessionmaker()()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
@@ -36,3 +36,9 @@ class ConflictError(HTTPException):
     """Raised when there's a conflict with current state."""
     def __init__(self, detail: str):
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class ServiceUnavailableError(HTTPException):
+    """Raised when a dependency is temporarily unavailable; the client should retry."""
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
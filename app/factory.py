@@ -0,0 +1,117 @@
+# app/factory.py
+"""
+Application factory.
+
+`create_app(routers)` builds the FastAPI app with only the named routers
+mounted, importing each router module (and through it crud, auth, httpx,
+...) only when it is selected. `main.app` mounts everything, or the
+comma-separated KSW_ROUTERS when set. A serverless function that serves a
+single area can mount just what it needs, e.g.
+
+    app = create_app(["belts", "role", "age_category", "location"])
+
+which keeps the rest of the API off its cold-start path.
+"""
+import importlib
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.config import load_env
+from app.logging_config import LogContextMiddleware, configure_logging
+
+load_env()
+
+# Router module in app.api.v1 -> (mount prefix, OpenAPI tag)
+ROUTERS = {
+    "belts": ("/belts", "Belts"),
+    "promotions": ("/promotions", "Promotions"),
+    "person": ("/person", "Person"),
+    "class_": ("/class", "Class"),
+    "age_category": ("/age_category", "Age Category"),
+    "role": ("/role", "Role"),
+    "location": ("/location", "Location"),
+    "event": ("/event", "Event"),
+    "admin": ("/admin", "Admin"),
+    "calendar": ("/calendar", "Calendar"),
+    "awards": ("/awards", "Awards"),
+    "contact": ("/contact", "Contact"),
+    "user": ("/user", "User"),
+    "export": ("/export", "Export"),
+    "attendance": ("/attendance", "Attendance"),
+}
+
+ALLOWED_ORIGINS = [
+    "https://fakenham-ma.vercel.app",  # Your Vercel frontend URL
+    "http://localhost:5173",           # For local development
+    "http://localhost:3000",           # Alternative local port
+    "https://ksw.moxeyhallam.com",
+    "https://ksw-dev.moxeyhallam.com",
+]
+
+
+def routers_from_env() -> list[str]:
+    """Routers named in KSW_ROUTERS, or all of them."""
+    value = os.getenv("KSW_ROUTERS", "").strip()
+    if not value or value == "*":
+        return list(ROUTERS)
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+# Startup does no I/O: the engines connect on first use, reference data loads
+# on the first request that needs it, and the schema is managed by Alembic
+# (`alembic upgrade head`), not created here.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Only shut down what this process actually loaded
+    attendance = sys.modules.get("app.attendance")
+    if attendance is not None:
+        attendance.buffer.flush()
+    matviews = sys.modules.get("app.matviews")
+    if matviews is not None:
+        matviews.refresher.flush()
+    auth = sys.modules.get("app.api.v1.auth")
+    if auth is not None:
+        await auth.token_verifier.aclose()
+    from app.database import dispose_engines
+
+    await dispose_engines()
+
+
+def create_app(routers: Optional[Iterable[str]] = None) -> FastAPI:
+    """
+    Build the API with the given routers mounted (default: KSW_ROUTERS, else all).
+
+    Raises:
+        ValueError: If a router name is not in ROUTERS.
+    """
+    names = list(routers) if routers is not None else routers_from_env()
+    unknown = [name for name in names if name not in ROUTERS]
+    if unknown:
+        raise ValueError(f"Unknown routers: {', '.join(unknown)}. Choose from: {', '.join(ROUTERS)}")
+
+    from app.http_cache import ETagMiddleware
+
+    configure_logging()
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=ALLOWED_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["Link", "X-Next-Cursor"],
+    )
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(LogContextMiddleware)
+
+    for name in names:
+        prefix, tag = ROUTERS[name]
+        module = importlib.import_module(f"app.api.v1.{name}")
+        app.include_router(module.router, prefix=prefix, tags=[tag])
+    return app
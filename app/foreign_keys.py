@@ -0,0 +1,115 @@
+# app/foreign_keys.py
+"""
+Existence checks for the ids a write refers to, in one round trip.
+
+Each `Ref` names a table's id column and the ids to look for, optionally
+with one more column to bring back (e.g. a person's belt_level_id, an award
+type's points). `lookup` turns them into a single
+
+    SELECT 'Person', id, belt_level_id FROM person WHERE id IN (...)
+    UNION ALL
+    SELECT 'Award type', id, points FROM award_type WHERE id IN (...)
+    ...
+
+and `require` raises NotFoundError for the first missing id, with the same
+messages as the per-table lookups it replaces. The database's foreign keys
+remain the backstop for rows deleted between the check and the write:
+`violation` turns the resulting IntegrityError into a readable message,
+telling foreign key violations apart from NOT NULL, check and unique ones.
+"""
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Integer, cast, literal, null, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.exceptions import NotFoundError
+
+
+@dataclass(frozen=True)
+class Ref:
+    """
+    Ids expected to exist in a table.
+
+    Args:
+        entity: Name used in the NotFoundError, e.g. "Award type".
+        column: The referenced primary key column, e.g. models.AwardType.id.
+        ids: Ids to look for; None entries are ignored.
+        value: Another column of the same table to return per id.
+    """
+    entity: str
+    column: Any
+    ids: Iterable[Optional[int]]
+    value: Any = None
+
+
+def lookup(db: Session, *refs: Ref) -> dict[str, dict[int, Any]]:
+    """Found ids per entity, each mapped to its `value` column (None without one)."""
+    found: dict[str, dict[int, Any]] = {ref.entity: {} for ref in refs}
+    selects = []
+    for ref in refs:
+        ids = {id for id in ref.ids if id is not None}
+        if not ids:
+            continue
+        value = ref.value if ref.value is not None else null()
+        selects.append(
+            select(literal(ref.entity).label("entity"), cast(ref.column, Integer).label("id"), cast(value, Integer).label("value"))
+            .where(ref.column.in_(ids))
+        )
+    if not selects:
+        return found
+
+    query = selects[0] if len(selects) == 1 else union_all(*selects)
+    for entity, id, value in db.execute(query):
+        found[entity][id] = value
+    return found
+
+
+def require(db: Session, *refs: Ref) -> dict[str, dict[int, Any]]:
+    """
+    Like `lookup`, but every id must exist.
+
+    Raises:
+        NotFoundError: For the first missing id, in the order of `refs`.
+    """
+    found = lookup(db, *refs)
+    for ref in refs:
+        for id in ref.ids:
+            if id is not None and id not in found[ref.entity]:
+                raise NotFoundError(ref.entity, id)
+    return found
+
+
+# SQLSTATE codes of the integrity violations the messages distinguish
+FOREIGN_KEY_VIOLATION = "23503"
+NOT_NULL_VIOLATION = "23502"
+CHECK_VIOLATION = "23514"
+UNIQUE_VIOLATION = "23505"
+
+
+def violation(error: IntegrityError) -> str:
+    """
+    Readable message for an IntegrityError that got past the checks.
+
+    Only foreign key violations read "Referenced record no longer exists";
+    NOT NULL, check and unique violations get their own message, so callers
+    are not sent looking for a missing row.
+    """
+    orig = error.orig
+    # psycopg2 exposes the code as pgcode, psycopg 3 as sqlstate
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    diag = getattr(orig, "diag", None)
+    if code == NOT_NULL_VIOLATION:
+        column = getattr(diag, "column_name", None)
+        return f"Missing required value ({column})" if column else "Missing required value"
+
+    constraint = getattr(diag, "constraint_name", None)
+    detail = f" ({constraint})" if constraint else ""
+    if code == FOREIGN_KEY_VIOLATION:
+        return f"Referenced record no longer exists{detail}"
+    if code == CHECK_VIOLATION:
+        return f"Value not allowed{detail}"
+    if code == UNIQUE_VIOLATION:
+        return f"Record already exists{detail}"
+    return f"Integrity constraint violated{detail}"
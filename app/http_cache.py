@@ -0,0 +1,140 @@
+# app/http_cache.py
+"""
+HTTP caching for public read endpoints.
+
+Two ways for a route to opt in:
+
+`conditional(version, ...)`
+    For data with a cheap version string (the reference data registry, the
+    calendar snapshot). The ETag is derived from the version and the URL, so
+    a matching `If-None-Match` is answered with 304 before the route runs:
+    nothing is queried or serialised.
+
+`cacheable(...)`
+    For everything else. The route runs as usual and ETagMiddleware hashes
+    the response body into a strong ETag, replying 304 (with no body) when it
+    matches `If-None-Match`. This saves bandwidth but not work.
+
+Both set `Cache-Control` with `stale-while-revalidate`, so browsers and the
+Vercel edge can serve repeat requests themselves.
+"""
+import hashlib
+from typing import Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.reference_data import reference_data_version
+
+
+def cache_control(max_age: int, stale_while_revalidate: int) -> str:
+    return f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def conditional(version: Callable[..., str], max_age: int = 60, stale_while_revalidate: int = 600):
+    """
+    Dependency answering conditional GETs from a version string.
+
+    `version` is called with the request's dependencies resolved by FastAPI
+    (declare them as its parameters, e.g. a `db: Session = Depends(get_db)`).
+    """
+    header = cache_control(max_age, stale_while_revalidate)
+
+    def check(request: Request, response: Response, current_version: str = Depends(version)):
+        digest = hashlib.sha256(f"{current_version}:{request.url.path}?{request.url.query}".encode()).hexdigest()
+        etag = f'"{digest[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": header}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check
+
+
+# Belts, roles, age categories and locations: versioned by the reference data registry
+reference_cache = conditional(reference_data_version, max_age=300, stale_while_revalidate=86400)
+
+
+def cacheable(max_age: int = 60, stale_while_revalidate: int = 300):
+    """Dependency marking a route's responses for body-hash ETags (see ETagMiddleware)."""
+    header = cache_control(max_age, stale_while_revalidate)
+
+    def mark(response: Response):
+        response.headers["Cache-Control"] = header
+
+    return mark
+
+
+class ETagMiddleware:
+    """
+    Adds a strong ETag to public GET responses that don't have one, and turns
+    them into 304 Not Modified when the client already has that body.
+
+    Only responses carrying a `public` Cache-Control (set by `cacheable`)
+    are buffered; bodies larger than `max_body` are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, max_body: int = 1_000_000):
+        self.app = app
+        self.max_body = max_body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        chunks: list[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def send_wrapper(message: Message):
+            nonlocal start, size, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                cache = headers.get("cache-control", "")
+                if message["status"] != 200 or "etag" in headers or not cache.startswith("public"):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if message.get("more_body", False):
+                if size > self.max_body:
+                    passthrough = True
+                    await send(start)
+                    await send({"type": "http.response.body", "body": b"".join(chunks), "more_body": True})
+                return
+
+            body = b"".join(chunks)
+            start["headers"] = list(start["headers"])
+            headers = MutableHeaders(raw=start["headers"])
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            headers["etag"] = etag
+            if etag_matches(if_none_match, etag):
+                start["status"] = 304
+                for name in ("content-length", "content-type"):
+                    if name in headers:
+                        del headers[name]
+                body = b""
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
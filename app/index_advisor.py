@@ -0,0 +1,122 @@
+# app/index_advisor.py
+"""
+Report the statements costing the database the most time, with their plans.
+
+Reads pg_stat_statements (models.t_pg_stat_statements; enable the extension
+in Supabase under Database -> Extensions) for the current database, ranks
+statements by total execution time and EXPLAINs each one. Statements are
+normalised there (`WHERE id = $1`), so on Postgres 16+ they are explained
+with GENERIC_PLAN; nothing is executed. Sequential scans with a filter are
+called out, as they are the usual sign of a missing index.
+
+    python -m app.manage advisor [--limit 10] [--plans]
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import column, func, select, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app import models
+
+# Postgres regex for statements EXPLAIN accepts
+EXPLAINABLE = r"^\s*(select|with|insert|update|delete)\y"
+PARAMETER = re.compile(r"\$\d+")
+
+
+@dataclass
+class StatementReport:
+    query: str
+    calls: int
+    total_ms: float
+    mean_ms: float
+    rows: int
+    plan: Optional[dict] = None
+    error: Optional[str] = None
+    seq_scans: list[str] = field(default_factory=list)
+
+
+def top_statements(conn: Connection, limit: int = 10):
+    stats = models.t_pg_stat_statements
+    pg_database = table("pg_database", column("oid"), column("datname"))
+    current_db = select(pg_database.c.oid).where(pg_database.c.datname == func.current_database()).scalar_subquery()
+    return conn.execute(
+        select(stats.c.query, stats.c.calls, stats.c.total_exec_time, stats.c.mean_exec_time, stats.c.rows)
+        .where(stats.c.dbid == current_db, stats.c.toplevel.isnot(False))
+        .where(stats.c.query.op("~*")(EXPLAINABLE))
+        .where(~stats.c.query.ilike("%pg_stat_statements%"))
+        .order_by(stats.c.total_exec_time.desc())
+        .limit(limit)
+    ).all()
+
+
+def explain(conn: Connection, query: str) -> dict:
+    """JSON plan of a (possibly parameterised) statement, without running it."""
+    options = "FORMAT JSON, GENERIC_PLAN" if PARAMETER.search(query) else "FORMAT JSON"
+    with conn.begin_nested():
+        # exec_driver_sql: the statement's own $n placeholders must reach the server untouched
+        result = conn.exec_driver_sql(f"EXPLAIN ({options}) {query}".replace("%", "%%")).scalar_one()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]["Plan"]
+
+
+def seq_scans(plan: dict) -> list[str]:
+    """Filtered sequential scans in a plan, e.g. 'promotions: (student_id = $1)'."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Filter"):
+        found.append(f"{plan.get('Relation Name')}: {plan['Filter']}")
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+def analyse(conn: Connection, limit: int = 10) -> list[StatementReport]:
+    server_version = int(conn.execute(select(func.current_setting("server_version_num"))).scalar_one())
+
+    reports = []
+    for row in top_statements(conn, limit):
+        report = StatementReport(row.query, row.calls, row.total_exec_time, row.mean_exec_time, row.rows)
+        if PARAMETER.search(row.query) and server_version < 160000:
+            report.error = "EXPLAIN (GENERIC_PLAN) needs Postgres 16+"
+        else:
+            try:
+                report.plan = explain(conn, row.query)
+                report.seq_scans = seq_scans(report.plan)
+            except DBAPIError as e:
+                report.error = str(e.orig).strip().splitlines()[0]
+        reports.append(report)
+    return reports
+
+
+def _plan_lines(plan: dict, depth: int = 0) -> list[str]:
+    detail = plan.get("Relation Name") or plan.get("Index Name") or ""
+    line = f"{'  ' * depth}-> {plan['Node Type']} {detail}".rstrip() + f"  (cost={plan.get('Total Cost')} rows={plan.get('Plan Rows')})"
+    lines = [line]
+    for key in ("Index Cond", "Filter"):
+        if key in plan:
+            lines.append(f"{'  ' * depth}     {key}: {plan[key]}")
+    for child in plan.get("Plans", []):
+        lines.extend(_plan_lines(child, depth + 1))
+    return lines
+
+
+def format_report(reports: list[StatementReport], plans: bool = False) -> str:
+    lines = []
+    for rank, report in enumerate(reports, 1):
+        query = " ".join(report.query.split())
+        lines.append(
+            f"#{rank}  total {report.total_ms:.0f} ms  calls {report.calls}  "
+            f"mean {report.mean_ms:.2f} ms  rows {report.rows}"
+        )
+        lines.append(f"    {query[:300]}")
+        if report.error:
+            lines.append(f"    (not explained: {report.error})")
+        for scan in report.seq_scans:
+            lines.append(f"    seq scan on {scan}  <- candidate for an index")
+        if plans and report.plan:
+            lines.extend("    " + line for line in _plan_lines(report.plan))
+        lines.append("")
+    return "\n".join(lines) if lines else "pg_stat_statements has no statements for this database yet"
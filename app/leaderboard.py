@@ -0,0 +1,217 @@
+# app/leaderboard.py
+"""
+Award points leaderboards.
+
+Two aggregate tables are kept in step with `award` by the award crud
+functions, inside the writing transaction:
+
+    award_points_total   person -> all-time points and award count
+    award_points_bucket  (person, month, event) -> points and award count
+
+A write applies only the award's own contribution (`add` / `subtract`), so
+it costs two upserts however long the award history is. The overall board
+is an index scan of award_points_total by points, stopping at the limit;
+date windows and per-event boards sum just the buckets they cover. Windows
+are month-granular: an award counts towards every window containing its
+month.
+
+Points are read from the award type when the award is written. After
+changing AwardType.points, or editing awards outside the API, reconcile:
+
+    python -m app.manage leaderboard rebuild
+"""
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import Date, delete, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import models
+
+Total = models.AwardPointsTotal
+Bucket = models.AwardPointsBucket
+Award = models.Award
+
+# Bucket event_id for awards not tied to an event
+NO_EVENT = 0
+
+
+@dataclass(frozen=True)
+class Contribution:
+    """What one award adds to the aggregates."""
+    person_id: int
+    month: datetime.date
+    event_id: int
+    points: int
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    rank: int
+    person_id: int
+    first_name: str
+    last_name: str
+    age_category_id: Optional[int]
+    belt_level_id: Optional[int]
+    points: int
+    awards: int
+
+
+def month_of(day: datetime.date) -> datetime.date:
+    return day.replace(day=1)
+
+
+def contribution(award: models.Award, points: Optional[int]) -> Contribution:
+    """The award's contribution as it stands now, given its award type's points."""
+    date_achieved = award.date_achieved
+    if isinstance(date_achieved, datetime.datetime):
+        date_achieved = date_achieved.date()
+    return Contribution(
+        person_id=award.person,
+        month=month_of(date_achieved),
+        event_id=award.event if award.event is not None else NO_EVENT,
+        points=points or 0,
+    )
+
+
+def add(db: Session, *items: Contribution) -> None:
+    """Fold awards into the aggregates, one multi-row upsert per table (caller commits)."""
+    if not items:
+        return
+    totals: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    buckets: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    for item in items:
+        for sums in (totals[item.person_id], buckets[(item.person_id, item.month, item.event_id)]):
+            sums[0] += item.points
+            sums[1] += 1
+
+    total = insert(Total).values([
+        {"person_id": person_id, "points": points, "awards": awards}
+        for person_id, (points, awards) in totals.items()
+    ])
+    db.execute(total.on_conflict_do_update(
+        index_elements=[Total.person_id],
+        set_={
+            "points": Total.points + total.excluded.points,
+            "awards": Total.awards + total.excluded.awards,
+            "updated_at": func.now(),
+        },
+    ))
+    bucket = insert(Bucket).values([
+        {"person_id": person_id, "month": month, "event_id": event_id, "points": points, "awards": awards}
+        for (person_id, month, event_id), (points, awards) in buckets.items()
+    ])
+    db.execute(bucket.on_conflict_do_update(
+        index_elements=[Bucket.person_id, Bucket.month, Bucket.event_id],
+        set_={"points": Bucket.points + bucket.excluded.points, "awards": Bucket.awards + bucket.excluded.awards},
+    ))
+
+
+def subtract(db: Session, item: Contribution) -> None:
+    """Take an award back out of the aggregates, dropping rows left with no awards (caller commits)."""
+    total = Total.person_id == item.person_id
+    bucket = (Bucket.person_id == item.person_id) & (Bucket.month == item.month) & (Bucket.event_id == item.event_id)
+    # UPDATE, not upsert: an award that was never counted must not leave a negative row
+    db.execute(
+        update(Total).where(total)
+        .values(points=Total.points - item.points, awards=Total.awards - 1, updated_at=func.now()),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(
+        update(Bucket).where(bucket).values(points=Bucket.points - item.points, awards=Bucket.awards - 1),
+        execution_options={"synchronize_session": False},
+    )
+    db.execute(delete(Total).where(total, Total.awards <= 0), execution_options={"synchronize_session": False})
+    db.execute(delete(Bucket).where(bucket, Bucket.awards <= 0), execution_options={"synchronize_session": False})
+
+
+def replace(db: Session, before: Contribution, after: Contribution) -> None:
+    """Move an edited award's contribution (caller commits)."""
+    if before != after:
+        subtract(db, before)
+        add(db, after)
+
+
+def rebuild(db: Session) -> tuple[int, int]:
+    """
+    Recompute both tables from `award` (caller commits).
+    Returns (total rows, bucket rows).
+    """
+    points = func.coalesce(func.sum(func.coalesce(models.AwardType.points, 0)), 0)
+    month = func.date_trunc("month", Award.date_achieved).cast(Date)
+    event_id = func.coalesce(Award.event, literal(NO_EVENT))
+
+    db.execute(delete(Total))
+    db.execute(delete(Bucket))
+    totals = db.execute(insert(Total).from_select(
+        ["person_id", "points", "awards"],
+        select(Award.person, points, func.count())
+        .join(models.AwardType, models.AwardType.id == Award.award_type)
+        .group_by(Award.person),
+    )).rowcount
+    buckets = db.execute(insert(Bucket).from_select(
+        ["person_id", "month", "event_id", "points", "awards"],
+        select(Award.person, month, event_id, points, func.count())
+        .join(models.AwardType, models.AwardType.id == Award.award_type)
+        .group_by(Award.person, month, event_id),
+    )).rowcount
+    return totals, buckets
+
+
+def top(
+    db: Session,
+    limit: int = 10,
+    age_category_id: Optional[int] = None,
+    belt_ids: Optional[Iterable[int]] = None,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+    event_id: Optional[int] = None,
+) -> list[LeaderboardEntry]:
+    """
+    Top `limit` people by points, ties sharing a rank.
+
+    Filters combine: `age_category_id` and `belt_ids` (a belt band) select
+    people by their current category and belt; `start`/`end` (inclusive,
+    by month) and `event_id` restrict which awards count.
+    """
+    if start is None and end is None and event_id is None:
+        source = select(Total.person_id, Total.points, Total.awards).subquery()
+    else:
+        query = select(
+            Bucket.person_id,
+            func.sum(Bucket.points).label("points"),
+            func.sum(Bucket.awards).label("awards"),
+        ).group_by(Bucket.person_id)
+        if start is not None:
+            query = query.where(Bucket.month >= month_of(start))
+        if end is not None:
+            query = query.where(Bucket.month <= month_of(end))
+        if event_id is not None:
+            query = query.where(Bucket.event_id == event_id)
+        source = query.subquery()
+
+    person = models.Person
+    query = (
+        select(
+            person.id, person.first_name, person.last_name, person.age_category_id, person.belt_level_id,
+            source.c.points, source.c.awards,
+        )
+        .join(person, person.id == source.c.person_id)
+        .order_by(source.c.points.desc(), source.c.person_id)
+        .limit(limit)
+    )
+    if age_category_id is not None:
+        query = query.where(person.age_category_id == age_category_id)
+    if belt_ids is not None:
+        query = query.where(person.belt_level_id.in_(list(belt_ids)))
+
+    entries = []
+    for position, row in enumerate(db.execute(query), 1):
+        # Competition ranking: 1, 2, 2, 4
+        rank = entries[-1].rank if entries and entries[-1].points == row.points else position
+        entries.append(LeaderboardEntry(rank, row.id, row.first_name, row.last_name, row.age_category_id,
+                                        row.belt_level_id, int(row.points), int(row.awards)))
+    return entries
@@ -0,0 +1,221 @@
+# app/logging_config.py
+"""
+Structured, non-blocking logging for the API.
+
+`configure_logging()` (called by the app factory) installs one handler on
+the root logger: a QueueHandler, so a request thread only puts the record on
+an in-memory queue and a QueueListener thread does the formatting and the
+write to stdout. Records pass through, in order:
+
+    SamplingFilter   drops a fraction of DEBUG/INFO records per route
+                     (LOG_SAMPLING="/belts=0.01,/person=0.1"); warnings and
+                     errors are always kept
+    RedactingFilter  masks bearer tokens, JWTs, URL passwords and secret-named
+                     fields before anything is written
+    JsonFormatter    one JSON object per line (LOG_FORMAT=text for humans)
+
+LOG_LEVEL sets the root level (default INFO). LogContextMiddleware records
+the request method and path in a context variable, so every record logged
+while serving a request carries them and can be sampled by route.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+request_context: contextvars.ContextVar[Optional[tuple[str, str]]] = contextvars.ContextVar("request_context", default=None)
+
+REDACTED = "[REDACTED]"
+SECRET_FIELDS = re.compile(r"token|password|secret|authorization|api_?key|credential", re.IGNORECASE)
+SECRET_PATTERNS = [
+    (re.compile(r"(?i)\b(bearer)\s+[\w\-.~+/=]+"), rf"\1 {REDACTED}"),
+    (re.compile(r"\beyJ[\w-]*\.[\w-]*\.[\w-]*"), REDACTED),                # JWTs
+    (re.compile(r"(\w+://[^:/@\s]+:)[^@\s]+@"), rf"\1{REDACTED}@"),        # scheme://user:password@
+    (re.compile(r"(?i)\b(password|secret|api_?key|token)=[^\s&]+"), rf"\1={REDACTED}"),
+]
+
+# Per-request chatter (the token verifier's HTTP calls, pool checkouts) below
+# WARNING is only shown at LOG_LEVEL=DEBUG
+QUIET_LOGGERS = ("httpx", "httpcore", "sqlalchemy", "app.database.InstrumentedQueuePool", "app.database.InstrumentedAsyncQueuePool")
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[logging.Handler] = None
+_lock = threading.Lock()
+
+
+def redact(text: str) -> str:
+    for pattern, replacement in SECRET_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def parse_sampling(value: str) -> list[tuple[str, float]]:
+    """'/belts=0.01,/person=0.1' -> [('/person', 0.1), ('/belts', 0.01)], longest prefix first."""
+    rates = []
+    for item in value.split(","):
+        prefix, _, rate = item.strip().partition("=")
+        if prefix and rate:
+            rates.append((prefix.strip(), float(rate)))
+    return sorted(rates, key=lambda item: -len(item[0]))
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the DEBUG/INFO records logged while serving a route.
+
+    Args:
+        rates: (path prefix, fraction kept) pairs, longest prefix first.
+        default: Fraction kept for paths no prefix matches.
+    """
+
+    def __init__(self, rates: list[tuple[str, float]], default: float = 1.0):
+        super().__init__()
+        self.rates = rates
+        self.default = default
+
+    def rate_for(self, path: Optional[str]) -> float:
+        if path is not None:
+            for prefix, rate in self.rates:
+                if path.startswith(prefix):
+                    return rate
+        return self.default
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        context = request_context.get()
+        rate = self.rate_for(context[1] if context else None)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RedactingFilter(logging.Filter):
+    """Masks secrets in the message, traceback and `extra` fields of a record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact(record.getMessage())
+        record.args = None
+        if record.exc_text:
+            record.exc_text = redact(record.exc_text)
+        for key, value in vars(record).items():
+            if key in _RECORD_ATTRIBUTES:
+                continue
+            if SECRET_FIELDS.search(key):
+                setattr(record, key, REDACTED)
+            elif isinstance(value, str):
+                setattr(record, key, redact(value))
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with any `extra=` fields alongside the message."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _ContextQueueHandler(QueueHandler):
+    """Attaches the request context and renders the traceback before the record crosses threads."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        context = request_context.get()
+        if context is not None:
+            record.method, record.path = context
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogContextMiddleware:
+    """Pure ASGI middleware recording the request method and path for the records it logs."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_context.set((scope["method"], scope["path"]))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_context.reset(token)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, stream=None) -> None:
+    """Install the queue handler on the root logger; calling it again reconfigures."""
+    global _listener, _handler
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    fmt = fmt or os.getenv("LOG_FORMAT", "json")
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.addFilter(RedactingFilter())
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _ContextQueueHandler(records)
+    handler.addFilter(SamplingFilter(
+        parse_sampling(os.getenv("LOG_SAMPLING", "")),
+        default=float(os.getenv("LOG_SAMPLE_RATE", "1.0")),
+    ))
+
+    with _lock:
+        stop_logging()
+        root = logging.getLogger()
+        root.addHandler(handler)
+        _handler = handler
+        root.setLevel(level)
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.NOTSET if level == "DEBUG" else logging.WARNING)
+        _listener = QueueListener(records, output, respect_handler_level=True)
+        _listener.start()
+
+
+def stop_logging() -> None:
+    """Detach the queue handler, then flush queued records and stop the writer thread."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,134 @@
+# app/manage.py
+"""
+Maintenance commands, run against SUPABASE_DATABASE_URL:
+
+    python -m app.manage schema create       # create missing tables (local / dev databases)
+    python -m app.manage matviews create     # create / recreate the materialized views
+    python -m app.manage matviews refresh    # REFRESH ... CONCURRENTLY all of them
+    python -m app.manage matviews drop
+    python -m app.manage ranks rebuild       # reconcile person_current_rank with promotions
+    python -m app.manage leaderboard rebuild # recompute the award points aggregates
+    python -m app.manage advisor --plans     # costliest statements from pg_stat_statements, explained
+
+Schema migrations are managed by Alembic (`alembic upgrade head`); the API
+no longer creates tables at startup. `schema create` builds a fresh database
+from the models, after which `alembic stamp head` marks it as migrated.
+"""
+import argparse
+import sys
+import time
+
+
+def schema_command(args: argparse.Namespace) -> int:
+    from app import models
+    from app.database import engine
+
+    tables = [t for t in models.Base.metadata.sorted_tables if t.name not in models.VIEW_TABLES]
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        models.Base.metadata.create_all(conn, tables=tables)
+    print(f"create: {len(tables)} tables checked ({(time.perf_counter() - started) * 1000:.0f} ms); run `alembic stamp head` on a new database")
+    return 0
+
+
+def matviews_command(args: argparse.Namespace) -> int:
+    from app import matviews
+    from app.database import engine
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if args.action == "create":
+            matviews.create(conn)
+        elif args.action == "refresh":
+            matviews.refresh(conn, matviews.SOURCES, concurrently=not args.blocking)
+        else:
+            matviews.drop(conn)
+    names = ", ".join(matviews.SOURCES)
+    print(f"{args.action}: {names} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+    return 0
+
+
+def ranks_command(args: argparse.Namespace) -> int:
+    from app import current_rank
+    from app.database import SessionLocal
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        changed, belt_levels = current_rank.rebuild(db)
+        if args.dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    verb = "would change" if args.dry_run else "changed"
+    print(
+        f"person_current_rank: {verb} {changed} rows, {belt_levels} belt levels "
+        f"({(time.perf_counter() - started) * 1000:.0f} ms)"
+    )
+    return 0
+
+
+def leaderboard_command(args: argparse.Namespace) -> int:
+    from app import leaderboard
+    from app.database import SessionLocal
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        totals, buckets = leaderboard.rebuild(db)
+        db.commit()
+    print(f"award points: {totals} people, {buckets} buckets ({(time.perf_counter() - started) * 1000:.0f} ms)")
+    return 0
+
+
+def advisor_command(args: argparse.Namespace) -> int:
+    from sqlalchemy.exc import ProgrammingError
+
+    from app import index_advisor
+    from app.database import engine
+
+    with engine.connect() as conn:
+        try:
+            reports = index_advisor.analyse(conn, args.limit)
+        except ProgrammingError:
+            print("pg_stat_statements is not available: enable the extension (Supabase: Database -> Extensions)")
+            return 1
+    print(index_advisor.format_report(reports, plans=args.plans))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    schema_parser = commands.add_parser("schema", help="Create the tables from the models")
+    schema_parser.add_argument("action", choices=["create"])
+    schema_parser.set_defaults(func=schema_command)
+
+    matviews_parser = commands.add_parser("matviews", help="Manage the materialized full_* views")
+    matviews_parser.add_argument("action", choices=["create", "refresh", "drop"])
+    matviews_parser.add_argument("--blocking", action="store_true", help="Refresh without CONCURRENTLY (faster, locks readers out)")
+    matviews_parser.set_defaults(func=matviews_command)
+
+    ranks_parser = commands.add_parser("ranks", help="Maintain the person_current_rank projection")
+    ranks_parser.add_argument("action", choices=["rebuild"])
+    ranks_parser.add_argument("--dry-run", action="store_true", help="Report drift without writing")
+    ranks_parser.set_defaults(func=ranks_command)
+
+    leaderboard_parser = commands.add_parser("leaderboard", help="Maintain the award points aggregates")
+    leaderboard_parser.add_argument("action", choices=["rebuild"])
+    leaderboard_parser.set_defaults(func=leaderboard_command)
+
+    advisor_parser = commands.add_parser("advisor", help="Report the costliest statements with their plans")
+    advisor_parser.add_argument("--limit", type=int, default=10)
+    advisor_parser.add_argument("--plans", action="store_true", help="Print each statement's full plan")
+    advisor_parser.set_defaults(func=advisor_command)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
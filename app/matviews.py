@@ -0,0 +1,149 @@
+# app/matviews.py
+"""
+Opt-in materialized copies of the full_award, full_person and full_calendar
+views.
+
+With USE_MATERIALIZED_VIEWS=true the read routes query `full_award_mv`,
+`full_person_mv` and `full_calendar_mv` instead of re-running the views'
+joins on every request. Each one is a `SELECT *` over its view (the views
+stay the single definition of the data, managed in Supabase) with unique
+indexes that make `REFRESH MATERIALIZED VIEW CONCURRENTLY` possible, so
+readers are never blocked by a refresh.
+
+Crud writes call `refresher.refresh_later(...)` with the views they affect.
+Refreshes are debounced: the first write starts a timer, and every view
+named before it fires is refreshed once, so a burst of promotions costs one
+refresh. Reads lag writes by up to MATVIEW_REFRESH_DELAY_SECONDS plus the
+refresh time. Response cache entries built from a view carry its name as a
+tag and are invalidated when the refresh completes.
+
+The materialized views live in their own MetaData so `create_all` never
+touches them; create them with `python -m app.manage matviews create`.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Iterable, Optional
+
+from sqlalchemy import Index, MetaData, Table, text
+from sqlalchemy.engine import Connection
+
+from app import models
+from app.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv("USE_MATERIALIZED_VIEWS", "false").strip().lower() in ("1", "true", "yes", "on")
+
+matview_metadata = MetaData()
+
+
+def _materialize(view: Table) -> Table:
+    return view.to_metadata(matview_metadata, name=f"{view.name}_mv")
+
+
+full_award_mv = _materialize(models.t_full_award)
+full_person_mv = _materialize(models.t_full_person)
+full_calendar_mv = _materialize(models.t_full_calendar)
+
+# CONCURRENTLY needs a unique index on plain columns covering every row
+Index("full_award_mv_person_date_id", full_award_mv.c.person_id, full_award_mv.c.date_achieved, full_award_mv.c.id, unique=True)
+Index("full_award_mv_id", full_award_mv.c.id, unique=True)
+Index("full_person_mv_id", full_person_mv.c.id, unique=True)
+Index(
+    "full_calendar_mv_entry", full_calendar_mv.c.date, full_calendar_mv.c.calendar_type,
+    full_calendar_mv.c.class_id, full_calendar_mv.c.event_id, unique=True,
+)
+Index("full_calendar_mv_date_start", full_calendar_mv.c.date, full_calendar_mv.c.start_time)
+
+# Source view for each materialized view
+SOURCES = {
+    full_award_mv.name: models.t_full_award.name,
+    full_person_mv.name: models.t_full_person.name,
+    full_calendar_mv.name: models.t_full_calendar.name,
+}
+
+# What the routes read: the materialized views when enabled, else the plain views
+full_award = full_award_mv if ENABLED else models.t_full_award
+full_person = full_person_mv if ENABLED else models.t_full_person
+full_calendar = full_calendar_mv if ENABLED else models.t_full_calendar
+
+
+def create(conn: Connection) -> None:
+    """Create (or recreate) the materialized views and their indexes."""
+    for table in matview_metadata.sorted_tables:
+        conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {table.name}"))
+        conn.execute(text(f"CREATE MATERIALIZED VIEW {table.name} AS SELECT * FROM {SOURCES[table.name]} WITH DATA"))
+        for index in table.indexes:
+            index.create(conn)
+
+
+def drop(conn: Connection) -> None:
+    for table in matview_metadata.sorted_tables:
+        conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {table.name}"))
+
+
+def refresh(conn: Connection, names: Iterable[str], concurrently: bool = True) -> None:
+    mode = "CONCURRENTLY " if concurrently else ""
+    for name in sorted(names):
+        if name not in SOURCES:
+            raise ValueError(f"Unknown materialized view: {name}")
+        conn.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{name}"))
+
+
+class MatviewRefresher:
+    """
+    Debounced, coalescing refresh of the materialized views.
+
+    Args:
+        delay: Seconds between the first write of a burst and the refresh.
+        enabled: When False, `refresh_later` does nothing.
+    """
+
+    def __init__(self, delay: float = 2.0, enabled: bool = ENABLED):
+        self.delay = delay
+        self.enabled = enabled
+        self.refreshes = 0
+        self._pending: set[str] = set()
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def refresh_later(self, *views: Table) -> None:
+        """Schedule a refresh of the materialized copies of `views`; call after commit."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._pending.update(f"{view.name.removesuffix('_mv')}_mv" for view in views)
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        """Refresh everything pending now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            names, self._pending, self._timer = self._pending, set(), None
+        if not names:
+            return
+
+        from app.database import engine
+
+        # One refresh at a time; writes arriving meanwhile start the next burst
+        with self._refresh_lock:
+            started = time.perf_counter()
+            try:
+                with engine.begin() as conn:
+                    refresh(conn, names)
+            except Exception:
+                logger.exception("Refreshing %s failed", ", ".join(sorted(names)))
+                return
+            self.refreshes += 1
+            logger.info("Refreshed %s in %.0f ms", ", ".join(sorted(names)), (time.perf_counter() - started) * 1000)
+        response_cache.invalidate(*names)
+
+
+refresher = MatviewRefresher(delay=float(os.getenv("MATVIEW_REFRESH_DELAY_SECONDS", "2")))
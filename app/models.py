@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from sqlalchemy import BigInteger, Boolean, CheckConstraint, Column, Date, DateTime, Double, ForeignKeyConstraint, Identity, Integer, Numeric, PrimaryKeyConstraint, SmallInteger, String, Table, Text, Time, UniqueConstraint, Uuid, text
+from sqlalchemy import BigInteger, Boolean, CheckConstraint, Column, Date, DateTime, Double, ForeignKeyConstraint, Identity, Index, Integer, Numeric, PrimaryKeyConstraint, SmallInteger, String, Table, Text, Time, UniqueConstraint, Uuid, text
 from sqlalchemy.dialects.postgresql import OID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import datetime
@@ -271,6 +271,7 @@ class Users(Base):
     __tablename__ = 'users'
     __table_args__ = (
         PrimaryKeyConstraint('id', name='users_pkey'),
+        Index('users_email_idx', 'email'),
         {'comment': 'Profile data for each user.'}
     )
 
@@ -287,7 +288,8 @@ class Contact(Base):
     __table_args__ = (
         ForeignKeyConstraint(['user_id'], ['users.id'], name='contact_user_id_fkey'),
         PrimaryKeyConstraint('id', name='contact_pkey'),
-        UniqueConstraint('id', name='contact_id_key')
+        UniqueConstraint('id', name='contact_id_key'),
+        Index('contact_user_id_idx', 'user_id')
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -393,7 +395,8 @@ class UserPerson(Base):
     __table_args__ = (
         ForeignKeyConstraint(['person_id'], ['person.id'], name='user_person_person_id_fkey'),
         ForeignKeyConstraint(['user_id'], ['users.id'], name='user_person_user_id_fkey'),
-        PrimaryKeyConstraint('id', name='user_person_pkey')
+        PrimaryKeyConstraint('id', name='user_person_pkey'),
+        Index('user_person_user_id_idx', 'user_id')
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(start=1, increment=1, minvalue=1, maxvalue=2147483647, cycle=False, cache=1), primary_key=True)
@@ -471,7 +474,8 @@ class Promotions(Base):
         ForeignKeyConstraint(['location_id'], ['location.id'], name='promotions_location_id_fkey'),
         ForeignKeyConstraint(['student_id'], ['person.id'], name='promotions_student_id_fkey'),
         PrimaryKeyConstraint('id', name='promotions_pkey'),
-        UniqueConstraint('id', name='promotions_id_key')
+        UniqueConstraint('id', name='promotions_id_key'),
+        Index('promotions_student_id_promotion_date_id_idx', 'student_id', 'promotion_date', 'id')
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(start=1, increment=1, minvalue=1, maxvalue=2147483647, cycle=False, cache=1), primary_key=True)
@@ -488,6 +492,25 @@ class Promotions(Base):
     student: Mapped['Person'] = relationship('Person', back_populates='promotions')
 
 
+class PersonCurrentRank(Base):
+    """Each person's latest promotion, maintained by app.current_rank."""
+    __tablename__ = 'person_current_rank'
+    __table_args__ = (
+        ForeignKeyConstraint(['belt_id'], ['belt.id'], name='person_current_rank_belt_id_fkey'),
+        ForeignKeyConstraint(['person_id'], ['person.id'], ondelete='CASCADE', name='person_current_rank_person_id_fkey'),
+        ForeignKeyConstraint(['promotion_id'], ['promotions.id'], ondelete='CASCADE', name='person_current_rank_promotion_id_fkey'),
+        PrimaryKeyConstraint('person_id', name='person_current_rank_pkey')
+    )
+
+    person_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    promotion_id: Mapped[int] = mapped_column(Integer)
+    belt_id: Mapped[int] = mapped_column(Integer)
+    tabs: Mapped[int] = mapped_column(SmallInteger)
+    promotion_date: Mapped[datetime.datetime] = mapped_column(DateTime(True))
+    location_id: Mapped[Optional[int]] = mapped_column(Integer)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
+
+
 class AgeCategoryXREF(Base):
     __tablename__ = 'age_category_XREF'
     __table_args__ = (
@@ -495,7 +518,9 @@ class AgeCategoryXREF(Base):
         ForeignKeyConstraint(['class_id'], ['class.id'], name='age_category_XREF_class_id_fkey'),
         ForeignKeyConstraint(['event_id'], ['event.id'], name='age_category_XREF_event_id_fkey'),
         PrimaryKeyConstraint('id', name='age_category_XREF_pkey'),
-        UniqueConstraint('id', name='age_category_XREF_id_key')
+        UniqueConstraint('id', name='age_category_XREF_id_key'),
+        Index('age_category_XREF_class_id_idx', 'class_id'),
+        Index('age_category_XREF_event_id_idx', 'event_id')
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(start=1, increment=1, minvalue=1, maxvalue=2147483647, cycle=False, cache=1), primary_key=True)
@@ -515,13 +540,17 @@ class Attendance(Base):
     __table_args__ = (
         ForeignKeyConstraint(['class_id'], ['class.id'], name='attendance_class_id_fkey'),
         ForeignKeyConstraint(['person_id'], ['person.id'], name='attendance_person_id_fkey'),
-        PrimaryKeyConstraint('id', name='attendance_pkey')
+        PrimaryKeyConstraint('id', name='attendance_pkey'),
+        # One check-in per person, class and day; also serves per-person date ranges
+        UniqueConstraint('person_id', 'attendance_date', 'class_id', name='attendance_person_id_attendance_date_class_id_key'),
+        Index('attendance_class_id_attendance_date_idx', 'class_id', 'attendance_date')
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     start_time: Mapped[datetime.time] = mapped_column(Time)
     person_id: Mapped[int] = mapped_column(Integer)
     created_at: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=text('now()'))
+    attendance_date: Mapped[datetime.date] = mapped_column(Date, server_default=text('CURRENT_DATE'))
     class_id: Mapped[Optional[int]] = mapped_column(Integer)
     modified_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime)
 
@@ -537,7 +566,8 @@ class Award(Base):
         ForeignKeyConstraint(['person'], ['person.id'], name='award_person_fkey'),
         ForeignKeyConstraint(['rank_at_time'], ['belt.id'], name='award_rank_at_time_fkey'),
         ForeignKeyConstraint(['tournament_category'], ['tournament_category.id'], name='award_tournament_category_fkey'),
-        PrimaryKeyConstraint('id', name='award_pkey')
+        PrimaryKeyConstraint('id', name='award_pkey'),
+        Index('award_person_date_achieved_idx', 'person', 'date_achieved')
     )
 
     id: Mapped[int] = mapped_column(BigInteger, Identity(start=1, increment=1, minvalue=1, maxvalue=9223372036854775807, cycle=False, cache=1), primary_key=True)
@@ -557,11 +587,44 @@ class Award(Base):
     tournament_category_: Mapped[Optional['TournamentCategory']] = relationship('TournamentCategory', back_populates='award')
 
 
+class AwardPointsTotal(Base):
+    """Each person's all-time award points, maintained by app.leaderboard."""
+    __tablename__ = 'award_points_total'
+    __table_args__ = (
+        ForeignKeyConstraint(['person_id'], ['person.id'], ondelete='CASCADE', name='award_points_total_person_id_fkey'),
+        PrimaryKeyConstraint('person_id', name='award_points_total_pkey'),
+        Index('award_points_total_points_idx', text('points DESC'), 'person_id')
+    )
+
+    person_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    points: Mapped[int] = mapped_column(Integer)
+    awards: Mapped[int] = mapped_column(Integer)
+    updated_at: Mapped[datetime.datetime] = mapped_column(DateTime(True), server_default=text('now()'))
+
+
+class AwardPointsBucket(Base):
+    """Award points per person, month and event (0 = no event), maintained by app.leaderboard."""
+    __tablename__ = 'award_points_bucket'
+    __table_args__ = (
+        ForeignKeyConstraint(['person_id'], ['person.id'], ondelete='CASCADE', name='award_points_bucket_person_id_fkey'),
+        PrimaryKeyConstraint('person_id', 'month', 'event_id', name='award_points_bucket_pkey'),
+        Index('award_points_bucket_month_idx', 'month'),
+        Index('award_points_bucket_event_id_idx', 'event_id')
+    )
+
+    person_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    month: Mapped[datetime.date] = mapped_column(Date, primary_key=True)
+    event_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    points: Mapped[int] = mapped_column(Integer)
+    awards: Mapped[int] = mapped_column(Integer)
+
+
 class ClassException(Base):
     __tablename__ = 'class_exception'
     __table_args__ = (
         ForeignKeyConstraint(['class_id'], ['class.id'], name='class_exception_class_id_fkey'),
-        PrimaryKeyConstraint('id', name='class_exception_pkey')
+        PrimaryKeyConstraint('id', name='class_exception_pkey'),
+        Index('class_exception_class_id_date_idx', 'class_id', 'date')
     )
 
     id: Mapped[int] = mapped_column(Integer, Identity(start=1, increment=1, minvalue=1, maxvalue=2147483647, cycle=False, cache=1), primary_key=True)
@@ -573,3 +636,15 @@ class ClassException(Base):
     note: Mapped[Optional[str]] = mapped_column(Text)
 
     class_: Mapped[Optional['Class']] = relationship('Class', back_populates='class_exception')
+
+
+# Tables mapped above that are really views (the app's own, or extensions'):
+# never created, migrated or dropped from here
+VIEW_TABLES = frozenset({
+    t_full_award.name,
+    t_full_calendar.name,
+    t_full_person.name,
+    t_location_adress.name,
+    t_pg_stat_statements.name,
+    t_pg_stat_statements_info.name,
+})
@@ -0,0 +1,138 @@
+# app/pagination.py
+"""
+Keyset pagination for list endpoints.
+
+Routes take `page: Page = Depends()` and return `page.apply(query, keys)`.
+Results are ordered by `keys` (which must be unique together, e.g. `(id,)` or
+`(date, id)`) and the next page starts strictly after the last row returned,
+so every page costs the same index range scan regardless of how deep it is.
+Nullable keys sort NULLs last and are compared NULL-safely.
+
+Response bodies stay plain lists. When there is another page the response
+carries an opaque cursor in `X-Next-Cursor` and a `Link: <...>; rel="next"`
+header pointing at it.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import Query, Request, Response
+from sqlalchemy import and_, false, or_, tuple_
+from sqlalchemy.orm import Query as OrmQuery
+
+from app.exceptions import BadRequestError
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, (date, time)) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise BadRequestError("Invalid cursor")
+    if not isinstance(values, list):
+        raise BadRequestError("Invalid cursor")
+    return values
+
+
+def _coerce(value: Any, key) -> Any:
+    """Turn a decoded cursor value back into the key column's Python type."""
+    try:
+        python_type = key.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or not isinstance(value, str) or python_type is str:
+        return value
+    try:
+        if python_type in (date, datetime, time):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+    except ValueError:
+        raise BadRequestError("Invalid cursor")
+
+
+def _nullable(key) -> bool:
+    # Expressions (e.g. coalesce) and reflected view columns count as nullable
+    return getattr(key, "nullable", True)
+
+
+def _after(keys: Sequence, values: Sequence[Any]):
+    """
+    Rows strictly after `values` in `keys` order, NULLs last.
+
+    A row comparison `(k1, k2) > (v1, v2)` is NULL as soon as one side has a
+    NULL, which would drop rows, so nullable keys get the expanded
+    `k1 > v1 OR (k1 = v1 AND k2 > v2) ...` form with IS NULL handling.
+    """
+    if not any(_nullable(key) for key in keys):
+        return tuple_(*keys) > tuple_(*values)
+    clauses, equal = [], []
+    for key, value in zip(keys, values):
+        if value is None:
+            # Nothing sorts after NULL at this position
+            equal.append(key.is_(None))
+            continue
+        clauses.append(and_(*equal, or_(key > value, key.is_(None)) if _nullable(key) else key > value))
+        equal.append(key == value)
+    return or_(*clauses) if clauses else false()
+
+
+def _order(key):
+    return key.asc().nulls_last() if _nullable(key) else key
+
+
+class Page:
+    """Dependency holding the requested page size and cursor."""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+        cursor: Optional[str] = Query(None, description="Opaque cursor from X-Next-Cursor"),
+    ):
+        self.request = request
+        self.response = response
+        self.limit = limit
+        self.cursor = cursor
+
+    def apply(
+        self,
+        query: OrmQuery,
+        keys: Sequence,
+        key_values: Optional[Callable[[Any], Sequence[Any]]] = None,
+    ) -> list:
+        """
+        Return one page of `query` ordered by `keys`.
+
+        `key_values` extracts the key values from a result row; by default
+        each key is read as an attribute named after the column.
+        """
+        if self.cursor is not None:
+            values = decode_cursor(self.cursor)
+            if len(values) != len(keys):
+                raise BadRequestError("Invalid cursor")
+            values = [_coerce(value, key) for value, key in zip(values, keys)]
+            query = query.filter(_after(keys, values))
+
+        rows = query.order_by(*(_order(key) for key in keys)).limit(self.limit + 1).all()
+        if len(rows) <= self.limit:
+            return rows
+
+        rows = rows[: self.limit]
+        last = rows[-1]
+        values = key_values(last) if key_values else [getattr(last, key.key) for key in keys]
+        next_cursor = encode_cursor(values)
+        next_url = self.request.url.include_query_params(limit=self.limit, cursor=next_cursor)
+        self.response.headers["X-Next-Cursor"] = next_cursor
+        self.response.headers["Link"] = f'<{next_url}>; rel="next"'
+        return rows
@@ -0,0 +1,141 @@
+# app/person_import.py
+"""
+Streaming roster import for `POST /person/import`.
+
+The request body (CSV with a header row, or NDJSON) is read incrementally,
+parsed a record at a time and validated with `schemas.PersonCreate`. Valid
+rows are written in chunks by `crud.import_persons` in the threadpool, so a
+roster of any size is held in memory at most one chunk at a time. Rows that
+fail validation or insertion are reported with their line number; they never
+abort the rest of the file.
+"""
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.exceptions import BadRequestError
+
+IMPORT_CHUNK_SIZE = 500
+# Errors beyond this are counted but not listed in the response
+MAX_REPORTED_ERRORS = 1000
+
+CONTENT_TYPES = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+
+
+def detect_format(request: Request, fmt: Optional[str]) -> str:
+    """Explicit `format` query parameter, else the request's Content-Type."""
+    if fmt is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        fmt = CONTENT_TYPES.get(content_type)
+    if fmt not in ("csv", "ndjson"):
+        raise BadRequestError("Import format must be csv or ndjson (set ?format= or Content-Type)")
+    return fmt
+
+
+async def body_lines(request: Request) -> AsyncIterator[str]:
+    """Decode the request body into lines as it arrives."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in request.stream():
+            pending += decoder.decode(chunk)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise BadRequestError("Import body must be UTF-8 encoded")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_records(request: Request, fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """Yield (line number, record) pairs, or (line number, error message) for unparseable lines."""
+    header = None
+    record_lines: list[str] = []
+    start_line = 0
+    line_no = 0
+
+    async for line in body_lines(request):
+        line_no += 1
+        if fmt == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_no, f"Invalid JSON: {e}"
+                continue
+            yield line_no, record if isinstance(record, dict) else "Each line must be a JSON object"
+            continue
+
+        # A quoted CSV field may contain line breaks: keep reading until quotes balance
+        if not record_lines:
+            start_line = line_no
+        record_lines.append(line)
+        text = "\n".join(record_lines)
+        if text.count('"') % 2:
+            continue
+        record_lines = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start_line, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield start_line, dict(zip(header, values))
+
+    if record_lines:
+        yield start_line, "Unterminated quoted field"
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+async def import_people(request: Request, fmt: str, db: Session, location_id: int) -> schemas.PersonImportResult:
+    result = schemas.PersonImportResult(imported=0, failed=0, person_ids=[], errors=[])
+
+    def record_error(line: int, message: str):
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(schemas.PersonImportError(line=line, error=message))
+
+    async def flush(chunk: list[tuple[int, schemas.PersonCreate]]):
+        outcomes = await run_in_threadpool(crud.import_persons, db, chunk, location_id)
+        for line, person_id, error in outcomes:
+            if error is None:
+                result.imported += 1
+                result.person_ids.append(person_id)
+            else:
+                record_error(line, error)
+
+    chunk: list[tuple[int, schemas.PersonCreate]] = []
+    async for line, record in parse_records(request, fmt):
+        if isinstance(record, str):
+            record_error(line, record)
+            continue
+        try:
+            chunk.append((line, schemas.PersonCreate.model_validate(record)))
+        except ValidationError as e:
+            record_error(line, _validation_message(e))
+            continue
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+
+    if chunk:
+        await flush(chunk)
+    result.errors.sort(key=lambda e: e.line)
+    return result
@@ -0,0 +1,107 @@
+# app/promotion_reads.py
+"""
+Promotion reads as single joined, column-projected queries.
+
+Every function returns rows shaped like `schemas.PromotionOut`: the promotion
+columns plus `belt_name` and `location_title` from outer joins, so no route
+needs a second query (or a lazy load) to describe a promotion.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import Row, Select, select
+from sqlalchemy.orm import Query, Session
+
+from app import models
+
+COLUMNS = (
+    models.Promotions.id,
+    models.Promotions.student_id,
+    models.Promotions.promotion_date,
+    models.Promotions.belt_id,
+    models.Belt.name.label("belt_name"),
+    models.Promotions.tabs,
+    models.Promotions.location_id,
+    models.Location.title.label("location_title"),
+    models.Promotions.created_at,
+    models.Promotions.modified_at,
+)
+
+# Latest first; the tie-break matches crud's "latest promotion" lookups
+LATEST_FIRST = (models.Promotions.promotion_date.desc(), models.Promotions.id.desc())
+
+
+def _joined(stmt):
+    return (
+        stmt.outerjoin(models.Belt, models.Belt.id == models.Promotions.belt_id)
+        .outerjoin(models.Location, models.Location.id == models.Promotions.location_id)
+    )
+
+
+def promotions_select() -> Select:
+    """Core select of every promotion, e.g. for streaming exports."""
+    return _joined(select(*COLUMNS).select_from(models.Promotions))
+
+
+def promotions_query(db: Session) -> Query:
+    """ORM query of every promotion, for filtering and pagination."""
+    return _joined(db.query(*COLUMNS).select_from(models.Promotions))
+
+
+def for_students(db: Session, student_ids: Iterable[int]) -> list[Row]:
+    """Promotions of several students, grouped by student, oldest first."""
+    return (
+        promotions_query(db)
+        .filter(models.Promotions.student_id.in_(list(student_ids)))
+        .order_by(models.Promotions.student_id, models.Promotions.promotion_date, models.Promotions.id)
+        .all()
+    )
+
+
+def for_student(db: Session, student_id: int) -> list[Row]:
+    """A student's promotions, oldest first."""
+    return (
+        promotions_query(db)
+        .filter(models.Promotions.student_id == student_id)
+        .order_by(models.Promotions.promotion_date, models.Promotions.id)
+        .all()
+    )
+
+
+def get(db: Session, student_id: int, promotion_id: int) -> Optional[Row]:
+    return (
+        promotions_query(db)
+        .filter(models.Promotions.student_id == student_id, models.Promotions.id == promotion_id)
+        .first()
+    )
+
+
+def current_query(db: Session) -> Query:
+    """Each student's latest promotion: one DISTINCT ON (student_id) pass."""
+    return (
+        promotions_query(db)
+        .distinct(models.Promotions.student_id)
+        .order_by(models.Promotions.student_id, *LATEST_FIRST)
+    )
+
+
+def current_for_student(db: Session, student_id: int) -> Optional[Row]:
+    """Primary-key lookup through person_current_rank, sorting promotions only if it has no row."""
+    rank = models.PersonCurrentRank
+    result = (
+        promotions_query(db)
+        .join(rank, rank.promotion_id == models.Promotions.id)
+        .filter(rank.person_id == student_id)
+        .first()
+    )
+    if result is not None:
+        return result
+    return (
+        promotions_query(db)
+        .filter(models.Promotions.student_id == student_id)
+        .order_by(*LATEST_FIRST)
+        .first()
+    )
+
+
+def current_for_students(db: Session, student_ids: Iterable[int]) -> list[Row]:
+    return current_query(db).filter(models.Promotions.student_id.in_(list(student_ids))).all()
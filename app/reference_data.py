@@ -0,0 +1,200 @@
+# app/reference_data.py
+"""
+In-process registry of near-static reference tables.
+
+Belts, roles, age categories, event types, locations and tournament
+categories change a few times a year but are read on almost every request.
+They are loaded together into an immutable, versioned snapshot at startup and
+served from memory: the GET endpoints for these tables, the belt lookups in
+promotions and the category eligibility checks on awards never touch the
+database. The snapshot is reloaded after writes made through the API and
+after a TTL, which picks up edits made directly in Supabase.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+
+
+@dataclass(frozen=True)
+class ReferenceData:
+    """One consistent snapshot of the reference tables, each sorted by id."""
+
+    belts: tuple[schemas.BeltOut, ...]
+    roles: tuple[schemas.RoleOut, ...]
+    age_categories: tuple[schemas.AgeCategoryOut, ...]
+    event_types: tuple[schemas.EventTypeOut, ...]
+    locations: tuple[schemas.LocationOut, ...]
+    # Content hash, stable across processes for the same data
+    version: str
+    tournament_categories: tuple[schemas.TournamentCategoryOut, ...] = ()
+    # (tournament_category, belt) rows of tournament_category_belt_XREF
+    tournament_category_belts: tuple[tuple[int, int], ...] = ()
+    loaded_at: float = field(default_factory=time.monotonic)
+    belts_by_id: dict = field(init=False)
+    next_belt_ids: dict = field(init=False)
+    roles_by_id: dict = field(init=False)
+    age_categories_by_id: dict = field(init=False)
+    event_types_by_id: dict = field(init=False)
+    locations_by_id: dict = field(init=False)
+    tournament_categories_by_id: dict = field(init=False)
+    tournament_categories_by_name: dict = field(init=False)
+    eligible_belt_ids: dict = field(init=False)
+
+    def __post_init__(self):
+        index = lambda rows: {row.id: row for row in rows}
+        object.__setattr__(self, "belts_by_id", index(self.belts))
+        object.__setattr__(self, "next_belt_ids", {a.id: b.id for a, b in zip(self.belts, self.belts[1:])})
+        object.__setattr__(self, "roles_by_id", index(self.roles))
+        object.__setattr__(self, "age_categories_by_id", index(self.age_categories))
+        object.__setattr__(self, "event_types_by_id", index(self.event_types))
+        object.__setattr__(self, "locations_by_id", index(self.locations))
+        object.__setattr__(self, "tournament_categories_by_id", index(self.tournament_categories))
+
+        # "Name" and "Upper category / Name", case-insensitive; a bare name
+        # shared by several upper categories maps to None (ambiguous)
+        by_name = {}
+        for category in self.tournament_categories:
+            if category.upper_category:
+                by_name[f"{category.upper_category} / {category.name}".casefold()] = category
+            key = category.name.casefold()
+            by_name[key] = None if key in by_name else category
+        object.__setattr__(self, "tournament_categories_by_name", by_name)
+
+        # Category id -> belts allowed to compete in it (None: any belt)
+        listed = {}
+        for category_id, belt_id in self.tournament_category_belts:
+            listed.setdefault(category_id, set()).add(belt_id)
+        black_belts = {belt.id for belt in self.belts if belt.primary_colour.casefold() == "black"}
+        eligible = {}
+        for category in self.tournament_categories:
+            allowed = listed.get(category.id)
+            if category.is_black_belt_only:
+                allowed = black_belts if allowed is None else allowed & black_belts
+            eligible[category.id] = frozenset(allowed) if allowed is not None else None
+        object.__setattr__(self, "eligible_belt_ids", eligible)
+
+    @property
+    def max_belt_id(self) -> Optional[int]:
+        return self.belts[-1].id if self.belts else None
+
+    def belt(self, belt_id: Optional[int]) -> Optional[schemas.BeltOut]:
+        return self.belts_by_id.get(belt_id)
+
+    def next_belt_id(self, belt_id: int) -> Optional[int]:
+        """The belt after `belt_id` in belt order, or None at the highest belt."""
+        return self.next_belt_ids.get(belt_id)
+
+    def role(self, role_id: int) -> Optional[schemas.RoleOut]:
+        return self.roles_by_id.get(role_id)
+
+    def age_category(self, age_category_id: int) -> Optional[schemas.AgeCategoryOut]:
+        return self.age_categories_by_id.get(age_category_id)
+
+    def event_type(self, event_type_id: int) -> Optional[schemas.EventTypeOut]:
+        return self.event_types_by_id.get(event_type_id)
+
+    def location(self, location_id: int) -> Optional[schemas.LocationOut]:
+        return self.locations_by_id.get(location_id)
+
+    def tournament_category(self, category_id: Optional[int]) -> Optional[schemas.TournamentCategoryOut]:
+        return self.tournament_categories_by_id.get(category_id)
+
+    def find_tournament_category(self, name: str) -> Optional[schemas.TournamentCategoryOut]:
+        """Category by name or "Upper category / Name"; None when unknown or ambiguous."""
+        return self.tournament_categories_by_name.get(" / ".join(part.strip() for part in name.split("/")).casefold())
+
+    def belt_eligible(self, category_id: int, belt_id: Optional[int]) -> bool:
+        """
+        Whether a competitor at `belt_id` may compete in the category: its
+        belts in tournament_category_belt_XREF if any are listed, limited to
+        black belts (primary colour black) when is_black_belt_only.
+        """
+        allowed = self.eligible_belt_ids.get(category_id)
+        return allowed is None or belt_id in allowed
+
+
+def load_reference_data(db: Session) -> ReferenceData:
+    def rows(model, schema):
+        return tuple(schema.model_validate(row) for row in db.query(model).order_by(model.id))
+
+    tables = {
+        "belts": rows(models.Belt, schemas.BeltOut),
+        "roles": rows(models.Role, schemas.RoleOut),
+        "age_categories": rows(models.AgeCategory, schemas.AgeCategoryOut),
+        "event_types": rows(models.EventType, schemas.EventTypeOut),
+        "locations": rows(models.Location, schemas.LocationOut),
+        "tournament_categories": rows(models.TournamentCategory, schemas.TournamentCategoryOut),
+    }
+    xref = tuple(
+        (row.tournament_category, row.belt)
+        for row in db.query(models.TournamentCategoryBeltXREF).order_by(models.TournamentCategoryBeltXREF.id)
+    )
+    payload = json.dumps(
+        {
+            **{name: [row.model_dump(mode="json") for row in table] for name, table in tables.items()},
+            "tournament_category_belts": xref,
+        },
+        sort_keys=True,
+    )
+    version = hashlib.sha256(payload.encode()).hexdigest()[:16]
+    return ReferenceData(**tables, version=version, tournament_category_belts=xref)
+
+
+class ReferenceRegistry:
+    """
+    Holds the current ReferenceData snapshot.
+
+    Args:
+        ttl: Seconds before the snapshot is reloaded even without a write.
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+        self._data: Optional[ReferenceData] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Optional[Session] = None) -> ReferenceData:
+        """Current snapshot, loading it (with `db`, or a fresh session) when missing or stale."""
+        data = self._data
+        if data is not None and time.monotonic() - data.loaded_at < self.ttl:
+            return data
+        with self._lock:
+            data = self._data
+            if data is None or time.monotonic() - data.loaded_at >= self.ttl:
+                data = self._load(db)
+        return data
+
+    def load(self, db: Optional[Session] = None) -> ReferenceData:
+        """Reload the snapshot now."""
+        with self._lock:
+            return self._load(db)
+
+    def _load(self, db: Optional[Session]) -> ReferenceData:
+        if db is not None:
+            self._data = load_reference_data(db)
+        else:
+            from app.database import SessionLocal
+
+            with SessionLocal() as session:
+                self._data = load_reference_data(session)
+        return self._data
+
+    def invalidate(self) -> None:
+        """Drop the snapshot; the next read reloads."""
+        self._data = None
+
+
+def reference_data_version() -> str:
+    """Version of the current snapshot, for ETags."""
+    return reference_data.get().version
+
+
+reference_data = ReferenceRegistry(ttl=float(os.getenv("REFERENCE_DATA_TTL_SECONDS", "600")))
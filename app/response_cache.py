@@ -0,0 +1,155 @@
+# app/response_cache.py
+"""
+Server-side cache of serialised JSON responses for view-backed reads.
+
+Routes wrap their work in `response_cache.json(...)`, naming the entry and
+the tags it depends on (e.g. `person:15`). The first request runs the query
+and stores the serialised body; later requests return the stored bytes
+without touching the database or Pydantic.
+
+Invalidation is by tag: every tag has a version number, and the versions of
+an entry's tags are part of its key. Crud writes call
+`response_cache.invalidate("person:15")` after committing, which bumps the
+version so every entry depending on that tag is missed from then on (old
+entries simply age out). A read that races a write can only ever store its
+result under the old versions, so it can never be served after the write.
+
+The default backend is an in-process LRU. Setting RESPONSE_CACHE_URL to a
+`redis://` URL shares the cache between workers via any Redis-protocol
+server (requires the optional `redis` package).
+"""
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.cache import TTLCache
+
+try:
+    import redis
+except ImportError:  # optional: only needed for RESPONSE_CACHE_URL
+    redis = None
+
+
+class MemoryBackend:
+    """Per-process LRU of response bodies."""
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 300.0):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def versions(self, tags: list[str]) -> list[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bump(list(self._versions))
+
+
+class RedisBackend:
+    """Response bodies and tag versions kept in a Redis-protocol server."""
+
+    def __init__(self, url: str, prefix: str = "ksw:response:"):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_URL is set but the 'redis' package is not installed")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._client.set(self._prefix + key, value, ex=max(1, int(ttl)))
+
+    def versions(self, tags: list[str]) -> list[int]:
+        if not tags:
+            return []
+        return [int(v or 0) for v in self._client.mget([f"{self._prefix}tag:{tag}" for tag in tags])]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        pipe = self._client.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(f"{self._prefix}tag:{tag}")
+        pipe.execute()
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self._prefix}*"):
+            self._client.delete(key)
+
+
+@lru_cache(maxsize=None)
+def _adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class ResponseCache:
+    """
+    Tag-invalidated cache of JSON response bodies.
+
+    Args:
+        backend: MemoryBackend or RedisBackend.
+        ttl: Upper bound on an entry's lifetime, even without invalidation.
+    """
+
+    def __init__(self, backend, ttl: float = 300.0):
+        self.backend = backend
+        self.ttl = ttl
+
+    def json(
+        self, name: str, params: Any, tags: Iterable[str], build: Callable[[], Any], model,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Response:
+        """
+        Cached JSON response for `name` + `params`.
+
+        `build` produces the response data on a miss; it is serialised with
+        `model` (the route's response_model) and stored. `headers` (e.g. the
+        ETag set on the route's injected Response) are added to the reply.
+        """
+        tags = sorted(set(tags))
+        versions = self.backend.versions(tags)
+        key = f"{name}:{json.dumps(params, sort_keys=True, default=str)}:{','.join(map(str, versions))}"
+        body = self.backend.get(key)
+        if body is None:
+            adapter = _adapter(model)
+            body = adapter.dump_json(adapter.validate_python(build(), from_attributes=True))
+            self.backend.set(key, body, self.ttl)
+        return Response(content=body, media_type="application/json", headers=dict(headers or {}))
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalidate every entry depending on any of `tags`; call after commit."""
+        if tags:
+            self.backend.bump(tags)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+def _backend_from_env():
+    url = os.getenv("RESPONSE_CACHE_URL")
+    if url:
+        return RedisBackend(url)
+    return MemoryBackend(
+        maxsize=int(os.getenv("RESPONSE_CACHE_MAX_SIZE", "2048")),
+        ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")),
+    )
+
+
+response_cache = ResponseCache(_backend_from_env(), ttl=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300")))
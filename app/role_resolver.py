@@ -0,0 +1,74 @@
+# app/role_resolver.py
+"""
+Resolution of an authenticated user's database record and role.
+
+Resolved users are kept in a process-wide LRU+TTL cache keyed by both email
+and user id, so protected endpoints do not query the `users` table on every
+request. Role changes made through `crud.update_user_role` invalidate the
+entry immediately; changes made elsewhere (another instance, the Supabase
+dashboard) are picked up when the entry expires.
+"""
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class ResolvedUser:
+    """Detached snapshot of a `users` row, safe to share between sessions."""
+    id: uuid.UUID
+    email: Optional[str]
+    role: str
+
+
+class RoleResolver:
+    """Looks up users by email, serving repeat lookups from a shared cache."""
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    def resolve(self, db: Session, email: str) -> Optional[ResolvedUser]:
+        """Return the user for an email, or None if no such user exists."""
+        resolved = self.cache.get(("email", email))
+        if resolved is not None:
+            return resolved
+
+        from app.crud import get_user_by_email  # Import here to avoid circular imports
+        user = get_user_by_email(db, email)
+        if not user:
+            return None
+
+        resolved = ResolvedUser(id=user.id, email=user.email, role=user.role)
+        self.cache.set(("email", email), resolved)
+        self.cache.set(("id", resolved.id), resolved)
+        return resolved
+
+    def get_cached(self, user_id: uuid.UUID) -> Optional[ResolvedUser]:
+        return self.cache.get(("id", user_id))
+
+    def invalidate(self, user_id: Optional[uuid.UUID] = None, email: Optional[str] = None) -> None:
+        """Drop a user from the cache by id and/or email."""
+        if user_id is not None:
+            cached = self.cache.pop(("id", user_id))
+            if cached is not None and cached.email is not None:
+                self.cache.pop(("email", cached.email))
+        if email is not None:
+            cached = self.cache.pop(("email", email))
+            if cached is not None:
+                self.cache.pop(("id", cached.id))
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+role_resolver = RoleResolver(
+    TTLCache(
+        maxsize=int(os.getenv("ROLE_CACHE_MAX_SIZE", "2048")),
+        ttl=float(os.getenv("ROLE_CACHE_TTL_SECONDS", "60")),
+    )
+)
@@ -1,7 +1,7 @@
 # schemas.py
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from datetime import datetime, time, date
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
 
 class BeltBase(BaseModel):
@@ -36,6 +36,7 @@ class PromotionOut(PromotionBase):
     created_at: datetime
     modified_at: Optional[datetime]
     belt_name: Optional[str] = None
+    location_title: Optional[str] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -48,6 +49,33 @@ class SetPromotionRequest(StandardPromotionRequest):
     belt_id: int
     tabs: int
 
+class BulkPromotionItem(BaseModel):
+    person_id: int
+    kind: Literal["standard", "tab", "set"]
+    belt_id: Optional[int] = None  # required for "set"
+    tabs: Optional[int] = None  # for "set", defaults to 0
+    location_id: Optional[int] = None  # defaults to the request's location
+    promotion_date: Optional[datetime] = None  # defaults to the request's date
+
+class BulkPromotionRequest(BaseModel):
+    location_id: int
+    promotion_date: Optional[datetime] = None
+    atomic: bool = False  # if any item is invalid, promote no one
+    items: list[BulkPromotionItem]
+
+class BulkPromotionResult(BaseModel):
+    index: int
+    person_id: int
+    status: Literal["created", "failed", "skipped"]
+    promotion: Optional[PromotionOut] = None
+    error: Optional[str] = None
+
+class BulkPromotionResponse(BaseModel):
+    committed: bool
+    created: int
+    failed: int
+    results: list[BulkPromotionResult]
+
 class PersonBase(BaseModel):
     first_name: str
     last_name: str
@@ -57,6 +85,16 @@ class PersonBase(BaseModel):
 class PersonCreate(PersonBase):
     pass
 
+class PersonImportError(BaseModel):
+    line: int
+    error: str
+
+class PersonImportResult(BaseModel):
+    imported: int
+    failed: int
+    person_ids: list[int]
+    errors: list[PersonImportError]
+
 class PersonOut(PersonBase):
     id: int
     created_at: datetime
@@ -112,6 +150,31 @@ class ClassUpdate(BaseModel):
     instructor_id: Optional[int] = None
     age_categories: Optional[list[int]] = None
 
+class AttendanceCreate(BaseModel):
+    person_id: int
+    class_id: int
+    attendance_date: Optional[date] = None  # defaults to today
+    start_time: Optional[time] = None  # defaults to the check-in time
+
+class BulkAttendanceCreate(BaseModel):
+    class_id: int
+    attendance_date: Optional[date] = None  # defaults to today
+    person_ids: list[int]
+
+class AttendanceOut(BaseModel):
+    id: int
+    person_id: int
+    class_id: Optional[int]
+    attendance_date: date
+    start_time: time
+    created_at: datetime
+    modified_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AttendanceQueued(BaseModel):
+    queued: int
+
 class AgeCategoryBase(BaseModel):
     cat_name: str
 
@@ -155,6 +218,14 @@ class LocationOut(LocationBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class EventTypeOut(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+    modified_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
 class EventBase(BaseModel):
     title: str
     description: Optional[str]
@@ -253,6 +324,65 @@ class AwardUpdate(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+class TournamentCategoryOut(BaseModel):
+    id: int
+    name: str
+    is_black_belt_only: bool
+    upper_category: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class BulkAwardItem(BaseModel):
+    award_type: int
+    person: int
+    rank_at_time: Optional[int] = None  # defaults to the person's current belt
+    event: Optional[int] = None  # defaults to the request's event
+    tournament_category: Optional[int] = None
+    date_achieved: Optional[date] = None  # defaults to the request's date
+
+class BulkAwardRequest(BaseModel):
+    event: Optional[int] = None
+    date_achieved: Optional[date] = None  # defaults to today
+    atomic: bool = False  # if any item is invalid, create no awards
+    items: list[BulkAwardItem]
+
+class BulkAwardResult(BaseModel):
+    index: int
+    person: int
+    status: Literal["created", "failed", "skipped"]
+    award: Optional[AwardOut] = None
+    error: Optional[str] = None
+
+class BulkAwardResponse(BaseModel):
+    committed: bool
+    created: int
+    failed: int
+    results: list[BulkAwardResult]
+
+class TournamentResultRow(BaseModel):
+    """One line of a tournament results import."""
+    person: int
+    award_type: str  # award name ("Gold") or id
+    category: Optional[str] = None  # tournament category name, "Upper category / Name" or id
+    rank_at_time: Optional[int] = None  # defaults to the person's current belt
+    event: Optional[int] = None  # defaults to the import's event
+    date_achieved: Optional[date] = None  # defaults to the import's date
+
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    @field_validator("category", "rank_at_time", "event", "date_achieved", mode="before")
+    @classmethod
+    def blank_is_none(cls, value):
+        # Empty CSV cells
+        return None if isinstance(value, str) and not value.strip() else value
+
+class TournamentImportResult(BaseModel):
+    committed: bool
+    imported: int
+    failed: int
+    award_ids: list[int]
+    errors: list[PersonImportError]
+
 class FullAwardBase(BaseModel):
     award_name: str
     award_type: str
@@ -273,6 +403,18 @@ class FullAwardOut(FullAwardBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class LeaderboardEntryOut(BaseModel):
+    rank: int
+    person_id: int
+    first_name: str
+    last_name: str
+    age_category_id: Optional[int] = None
+    belt_level_id: Optional[int] = None
+    points: int
+    awards: int
+
+    model_config = ConfigDict(from_attributes=True)
+
 class ContactBase(BaseModel):
     first_name: str
     last_name: str
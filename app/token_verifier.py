@@ -0,0 +1,266 @@
+# app/token_verifier.py
+"""
+Local verification of Supabase access tokens.
+
+Tokens are checked in-process (signature, expiry and audience) using either
+the project's JWT secret (HS256) or the project's JWKS (RS256/ES256). Verified
+users are cached by token hash until the token expires, so repeat requests
+never leave the process. The Supabase `/auth/v1/user` endpoint is only called
+when a token cannot be verified locally.
+
+All network calls (JWKS and the remote fallback) go through one pooled
+`httpx.AsyncClient` with keep-alive, timeouts and a concurrency limit, so
+verification never blocks the event loop. httpx is imported with the client,
+so deployments that verify every token locally never load it.
+"""
+import asyncio
+import hashlib
+import time
+from typing import TYPE_CHECKING, Optional
+
+import jwt
+
+from app.cache import TTLCache
+from app.exceptions import UnauthorizedError
+
+if TYPE_CHECKING:
+    import httpx
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+JWKS_MIN_REFRESH = 30.0
+USER_CLAIMS = ("aud", "role", "email", "phone", "app_metadata", "user_metadata", "session_id", "is_anonymous")
+
+
+def token_key(token: str) -> str:
+    """Cache key for a token; the raw token is never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def claims_to_user(claims: dict) -> dict:
+    """Shape verified JWT claims like the Supabase `/auth/v1/user` response."""
+    user = {"id": claims["sub"]}
+    for claim in USER_CLAIMS:
+        if claim in claims:
+            user[claim] = claims[claim]
+    return user
+
+
+class TokenVerifier:
+    """
+    Verifies Supabase access tokens, caching the resulting user per token.
+
+    Args:
+        supabase_url: Base URL of the Supabase project.
+        anon_key: Anon key sent with the remote fallback call.
+        jwt_secret: Project JWT secret for HS256 tokens, if available.
+        jwks_url: JWKS endpoint for asymmetric tokens. Defaults to the
+                  project's `/auth/v1/.well-known/jwks.json`.
+        audience: Expected `aud` claim.
+        cache: Cache of verified users keyed by token hash.
+        remote_ttl: Cache lifetime for users verified by the remote fallback
+                    when the token's expiry cannot be read.
+        timeout: Timeout in seconds for calls to Supabase.
+        max_connections: Connection pool size of the shared HTTP client.
+        max_concurrency: Maximum number of in-flight calls to Supabase.
+        jwks_lifespan: Seconds before the cached JWKS is refetched.
+    """
+
+    def __init__(
+        self,
+        supabase_url: Optional[str],
+        anon_key: Optional[str],
+        jwt_secret: Optional[str] = None,
+        jwks_url: Optional[str] = None,
+        audience: str = "authenticated",
+        cache: Optional[TTLCache] = None,
+        remote_ttl: float = 60.0,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_concurrency: int = 20,
+        jwks_lifespan: float = 3600.0,
+    ):
+        self.supabase_url = supabase_url.rstrip("/") if supabase_url else None
+        self.anon_key = anon_key
+        self.jwt_secret = jwt_secret
+        if jwks_url is None and self.supabase_url:
+            jwks_url = f"{self.supabase_url}/auth/v1/.well-known/jwks.json"
+        self.jwks_url = jwks_url
+        self.audience = audience
+        self.cache = cache if cache is not None else TTLCache(maxsize=4096, ttl=300.0)
+        self.remote_ttl = remote_ttl
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.jwks_lifespan = jwks_lifespan
+        self._jwks: Optional[jwt.PyJWKSet] = None
+        self._jwks_fetched_at = 0.0
+        # The client and semaphore belong to the event loop that created them
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def verify(self, token: str) -> dict:
+        """
+        Return the Supabase user for a token.
+
+        Raises:
+            UnauthorizedError: If the token is malformed, expired, has a bad
+                               signature or is rejected by Supabase.
+        """
+        key = token_key(token)
+        user = self.cache.get(key)
+        if user is not None:
+            return user
+
+        claims = await self._verify_locally(token)
+        if claims is not None:
+            user = claims_to_user(claims)
+            ttl = claims["exp"] - time.time()
+        else:
+            user = await self._fetch_remote_user(token)
+            ttl = self._remote_ttl_for(token)
+
+        self.cache.set(key, user, ttl=min(ttl, self.cache.ttl))
+        return user
+
+    def invalidate(self, token: str) -> None:
+        self.cache.pop(token_key(token))
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client; call on application shutdown."""
+        if self._client is not None:
+            if self._loop is asyncio.get_running_loop():
+                await self._client.aclose()
+            else:
+                self._release(self._client, self._loop)
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    def _get_client(self) -> tuple["httpx.AsyncClient", asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            import httpx
+
+            if self._client is not None:
+                self._release(self._client, self._loop)
+
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    @staticmethod
+    def _release(client: "httpx.AsyncClient", loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Let go of a client created on another event loop (e.g. a finished TestClient or a re-initialised worker)."""
+        if loop is not None and loop.is_running():
+            # Still serving another thread: close it there
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        # Otherwise its loop is gone and aclose() can no longer run; dropping
+        # the last reference lets the pool and its connections be collected
+
+    async def _get(self, url: str, headers: Optional[dict] = None) -> "httpx.Response":
+        client, semaphore = self._get_client()
+        async with semaphore:
+            return await client.get(url, headers=headers)
+
+    async def _verify_locally(self, token: str) -> Optional[dict]:
+        """
+        Verify a token in-process.
+
+        Returns the claims, or None when no local key material applies and
+        the caller should fall back to Supabase.
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            raise UnauthorizedError("Invalid token")
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256" and self.jwt_secret:
+            key = self.jwt_secret
+        elif algorithm in ASYMMETRIC_ALGORITHMS and self.jwks_url:
+            key = await self._signing_key(header.get("kid"))
+            if key is None:
+                return None
+        else:
+            return None
+
+        try:
+            return jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self.audience,
+                options={"require": ["exp", "sub"]},
+            )
+        except jwt.InvalidTokenError:
+            raise UnauthorizedError("Invalid token")
+
+    async def _signing_key(self, kid: Optional[str]):
+        """Public key for a key id, refetching the JWKS when it is stale or the kid is new."""
+        key = self._find_key(kid)
+        age = time.monotonic() - self._jwks_fetched_at
+        if key is not None and age < self.jwks_lifespan:
+            return key
+        if key is None and self._jwks is not None and age < JWKS_MIN_REFRESH:
+            # Unknown kid but the JWKS is fresh: don't refetch for every bad token
+            return None
+
+        import httpx
+
+        try:
+            resp = await self._get(self.jwks_url)
+            resp.raise_for_status()
+            self._jwks = jwt.PyJWKSet.from_dict(resp.json())
+            self._jwks_fetched_at = time.monotonic()
+        except (httpx.HTTPError, ValueError, jwt.PyJWKError):
+            # JWKS unreachable: keep using a key we already have, else fall back
+            return key
+
+        return self._find_key(kid)
+
+    def _find_key(self, kid: Optional[str]):
+        if self._jwks is None:
+            return None
+        for jwk in self._jwks.keys:
+            if jwk.key_id == kid:
+                return jwk.key
+        return None
+
+    async def _fetch_remote_user(self, token: str) -> dict:
+        if not self.supabase_url:
+            raise UnauthorizedError("Invalid token")
+
+        import httpx
+
+        try:
+            resp = await self._get(
+                f"{self.supabase_url}/auth/v1/user",
+                headers={
+                    "Authorization": f"Bearer {token}",
+                    "apikey": self.anon_key or "",
+                },
+            )
+        except httpx.HTTPError:
+            raise UnauthorizedError("Unable to verify token")
+
+        if resp.status_code != 200:
+            raise UnauthorizedError("Invalid token")
+        return resp.json()
+
+    def _remote_ttl_for(self, token: str) -> float:
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.InvalidTokenError:
+            exp = None
+        if exp is None:
+            return self.remote_ttl
+        return min(self.remote_ttl, exp - time.time())
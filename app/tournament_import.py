@@ -0,0 +1,77 @@
+# app/tournament_import.py
+"""
+Tournament results import for `POST /awards/import`.
+
+The body is a CSV (with header row) or NDJSON results sheet, one award per
+line:
+
+    person,award_type,category,rank_at_time
+    12,Gold,Patterns / Junior Patterns,3
+    14,Silver,Black Belt Sparring,
+
+Lines are parsed with the roster import's reader and validated with
+`schemas.TournamentResultRow`, then the whole sheet is written by
+`crud.import_tournament_results` as one batch: category names are resolved
+and each competitor's belt checked against the category's eligible belts in
+memory, and the awards go in with a single multi-row INSERT. Rejected lines
+are reported by line number; with `atomic`, any rejected line means nothing
+is written.
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app import crud, schemas
+from app.exceptions import BadRequestError
+from app.person_import import MAX_REPORTED_ERRORS, _validation_message, parse_records
+
+# A results sheet is written in one batch, so it is held in memory whole
+MAX_IMPORT_ROWS = 10_000
+
+
+async def import_results(
+    request: Request,
+    fmt: str,
+    db: Session,
+    event: Optional[int] = None,
+    date_achieved: Optional[date] = None,
+    atomic: bool = False,
+) -> schemas.TournamentImportResult:
+    result = schemas.TournamentImportResult(committed=False, imported=0, failed=0, award_ids=[], errors=[])
+
+    def record_error(line: int, message: str):
+        result.failed += 1
+        if len(result.errors) < MAX_REPORTED_ERRORS:
+            result.errors.append(schemas.PersonImportError(line=line, error=message))
+
+    rows: list[tuple[int, schemas.TournamentResultRow]] = []
+    async for line, record in parse_records(request, fmt):
+        if isinstance(record, str):
+            record_error(line, record)
+            continue
+        try:
+            rows.append((line, schemas.TournamentResultRow.model_validate(record)))
+        except ValidationError as e:
+            record_error(line, _validation_message(e))
+            continue
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise BadRequestError(f"Results import is limited to {MAX_IMPORT_ROWS} rows")
+
+    if rows and not (atomic and result.failed):
+        committed, outcomes = await run_in_threadpool(
+            crud.import_tournament_results, db, rows, event, date_achieved, atomic
+        )
+        result.committed = committed
+        for line, award_id, error in outcomes:
+            if error is None:
+                result.imported += 1
+                result.award_ids.append(award_id)
+            else:
+                record_error(line, error)
+
+    result.errors.sort(key=lambda e: e.line)
+    return result
@@ -0,0 +1,177 @@
+# benchmarks/auth_latency.py
+"""
+Latency of concurrent authenticated requests, before and after moving
+Supabase user verification onto a pooled async client.
+
+Runs entirely locally: a stand-in Supabase auth server (with artificial
+network latency) answers `/auth/v1/user`, and a minimal FastAPI app exposes
+an `async def` route, like the contact routes, guarded by each variant of
+the auth dependency:
+
+    before        `requests.get` per call with no session, run in FastAPI's
+                  threadpool (the original dependency)
+    after-remote  TokenVerifier forced onto the remote fallback (pooled httpx)
+    after-local   TokenVerifier verifying HS256 tokens in-process
+
+Usage:
+    python benchmarks/auth_latency.py [--requests 400] [--concurrency 50] [--latency-ms 25]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import jwt
+import requests
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.token_verifier import TokenVerifier  # noqa: E402
+
+SECRET = "benchmark-jwt-secret-with-at-least-32-characters"
+security = HTTPBearer()
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+def serve_stand_in(latency: float, port_queue) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            time.sleep(latency)
+            token = self.headers["Authorization"].split(" ", 1)[1]
+            claims = jwt.decode(token, options={"verify_signature": False})
+            payload = json.dumps({"id": claims["sub"], "email": claims["email"], "role": "authenticated"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = StandInServer(("127.0.0.1", 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_stand_in(latency: float) -> tuple[multiprocessing.Process, str]:
+    """Run the stand-in in its own process so it doesn't compete for the GIL."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=serve_stand_in, args=(latency, port_queue), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+
+def build_app(dependency) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/contact/")
+    async def get_my_contacts(current_user: dict = Depends(dependency)):
+        return {"id": current_user["id"]}
+
+    return app
+
+
+def before_dependency(supabase_url: str):
+    def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+        resp = requests.get(
+            f"{supabase_url}/auth/v1/user",
+            headers={"Authorization": f"Bearer {credentials.credentials}", "apikey": "anon"},
+        )
+        if resp.status_code != 200:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return resp.json()
+
+    return get_current_user
+
+
+def after_dependency(verifier: TokenVerifier):
+    async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+        return await verifier.verify(credentials.credentials)
+
+    return get_current_user
+
+
+def make_tokens(count: int) -> list[str]:
+    exp = int(time.time()) + 3600
+    return [
+        jwt.encode({"sub": f"user-{i}", "email": f"user{i}@example.com", "aud": "authenticated", "exp": exp}, SECRET, algorithm="HS256")
+        for i in range(count)
+    ]
+
+
+async def run_load(app: FastAPI, tokens: list[str], concurrency: int) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    for token in tokens:
+        queue.put_nowait(token)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                token = queue.get_nowait()
+                start = time.perf_counter()
+                resp = await client.get("/contact/", headers={"Authorization": f"Bearer {token}"})
+                latencies.append(time.perf_counter() - start)
+                assert resp.status_code == 200, resp.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=25.0, help="simulated Supabase round-trip")
+    args = parser.parse_args()
+
+    server, url = start_stand_in(args.latency_ms / 1000)
+    variants = {
+        "before": lambda: before_dependency(url),
+        "after-remote": lambda: after_dependency(TokenVerifier(url, "anon")),
+        "after-local": lambda: after_dependency(TokenVerifier(url, "anon", jwt_secret=SECRET)),
+    }
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, simulated latency {args.latency_ms:.0f} ms")
+    print(f"{'variant':<14}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'req/s':>10}")
+    for name, make_dependency in variants.items():
+        # Fresh tokens per variant so every request is a cache miss
+        tokens = make_tokens(args.requests)
+        latencies, elapsed = asyncio.run(run_load(build_app(make_dependency()), tokens, args.concurrency))
+        print(
+            f"{name:<14}"
+            f"{percentile(latencies, 50) * 1000:>10.1f}"
+            f"{percentile(latencies, 99) * 1000:>10.1f}"
+            f"{statistics.mean(latencies) * 1000:>10.1f}"
+            f"{len(latencies) / elapsed:>10.0f}"
+        )
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/cold_start.py
+"""
+Cold start: how long a fresh process takes to import the app, run its
+startup, and answer its first request.
+
+Each run is a new interpreter (so nothing is cached between runs) that
+imports `main`, enters the lifespan through TestClient and requests
+GET /belts/ against SUPABASE_DATABASE_URL. SQL statements are counted
+on every engine, split into those issued during import + startup and
+those issued by the first request. With --with-create-all each run also
+calls `Base.metadata.create_all` before startup, as main.py used to at
+import time, for comparison.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 10] [--with-create-all] [--budget-ms 1500]
+
+--budget-ms makes the script exit non-zero when the median time to the
+first response exceeds the budget, so it can gate CI.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+statements = []
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+import main
+imported = time.perf_counter()
+
+if sys.argv[1] == "create_all":
+    from app import models
+    from app.database import engine
+    models.Base.metadata.create_all(bind=engine)
+
+from fastapi.testclient import TestClient
+
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    startup_statements = len(statements)
+    response = client.get("/belts/")
+    served = time.perf_counter()
+    response.raise_for_status()
+
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (served - ready) * 1000,
+    "total_ms": (served - started) * 1000,
+    "startup_statements": startup_statements,
+    "request_statements": len(statements) - startup_statements,
+}))
+"""
+
+
+def run_once(mode: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarise(mode: str, runs: list[dict]) -> float:
+    print(f"\n{mode} ({len(runs)} runs, medians)")
+    for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms"):
+        print(f"  {key:<20}{statistics.median(r[key] for r in runs):>10.1f}")
+    for key in ("startup_statements", "request_statements"):
+        print(f"  {key:<20}{statistics.median(r[key] for r in runs):>10.0f}")
+    return statistics.median(r["total_ms"] for r in runs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--with-create-all", action="store_true", help="also time startup with create_all")
+    parser.add_argument("--budget-ms", type=float, help="fail when the median time to first response exceeds this")
+    args = parser.parse_args()
+    if not os.getenv("SUPABASE_DATABASE_URL"):
+        parser.error("SUPABASE_DATABASE_URL is required")
+
+    modes = ["lazy"] + (["create_all"] if args.with_create_all else [])
+    medians = {}
+    for mode in modes:
+        run_once(mode)  # warm the OS file cache
+        medians[mode] = summarise(mode, [run_once(mode) for _ in range(args.runs)])
+
+    if args.budget_ms is not None and medians["lazy"] > args.budget_ms:
+        print(f"\nFAIL: median {medians['lazy']:.0f} ms to first response exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
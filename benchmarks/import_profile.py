@@ -0,0 +1,67 @@
+# benchmarks/import_profile.py
+"""
+Import-time profile of the app, from `python -X importtime`.
+
+Imports `main` in a fresh interpreter, once with every router and once per
+--routers subset (as KSW_ROUTERS, the way a per-function deployment mounts
+them), and prints the total import time, the cumulative time of the
+heaviest top-level packages and the slowest app modules.
+
+Usage:
+    python benchmarks/import_profile.py [--routers belts,role,age_category,location] [--top 15]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile(routers: str) -> list[tuple[int, int, int, str]]:
+    """(self us, cumulative us, depth, module) for every import, in order."""
+    env = dict(os.environ, KSW_ROUTERS=routers)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, module))
+    return rows
+
+
+def report(label: str, rows, top: int) -> None:
+    total = sum(self_us for self_us, _, _, _ in rows)
+    packages = defaultdict(int)
+    for self_us, _, _, module in rows:
+        packages[module.split(".")[0]] += self_us
+    print(f"\n{label}: {total / 1000:.0f} ms, {len(rows)} modules")
+    print(f"  {'package (self time summed)':<40}{'ms':>8}")
+    for package, us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<40}{us / 1000:>8.1f}")
+    app_modules = sorted((r for r in rows if r[3].startswith("app.")), key=lambda r: -r[0])[:top]
+    print(f"  {'app module (self time)':<40}{'ms':>8}")
+    for self_us, _, _, module in app_modules:
+        print(f"  {module:<40}{self_us / 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routers", action="append", default=[], help="comma-separated KSW_ROUTERS subset (repeatable)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for routers in ["*"] + (args.routers or ["belts,role,age_category,location"]):
+        profile(routers)  # warm the OS file cache and bytecode
+        report("all routers" if routers == "*" else routers, profile(routers), args.top)
+
+
+if __name__ == "__main__":
+    main()
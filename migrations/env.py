@@ -0,0 +1,73 @@
+# migrations/env.py
+"""
+Alembic environment for the KSW database.
+
+Autogenerate compares against `app.models.Base.metadata`. The models also map
+some views (and pg_stat_statements) as Tables so the API can query them;
+those (models.VIEW_TABLES) are excluded here so Alembic never tries to create or drop them. The
+materialized views in app.matviews have their own MetaData and are managed
+by `python -m app.manage matviews`.
+"""
+import os
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from app import models
+from app.config import load_env
+
+load_env()
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name in models.VIEW_TABLES:
+        return False
+    if type_ == "table" and reflected and compare_to is None:
+        # Tables that exist only in the database (Supabase's own) are left alone
+        return False
+    return True
+
+
+def database_url() -> str:
+    url = config.get_main_option("sqlalchemy.url") or os.getenv("SUPABASE_DATABASE_URL")
+    if not url:
+        raise RuntimeError("SUPABASE_DATABASE_URL is not set")
+    return url
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout (`alembic upgrade head --sql`)."""
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = create_engine(database_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
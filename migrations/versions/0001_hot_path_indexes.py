@@ -0,0 +1,77 @@
+"""Indexes for the hot query predicates, and person_current_rank
+
+person_current_rank is filled from the existing promotions, so current-rank
+reads are served from it straight after the upgrade.
+
+The existing schema (created in Supabase) is the baseline; this is the first
+revision applied on top of it. Indexes are built CONCURRENTLY so a live
+database keeps serving writes while they build.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('promotions_student_id_promotion_date_id_idx', 'promotions', ['student_id', 'promotion_date', 'id']),
+    ('award_person_date_achieved_idx', 'award', ['person', 'date_achieved']),
+    ('contact_user_id_idx', 'contact', ['user_id']),
+    ('user_person_user_id_idx', 'user_person', ['user_id']),
+    ('users_email_idx', 'users', ['email']),
+    ('class_exception_class_id_date_idx', 'class_exception', ['class_id', 'date']),
+    ('age_category_XREF_class_id_idx', 'age_category_XREF', ['class_id']),
+    ('age_category_XREF_event_id_idx', 'age_category_XREF', ['event_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Created by create_all in earlier deployments, hence if_not_exists
+    op.create_table(
+        'person_current_rank',
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.Column('promotion_id', sa.Integer(), nullable=False),
+        sa.Column('belt_id', sa.Integer(), nullable=False),
+        sa.Column('tabs', sa.SmallInteger(), nullable=False),
+        sa.Column('promotion_date', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('location_id', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['belt_id'], ['belt.id'], name='person_current_rank_belt_id_fkey'),
+        sa.ForeignKeyConstraint(['person_id'], ['person.id'], name='person_current_rank_person_id_fkey', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['promotion_id'], ['promotions.id'], name='person_current_rank_promotion_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('person_id', name='person_current_rank_pkey'),
+        if_not_exists=True,
+    )
+    # Same as `python -m app.manage ranks rebuild`: each person's latest promotion
+    op.execute(
+        "INSERT INTO person_current_rank (person_id, promotion_id, belt_id, tabs, promotion_date, location_id) "
+        "SELECT DISTINCT ON (student_id) student_id, id, belt_id, tabs, promotion_date, location_id "
+        "FROM promotions ORDER BY student_id, promotion_date DESC, id DESC "
+        "ON CONFLICT (person_id) DO UPDATE SET promotion_id = excluded.promotion_id, belt_id = excluded.belt_id, "
+        "tabs = excluded.tabs, promotion_date = excluded.promotion_date, location_id = excluded.location_id, "
+        "updated_at = now()"
+    )
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    op.drop_table('person_current_rank', if_exists=True)
@@ -0,0 +1,72 @@
+"""Award points aggregates for the leaderboards
+
+Creates award_points_total and award_points_bucket (see app/leaderboard.py)
+and fills them from the existing awards.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'award_points_total',
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('awards', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['person_id'], ['person.id'], name='award_points_total_person_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('person_id', name='award_points_total_pkey'),
+        if_not_exists=True,
+    )
+    op.create_index('award_points_total_points_idx', 'award_points_total', [sa.text('points DESC'), 'person_id'], if_not_exists=True)
+
+    op.create_table(
+        'award_points_bucket',
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False),
+        sa.Column('points', sa.Integer(), nullable=False),
+        sa.Column('awards', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['person_id'], ['person.id'], name='award_points_bucket_person_id_fkey', ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('person_id', 'month', 'event_id', name='award_points_bucket_pkey'),
+        if_not_exists=True,
+    )
+    op.create_index('award_points_bucket_month_idx', 'award_points_bucket', ['month'], if_not_exists=True)
+    op.create_index('award_points_bucket_event_id_idx', 'award_points_bucket', ['event_id'], if_not_exists=True)
+
+    # Same as `python -m app.manage leaderboard rebuild`
+    op.execute("DELETE FROM award_points_total")
+    op.execute("DELETE FROM award_points_bucket")
+    op.execute(
+        "INSERT INTO award_points_total (person_id, points, awards) "
+        "SELECT a.person, coalesce(sum(coalesce(t.points, 0)), 0), count(*) "
+        "FROM award a JOIN award_type t ON t.id = a.award_type GROUP BY a.person"
+    )
+    op.execute(
+        "INSERT INTO award_points_bucket (person_id, month, event_id, points, awards) "
+        "SELECT a.person, date_trunc('month', a.date_achieved)::date, coalesce(a.event, 0), "
+        "coalesce(sum(coalesce(t.points, 0)), 0), count(*) "
+        "FROM award a JOIN award_type t ON t.id = a.award_type "
+        "GROUP BY a.person, date_trunc('month', a.date_achieved)::date, coalesce(a.event, 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('award_points_bucket', if_exists=True)
+    op.drop_table('award_points_total', if_exists=True)
@@ -0,0 +1,53 @@
+"""Attendance date, one check-in per person, class and day
+
+Adds attendance.attendance_date (backfilled from created_at), the unique
+key the check-in upsert conflicts on, and an index for per-class date
+ranges; the unique key's leading person_id serves per-person ranges.
+Duplicate check-ins already recorded for the same person, class and day
+are removed, keeping the earliest.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('attendance', sa.Column('attendance_date', sa.Date(), nullable=True))
+    op.execute("UPDATE attendance SET attendance_date = created_at::date WHERE attendance_date IS NULL")
+    op.alter_column('attendance', 'attendance_date', nullable=False, server_default=sa.text('CURRENT_DATE'))
+
+    # Keep the earliest check-in of each (person, day, class); NULL start times sort
+    # first. Rows without a class never conflict under the unique key and are kept.
+    op.execute(
+        "DELETE FROM attendance WHERE id IN ("
+        "SELECT id FROM ("
+        "SELECT id, row_number() OVER ("
+        "PARTITION BY person_id, attendance_date, class_id ORDER BY start_time NULLS FIRST, id"
+        ") AS n FROM attendance WHERE class_id IS NOT NULL"
+        ") ranked WHERE n > 1)"
+    )
+    op.create_unique_constraint(
+        'attendance_person_id_attendance_date_class_id_key', 'attendance', ['person_id', 'attendance_date', 'class_id']
+    )
+    op.create_index('attendance_class_id_attendance_date_idx', 'attendance', ['class_id', 'attendance_date'], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('attendance_class_id_attendance_date_idx', table_name='attendance', if_exists=True)
+    op.drop_constraint('attendance_person_id_attendance_date_class_id_key', 'attendance', type_='unique')
+    op.drop_column('attendance', 'attendance_date')
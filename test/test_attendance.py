@@ -0,0 +1,102 @@
+from datetime import date, datetime, time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app import crud, schemas
+from app.attendance import AttendanceBuffer
+from app.exceptions import ServiceUnavailableError
+
+NOW = datetime(2026, 3, 2, 18, 5, 30, 123456)
+
+
+def check_in(person_id, class_id=1, **kwargs):
+    return schemas.AttendanceCreate(person_id=person_id, class_id=class_id, **kwargs)
+
+
+def test_attendance_rows_default_and_collapse_repeated_taps():
+    rows = crud.attendance_rows(
+        [check_in(1), check_in(1, start_time=time(18, 0)), check_in(2, attendance_date=date(2026, 3, 1))],
+        now=NOW,
+    )
+
+    assert rows == [
+        {"person_id": 1, "class_id": 1, "attendance_date": date(2026, 3, 2), "start_time": time(18, 0)},
+        {"person_id": 2, "class_id": 1, "attendance_date": date(2026, 3, 1), "start_time": time(18, 5, 30)},
+    ]
+
+
+def test_buffer_coalesces_a_burst():
+    buffer = AttendanceBuffer(delay=60)
+    try:
+        buffer.add([check_in(1)])
+        timer = buffer._timer
+        buffer.add([check_in(2), check_in(1)])
+
+        assert buffer._timer is timer
+        assert len(buffer) == 2
+    finally:
+        buffer._timer.cancel()
+
+
+def test_buffer_writes_when_full(monkeypatch):
+    buffer = AttendanceBuffer(delay=60, max_size=3)
+    written = []
+    monkeypatch.setattr(buffer, "_write", written.append)
+
+    buffer.add([check_in(1), check_in(2)])
+    assert not written
+    buffer.add([check_in(3)])
+
+    assert [len(rows) for rows in written] == [3]
+    assert len(buffer) == 0 and buffer._timer is None
+
+
+def failing_write(writes):
+    def write(rows):
+        writes.append(rows)
+        raise OperationalError("INSERT", {}, Exception("connection lost"))
+    return write
+
+
+def test_buffer_keeps_check_ins_when_the_write_fails(monkeypatch):
+    buffer = AttendanceBuffer(delay=10, max_size=2)
+    writes = []
+    monkeypatch.setattr(buffer, "_write", failing_write(writes))
+    try:
+        buffer.add([check_in(1), check_in(2)])
+
+        assert len(writes) == 1
+        assert len(buffer) == 2 and buffer._timer is not None
+        assert buffer._timer.interval == 20  # backed off
+        with pytest.raises(ServiceUnavailableError):
+            buffer.add([check_in(3)])  # full while writes are failing
+        buffer.add([check_in(1)])  # already pending
+        assert len(writes) == 1 and len(buffer) == 2
+
+        monkeypatch.setattr(buffer, "_write", writes.append)
+        buffer.flush()
+        assert len(writes[-1]) == 2 and len(buffer) == 0
+        assert buffer._failures == 0 and not buffer._attempts
+    finally:
+        if buffer._timer is not None:
+            buffer._timer.cancel()
+
+
+def test_buffer_drops_check_ins_after_max_attempts(monkeypatch):
+    buffer = AttendanceBuffer(delay=60, max_size=10, max_attempts=2)
+    writes = []
+    monkeypatch.setattr(buffer, "_write", failing_write(writes))
+    try:
+        buffer.add([check_in(1)])
+        buffer.flush()
+        buffer.add([check_in(2)])
+        buffer.flush()
+
+        # Person 1 has failed twice and is dropped; person 2 gets its own attempts
+        assert [len(rows) for rows in writes] == [1, 2]
+        assert [row["person_id"] for row in buffer._pending.values()] == [2]
+        assert buffer.dropped == 1
+    finally:
+        if buffer._timer is not None:
+            buffer._timer.cancel()
@@ -404,4 +404,125 @@ def test_award_appears_in_view_after_creation(service_headers):
     assert view_data["person_id"] == create_payload["person"]
     
     # Clean up
-    client.delete(f"/awards/{award_id}", headers=service_headers)
\ No newline at end of file
+    client.delete(f"/awards/{award_id}", headers=service_headers)
+
+def leaderboard_points(person_id, **params):
+    response = client.get("/awards/leaderboard", params={"limit": 100, **params})
+    assert response.status_code == 200
+    return next((entry["points"] for entry in response.json() if entry["person_id"] == person_id), 0)
+
+
+def test_leaderboard_follows_award_writes(service_headers):
+    """Creating, moving and deleting an award updates the leaderboard aggregates"""
+    season = date.today().year
+    before = leaderboard_points(6)
+    before_season = leaderboard_points(6, season=season)
+
+    create_response = client.post("/awards/", json={
+        "award_type": 1,
+        "person": 6,
+        "rank_at_time": 10,
+        "date_achieved": date.today().isoformat()
+    }, headers=service_headers)
+    assert create_response.status_code == 201
+    award_id = create_response.json()["id"]
+    award_points = client.get(f"/awards/{award_id}", headers=service_headers).json()["points"] or 0
+
+    assert leaderboard_points(6) == before + award_points
+    assert leaderboard_points(6, season=season) == before_season + award_points
+
+    # Moving it to another season moves its points with it
+    client.put(f"/awards/{award_id}", json={"date_achieved": date(season - 5, 1, 1).isoformat()}, headers=service_headers)
+    assert leaderboard_points(6, season=season) == before_season
+    assert leaderboard_points(6) == before + award_points
+
+    client.delete(f"/awards/{award_id}", headers=service_headers)
+    assert leaderboard_points(6) == before
+
+
+def test_leaderboard_is_ranked():
+    """Entries are ordered by points; ties share a rank"""
+    response = client.get("/awards/leaderboard", params={"limit": 50})
+    assert response.status_code == 200
+    entries = response.json()
+    assert [e["points"] for e in entries] == sorted((e["points"] for e in entries), reverse=True)
+    for previous, entry in zip(entries, entries[1:]):
+        assert entry["rank"] == (previous["rank"] if entry["points"] == previous["points"] else entries.index(entry) + 1)
+
+
+def test_leaderboard_rejects_inverted_window():
+    response = client.get("/awards/leaderboard", params={"start_date": "2025-05-01", "end_date": "2025-01-01"})
+    assert response.status_code == 400
+
+
+def test_bulk_create_awards(service_headers):
+    """A medal table is written in one request; invalid items are reported per item"""
+    payload = {
+        "event": 8,
+        "date_achieved": date.today().isoformat(),
+        "items": [
+            {"award_type": 1, "person": 6, "rank_at_time": 10},
+            {"award_type": 1, "person": 99999},
+        ]
+    }
+
+    response = client.post("/awards/bulk", json=payload, headers=service_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["committed"] is True
+    assert data["created"] == 1
+    assert data["failed"] == 1
+    created, failed = data["results"]
+    assert created["status"] == "created"
+    assert created["award"]["event"] == 8
+    assert failed["status"] == "failed"
+    assert "not found" in failed["error"].lower()
+
+    client.delete(f"/awards/{created['award']['id']}", headers=service_headers)
+
+
+def test_bulk_create_awards_atomic(service_headers):
+    """An atomic request with an invalid item writes nothing"""
+    payload = {
+        "atomic": True,
+        "items": [
+            {"award_type": 1, "person": 6, "rank_at_time": 10},
+            {"award_type": 99999, "person": 6, "rank_at_time": 10},
+        ]
+    }
+
+    response = client.post("/awards/bulk", json=payload, headers=service_headers)
+    assert response.status_code == 400
+    data = response.json()
+    assert data["committed"] is False
+    assert [r["status"] for r in data["results"]] == ["skipped", "failed"]
+
+
+def test_import_tournament_results(service_headers):
+    """A results sheet is imported in one batch; unknown names are reported by line"""
+    body = "person,award_type,category,rank_at_time\n6,1,,10\n6,No Such Medal,,10\n"
+    headers = {**service_headers, "Content-Type": "text/csv"}
+
+    response = client.post("/awards/import?event_id=8", content=body, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["committed"] is True
+    assert data["imported"] == 1
+    assert data["failed"] == 1
+    assert data["errors"][0]["line"] == 3
+    assert "award type not found" in data["errors"][0]["error"].lower()
+
+    client.delete(f"/awards/{data['award_ids'][0]}", headers=service_headers)
+
+
+def test_import_tournament_results_atomic(service_headers):
+    """An atomic import with a rejected row writes nothing"""
+    body = '{"person": 6, "award_type": 1, "rank_at_time": 10}\n{"person": 99999, "award_type": 1}\n'
+    headers = {**service_headers, "Content-Type": "application/x-ndjson"}
+
+    response = client.post("/awards/import?atomic=true", content=body, headers=headers)
+    assert response.status_code == 400
+    data = response.json()
+    assert data["committed"] is False
+    assert data["imported"] == 0
+    assert data["errors"][0]["line"] == 2
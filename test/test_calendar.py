@@ -35,3 +35,26 @@ def test_get_one_month_calendar(service_headers):
     data = response.json()
     assert isinstance(data, list)
     print(data)
+
+def test_get_calendar_range(service_headers):
+    response = client.get("/calendar/range?from=2025-11-01&to=2025-11-30", headers=service_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert isinstance(data, list)
+    assert all("2025-11-01" <= entry["date"] <= "2025-11-30" for entry in data)
+
+def test_get_calendar_range_rejects_reversed_dates(service_headers):
+    response = client.get("/calendar/range?from=2025-11-30&to=2025-11-01", headers=service_headers)
+    assert response.status_code == 400
+
+def test_get_calendar_month_rejects_invalid_month(service_headers):
+    response = client.get("/calendar/year/2025/month/13", headers=service_headers)
+    assert response.status_code == 400
+
+def test_get_calendar_month_rejects_last_representable_year(service_headers):
+    response = client.get("/calendar/year/9999/month/12", headers=service_headers)
+    assert response.status_code == 400
+
+def test_get_calendar_range_rejects_last_representable_year(service_headers):
+    response = client.get("/calendar/range?from=9999-12-01&to=9999-12-31", headers=service_headers)
+    assert response.status_code == 400
@@ -0,0 +1,64 @@
+from datetime import date, datetime, time
+
+from app import calendar_engine as engine_module
+from app.calendar_engine import CalendarEngine, CalendarSnapshot, expand
+
+MONDAY_CLASS = {
+    "class_id": 1, "event_id": None, "class_name": "Juniors",
+    "start_time": time(17, 0), "end_time": time(18, 0),
+    "instructor_id": 1, "instructor_name": "Alice A", "description": None,
+    "location_id": 1, "location_name": "Main Dojang", "is_dojang": True,
+    "event_type": None, "calendar_type": "class",
+    "active_from": date(2025, 11, 1), "active_to": None,
+}
+GRADING = {
+    "class_id": None, "event_id": 7, "class_name": "Autumn Grading",
+    "start_time": time(10, 0), "end_time": time(13, 0),
+    "instructor_id": None, "instructor_name": None, "description": None,
+    "location_id": 1, "location_name": "Main Dojang", "is_dojang": True,
+    "event_type": "Grading", "calendar_type": "event",
+}
+
+
+def make_snapshot(version="v1"):
+    return CalendarSnapshot(
+        classes_by_weekday={0: (MONDAY_CLASS,)},
+        cancellations=frozenset({(1, date(2025, 11, 3))}),
+        events_by_date={date(2025, 11, 15): (GRADING,)},
+        version=version,
+    )
+
+
+def test_expand_skips_cancellations_and_inactive_dates():
+    entries = list(expand(make_snapshot(), date(2025, 10, 1), date(2025, 12, 1)))
+
+    mondays = [e["date"] for e in entries if e["calendar_type"] == "class"]
+    # October is before active_from and 3 November is cancelled
+    assert mondays == [date(2025, 11, 10), date(2025, 11, 17), date(2025, 11, 24)]
+    assert entries[0]["day_name"] == "Monday"
+    assert entries[0]["day_of_week"] == 1  # 0 is Sunday
+    assert "active_from" not in entries[0]
+
+    grading = next(e for e in entries if e["calendar_type"] == "event")
+    assert grading["date"] == date(2025, 11, 15)
+    assert grading["day_of_week"] == 6
+
+
+def test_months_cached_until_invalidated(monkeypatch):
+    loads = []
+
+    def fake_load(db):
+        loads.append(datetime.now())
+        return make_snapshot(version=f"v{len(loads)}")
+
+    monkeypatch.setattr(engine_module, "load_snapshot", fake_load)
+    engine = CalendarEngine(ttl=300)
+
+    first = engine.month(None, 2025, 11)
+    assert engine.month(None, 2025, 11) is first
+    assert len(engine.between(None, date(2025, 11, 10), date(2025, 11, 16))) == 2
+    assert len(loads) == 1
+
+    engine.invalidate()
+    assert engine.month(None, 2025, 11) == first
+    assert len(loads) == 2
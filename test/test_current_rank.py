@@ -0,0 +1,87 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud, current_rank, database, models, schemas
+from app.config import load_env
+from app.exceptions import BadRequestError
+
+
+@pytest.fixture
+def db():
+    """A session whose work is rolled back at the end of the test."""
+    load_env()
+    if not os.getenv("SUPABASE_DATABASE_URL"):
+        pytest.skip("SUPABASE_DATABASE_URL is not set")
+    connection = database.get_engine().connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def make_person(db: Session, belt_id: int) -> models.Person:
+    role_id = db.query(models.Role.id).order_by(models.Role.id).limit(1).scalar()
+    person = models.Person(first_name="Rank", last_name="Test", role_id=role_id, belt_level_id=belt_id, active=True)
+    db.add(person)
+    db.flush()
+    return person
+
+
+def first_belts(db: Session, count: int) -> list[int]:
+    return list(db.scalars(db.query(models.Belt.id).order_by(models.Belt.id).limit(count).statement))
+
+
+def test_rebuild_keeps_belt_level_of_person_without_promotions(db):
+    (belt_id,) = first_belts(db, 1)
+    person = make_person(db, belt_id)
+
+    current_rank.rebuild(db)
+
+    db.expire_all()
+    assert db.get(models.Person, person.id).belt_level_id == belt_id
+
+
+def test_backdated_standard_promotion_is_rejected(db):
+    first, second = first_belts(db, 2)
+    location_id = db.query(models.Location.id).order_by(models.Location.id).limit(1).scalar()
+    person = make_person(db, first)
+    crud.set_belt(db, person.id, first, 0, location_id, promotion_date=datetime.now())
+
+    with pytest.raises(BadRequestError, match="earlier"):
+        crud.standard_promotion(db, person.id, location_id=location_id, promotions_date=datetime.now() - timedelta(days=30))
+
+    db.expire_all()
+    assert db.get(models.Person, person.id).belt_level_id == first
+    assert db.query(models.Promotions).filter(models.Promotions.student_id == person.id).count() == 1
+
+    crud.standard_promotion(db, person.id, location_id=location_id)
+    db.expire_all()
+    assert db.get(models.Person, person.id).belt_level_id == second
+
+
+def test_bulk_promote_validates_every_kind_and_syncs_belt_levels(db):
+    first, second, third = first_belts(db, 3)
+    location_id = db.query(models.Location.id).order_by(models.Location.id).limit(1).scalar()
+    person = make_person(db, first)
+    crud.set_belt(db, person.id, first, 0, location_id, promotion_date=datetime.now())
+    last_month = datetime.now() - timedelta(days=30)
+
+    response = crud.bulk_promote(db, schemas.BulkPromotionRequest(location_id=location_id, items=[
+        schemas.BulkPromotionItem(person_id=person.id, kind="set", belt_id=third, promotion_date=last_month),
+        schemas.BulkPromotionItem(person_id=person.id, kind="standard"),
+    ]))
+
+    assert [r.status for r in response.results] == ["failed", "created"]
+    assert "earlier" in response.results[0].error
+    db.expire_all()
+    promoted = db.get(models.Person, person.id)
+    assert promoted.belt_level_id == second
+    assert promoted.modified_at is not None
+    assert current_rank.get(db, person.id).belt_id == second
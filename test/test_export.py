@@ -0,0 +1,95 @@
+import csv
+import io
+import os
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table, create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import database, models
+from app.api.v1 import export
+from app.api.v1.auth import get_current_user, get_db_user
+from app.config import load_env
+from app.factory import create_app
+
+SERVICE = {"id": "00000000-0000-0000-0000-000000000001", "role": "service"}
+
+full_award = Table(
+    "full_award", MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("award_name", String),
+    Column("person_name", String),
+    Column("date_achieved", Date),
+    Column("points", Integer),
+)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    full_award.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(full_award), [
+            {"id": 2, "award_name": "Silver", "person_name": "Lee", "date_achieved": date(2025, 3, 2), "points": None},
+            {"id": 1, "award_name": "Gold", "person_name": 'Park, Jo "JP"', "date_achieved": date(2025, 3, 1), "points": 3},
+        ])
+
+    monkeypatch.setattr(export, "get_sessionmaker", lambda: sessionmaker(bind=engine))
+    monkeypatch.setitem(export.EXPORTS, "awards", lambda: select(full_award).order_by(full_award.c.id))
+    # One row per batch, so the body is streamed in several chunks
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 1)
+
+    app = create_app(["export"])
+    app.dependency_overrides[get_current_user] = lambda: SERVICE
+    app.dependency_overrides[get_db_user] = lambda: None
+    return TestClient(app)
+
+
+def test_export_awards_ndjson(client):
+    response = client.get("/export/awards")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.splitlines() == [
+        '{"id": 1, "award_name": "Gold", "person_name": "Park, Jo \\"JP\\"", "date_achieved": "2025-03-01", "points": 3}',
+        '{"id": 2, "award_name": "Silver", "person_name": "Lee", "date_achieved": "2025-03-02", "points": null}',
+    ]
+
+
+def test_export_awards_csv(client):
+    response = client.get("/export/awards?format=csv")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="awards.csv"'
+    assert response.text == (
+        "id,award_name,person_name,date_achieved,points\r\n"
+        '1,Gold,"Park, Jo ""JP""",2025-03-01,3\r\n'
+        "2,Silver,Lee,2025-03-02,\r\n"
+    )
+
+
+def test_export_invalid_format(client):
+    assert client.get("/export/awards?format=xml").status_code == 400
+
+
+def test_export_unknown_resource(client):
+    response = client.get("/export/contacts")
+    assert response.status_code == 404
+
+
+def test_export_promotions_csv_from_database():
+    load_env()
+    if not os.getenv("SUPABASE_DATABASE_URL"):
+        pytest.skip("SUPABASE_DATABASE_URL is not set")
+    app = create_app(["export"])
+    app.dependency_overrides[get_current_user] = lambda: SERVICE
+    app.dependency_overrides[get_db_user] = lambda: None
+
+    response = TestClient(app).get("/export/promotions?format=csv")
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    with database.get_sessionmaker()() as db:
+        assert len(rows) == db.query(models.Promotions).count()
+    assert rows and all(row["belt_name"] for row in rows)
@@ -0,0 +1,28 @@
+import pytest
+
+from app.factory import ROUTERS, create_app, routers_from_env
+
+
+def paths(app):
+    return {route.path for route in app.routes}
+
+
+def test_mounts_only_the_named_routers():
+    app = create_app(["belts", "location"])
+
+    assert "/belts/" in paths(app)
+    assert "/location/" in paths(app)
+    assert not any(path.startswith("/person") for path in paths(app))
+
+
+def test_unknown_router_is_rejected():
+    with pytest.raises(ValueError, match="nope"):
+        create_app(["belts", "nope"])
+
+
+def test_routers_from_env(monkeypatch):
+    monkeypatch.delenv("KSW_ROUTERS", raising=False)
+    assert routers_from_env() == list(ROUTERS)
+
+    monkeypatch.setenv("KSW_ROUTERS", "belts, role,")
+    assert routers_from_env() == ["belts", "role"]
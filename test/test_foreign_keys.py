@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from sqlalchemy.exc import IntegrityError
+
+from app import foreign_keys
+
+
+def integrity_error(sqlstate: str, **diag) -> IntegrityError:
+    orig = SimpleNamespace(sqlstate=sqlstate, diag=SimpleNamespace(**diag))
+    return IntegrityError("UPDATE award ...", {}, orig)
+
+
+def test_only_foreign_key_violations_report_a_missing_record():
+    fk = integrity_error("23503", constraint_name="award_person_fkey")
+    assert foreign_keys.violation(fk) == "Referenced record no longer exists (award_person_fkey)"
+
+    not_null = integrity_error("23502", column_name="person", constraint_name=None)
+    assert foreign_keys.violation(not_null) == "Missing required value (person)"
+
+    check = integrity_error("23514", constraint_name="award_points_check")
+    assert foreign_keys.violation(check) == "Value not allowed (award_points_check)"
+
+
+def test_psycopg2_pgcode_is_understood():
+    orig = SimpleNamespace(pgcode="23502", diag=SimpleNamespace(column_name="award_type"))
+    assert foreign_keys.violation(IntegrityError("INSERT ...", {}, orig)) == "Missing required value (award_type)"
@@ -0,0 +1,59 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.http_cache import ETagMiddleware, cacheable, conditional, etag_matches
+
+
+def make_client():
+    state = {"version": "v1", "calls": 0}
+    app = FastAPI()
+    app.add_middleware(ETagMiddleware)
+
+    @app.get("/versioned", dependencies=[Depends(conditional(lambda: state["version"]))])
+    def versioned():
+        state["calls"] += 1
+        return {"version": state["version"]}
+
+    @app.get("/hashed", dependencies=[Depends(cacheable(max_age=30, stale_while_revalidate=60))])
+    def hashed():
+        state["calls"] += 1
+        return [1, 2, 3]
+
+    @app.get("/private")
+    def private():
+        return {"ok": True}
+
+    return TestClient(app), state
+
+
+def test_etag_matching():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_versioned_304_skips_the_route():
+    client, state = make_client()
+    first = client.get("/versioned")
+    assert first.headers["cache-control"].startswith("public")
+
+    again = client.get("/versioned", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert state["calls"] == 1
+
+    state["version"] = "v2"
+    changed = client.get("/versioned", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+
+
+def test_body_hash_etag():
+    client, state = make_client()
+    first = client.get("/hashed")
+    assert first.headers["cache-control"] == "public, max-age=30, stale-while-revalidate=60"
+
+    again = client.get("/hashed", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert "etag" not in client.get("/private").headers
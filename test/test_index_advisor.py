@@ -0,0 +1,26 @@
+from app.index_advisor import StatementReport, format_report, seq_scans
+
+
+PLAN = {
+    "Node Type": "Nested Loop",
+    "Plans": [
+        {"Node Type": "Index Scan", "Relation Name": "person", "Index Name": "person_pkey", "Index Cond": "(id = $1)"},
+        {"Node Type": "Seq Scan", "Relation Name": "award", "Filter": "(person = $1)"},
+        {"Node Type": "Seq Scan", "Relation Name": "award_type"},
+    ],
+}
+
+
+def test_seq_scans_reports_only_filtered_scans():
+    assert seq_scans(PLAN) == ["award: (person = $1)"]
+
+
+def test_format_report():
+    report = StatementReport("SELECT *\n  FROM award WHERE person = $1", calls=3, total_ms=12.0, mean_ms=4.0, rows=9, plan=PLAN)
+    report.seq_scans = seq_scans(PLAN)
+    text = format_report([report], plans=True)
+
+    assert "SELECT * FROM award WHERE person = $1" in text
+    assert "seq scan on award: (person = $1)" in text
+    assert "-> Index Scan person" in text
+    assert format_report([]).startswith("pg_stat_statements has no statements")
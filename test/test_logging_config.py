@@ -0,0 +1,70 @@
+import io
+import json
+import logging
+
+import pytest
+
+from app import logging_config
+from app.logging_config import SamplingFilter, configure_logging, parse_sampling, redact, request_context
+
+
+@pytest.fixture
+def output():
+    stream = io.StringIO()
+    configure_logging(level="INFO", fmt="json", stream=stream)
+    yield stream
+    logging_config.stop_logging()
+
+
+def lines(stream):
+    logging_config.stop_logging()  # drains the queue
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_json_with_extra_fields(output):
+    token = request_context.set(("GET", "/belts/"))
+    try:
+        logging.getLogger("ksw.test").info("served %s", "belts", extra={"rows": 3})
+    finally:
+        request_context.reset(token)
+
+    entry = lines(output)[-1]
+    assert entry["message"] == "served belts"
+    assert entry["level"] == "INFO"
+    assert entry["rows"] == 3
+    assert entry["path"] == "/belts/"
+
+
+def test_secrets_are_redacted(output):
+    logging.getLogger("ksw.test").warning(
+        "auth Bearer abc.def for postgresql://u:hunter2@db/ksw",
+        extra={"access_token": "eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxIn0.sig"},
+    )
+
+    entry = lines(output)[-1]
+    assert "abc.def" not in entry["message"]
+    assert "hunter2" not in entry["message"]
+    assert entry["access_token"] == logging_config.REDACTED
+
+
+def test_redact_jwt():
+    assert "eyJ" not in redact("token eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxIn0.sig")
+
+
+def test_sampling_by_route_keeps_warnings():
+    sampling = SamplingFilter(parse_sampling("/belts=0,/person=1"))
+    debug = logging.LogRecord("ksw.test", logging.DEBUG, __file__, 1, "hit", None, None)
+    warning = logging.LogRecord("ksw.test", logging.WARNING, __file__, 1, "slow", None, None)
+
+    token = request_context.set(("GET", "/belts/1"))
+    try:
+        assert not sampling.filter(debug)
+        assert sampling.filter(warning)
+    finally:
+        request_context.reset(token)
+    assert sampling.rate_for("/person/3") == 1
+    assert sampling.rate_for("/awards/") == 1.0
+
+
+def test_parse_sampling_longest_prefix_first():
+    assert parse_sampling("/a=0.5, /a/b=0.1") == [("/a/b", 0.1), ("/a", 0.5)]
@@ -0,0 +1,41 @@
+import pytest
+
+from app import matviews, models
+from app.matviews import MatviewRefresher
+
+
+def test_every_matview_has_a_plain_unique_index():
+    # REFRESH ... CONCURRENTLY refuses materialized views without one
+    for table in matviews.matview_metadata.sorted_tables:
+        assert any(index.unique and all(hasattr(e, "table") for e in index.expressions) for index in table.indexes), table.name
+        assert matviews.SOURCES[table.name] == table.name.removesuffix("_mv")
+
+
+def test_routes_read_plain_views_by_default():
+    assert not matviews.ENABLED
+    assert matviews.full_award is models.t_full_award
+
+
+def test_refresh_later_coalesces_a_burst():
+    refresher = MatviewRefresher(delay=60, enabled=True)
+    try:
+        refresher.refresh_later(models.t_full_person)
+        timer = refresher._timer
+        refresher.refresh_later(models.t_full_person, models.t_full_award)
+        refresher.refresh_later(matviews.full_award_mv)
+
+        assert refresher._timer is timer
+        assert refresher._pending == {"full_person_mv", "full_award_mv"}
+    finally:
+        refresher._timer.cancel()
+
+
+def test_disabled_refresher_does_nothing():
+    refresher = MatviewRefresher(delay=60, enabled=False)
+    refresher.refresh_later(models.t_full_person)
+    assert refresher._timer is None and not refresher._pending
+
+
+def test_refresh_rejects_unknown_names():
+    with pytest.raises(ValueError):
+        matviews.refresh(None, ["person"])
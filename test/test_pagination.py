@@ -0,0 +1,84 @@
+from datetime import date
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Date, Integer, MetaData, Table, create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.exceptions import BadRequestError
+from app.pagination import Page, decode_cursor, encode_cursor
+
+exceptions = Table("class_exception", MetaData(), Column("id", Integer, primary_key=True), Column("date", Date))
+
+
+def make_client(rows: list[dict]) -> TestClient:
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    exceptions.create(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(exceptions), rows)
+    Session = sessionmaker(bind=engine)
+
+    app = FastAPI()
+
+    @app.get("/cancelled")
+    def cancelled(page: Page = Depends()):
+        with Session() as db:
+            rows = page.apply(db.query(exceptions), [exceptions.c.date, exceptions.c.id])
+            return [{"id": row.id, "date": row.date} for row in rows]
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def client():
+    # Dates deliberately out of id order
+    return make_client([{"id": i, "date": date(2025, 1, 10 - i % 3)} for i in range(1, 8)])
+
+
+def all_pages(client: TestClient, url: str) -> list[list[dict]]:
+    pages = []
+    while url:
+        resp = client.get(url)
+        pages.append(resp.json())
+        link = resp.headers.get("link")
+        url = link[1:link.index(">")] if link else None
+    return pages
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor([date(2025, 1, 2), 5])) == ["2025-01-02", 5]
+    with pytest.raises(BadRequestError):
+        decode_cursor("not a cursor")
+
+
+def test_pages_follow_next_link_in_key_order(client):
+    everything = client.get("/cancelled?limit=100").json()
+    assert "link" not in client.get("/cancelled?limit=100").headers
+
+    pages = all_pages(client, "/cancelled?limit=3")
+    assert [len(p) for p in pages] == [3, 3, 1]
+    assert [row for page in pages for row in page] == everything
+    assert everything == sorted(everything, key=lambda row: (row["date"], row["id"]))
+
+
+def test_invalid_cursor_is_bad_request(client):
+    assert client.get("/cancelled?cursor=WyJub3QtYS1kYXRlIiwxXQ").status_code == 400
+
+
+def test_pages_include_rows_with_null_keys():
+    # The first page ends on a NULL date (id 1); later cursors sit among NULLs
+    client = make_client([
+        {"id": 1, "date": None},
+        {"id": 2, "date": date(2025, 1, 2)},
+        {"id": 3, "date": date(2025, 1, 1)},
+        {"id": 4, "date": None},
+        {"id": 5, "date": date(2025, 1, 2)},
+        {"id": 6, "date": None},
+    ])
+
+    pages = all_pages(client, "/cancelled?limit=4")
+    assert [[row["id"] for row in page] for page in pages] == [[3, 2, 5, 1], [4, 6]]
+    pages = all_pages(client, "/cancelled?limit=2")
+    assert [row["id"] for page in pages for row in page] == [3, 2, 5, 1, 4, 6]
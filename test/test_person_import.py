@@ -0,0 +1,46 @@
+import asyncio
+
+from starlette.requests import Request
+
+from app.person_import import parse_records
+
+
+def make_request(body: bytes, chunk_size: int = 7) -> Request:
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    return Request({"type": "http", "method": "POST", "headers": []}, receive)
+
+
+def collect(body: bytes, fmt: str) -> list:
+    async def run():
+        return [item async for item in parse_records(make_request(body), fmt)]
+    return asyncio.run(run())
+
+
+def test_csv_records_split_across_chunks_and_lines():
+    body = (
+        "﻿first_name,last_name,dob,age_category_id\r\n"
+        'Ann,"Smith, ""Jr""",2010-01-01,1\r\n'
+        '"Multi\nLine",X,2011-02-02,2\r\n'
+        "Short,Row\r\n"
+    ).encode()
+
+    records = collect(body, "csv")
+
+    assert records[0] == (2, {"first_name": "Ann", "last_name": 'Smith, "Jr"', "dob": "2010-01-01", "age_category_id": "1"})
+    assert records[1][0] == 3 and records[1][1]["first_name"] == "Multi\nLine"
+    assert records[2] == (5, "Expected 4 columns, got 2")
+
+
+def test_ndjson_reports_bad_lines():
+    body = b'{"first_name": "Ann"}\n\nnot json\n[1]'
+
+    records = collect(body, "ndjson")
+
+    assert records[0] == (1, {"first_name": "Ann"})
+    assert records[1][0] == 3 and records[1][1].startswith("Invalid JSON")
+    assert records[2] == (4, "Each line must be a JSON object")
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app import models
+from app.api.v1.auth import get_current_user, get_user_role
+from app.calendar_engine import calendar_engine
+from app.database import get_async_db
+from app.factory import create_app
+from app.response_cache import response_cache
+
+ADMIN = {"id": "00000000-0000-0000-0000-000000000001", "role": "service"}
+
+
+class FakeAsyncSession:
+    def __init__(self, person):
+        self.person = person
+        self.commits = 0
+
+    async def get(self, model, id):
+        return self.person if id == self.person.id else None
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, instance):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+def make_client(session):
+    app = create_app(["person"])
+    app.dependency_overrides[get_current_user] = lambda: ADMIN
+    app.dependency_overrides[get_user_role] = lambda: "admin"
+    app.dependency_overrides[get_async_db] = lambda: session
+    return TestClient(app)
+
+
+def test_admin_rename_invalidates_calendar(monkeypatch):
+    person = models.Person(
+        id=7, first_name="Jo", last_name="Park", dob=datetime(1990, 1, 1), age_category_id=1,
+        created_at=datetime(2025, 1, 1), active=True, role_id=3, belt_level_id=2,
+    )
+    session = FakeAsyncSession(person)
+    reloads = []
+    monkeypatch.setattr(calendar_engine, "invalidate", lambda: reloads.append(True))
+    before = response_cache.backend.versions(["calendar"])
+
+    response = make_client(session).put("/person/7", json={"first_name": "Joanne"})
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Joanne"
+    assert person.modified_at is not None and session.commits == 1
+    assert reloads
+    assert response_cache.backend.versions(["calendar"]) != before
+
+
+def test_admin_update_of_missing_person_is_404():
+    session = FakeAsyncSession(models.Person(id=7))
+
+    response = make_client(session).put("/person/8", json={"first_name": "Joanne"})
+
+    assert response.status_code == 404
@@ -84,6 +84,37 @@ def test_get_promotion_for_student(service_headers):
     assert response.status_code == 200
     data = response.json()
 
+def test_current_promotion_is_latest_for_student(service_headers):
+    history = client.get("/promotions/student/15", headers=service_headers).json()
+    response = client.get("/promotions/current/student/15/", headers=service_headers)
+    assert response.status_code == 200
+    latest = max(history, key=lambda p: (p["promotion_date"], p["id"]))
+    assert response.json()["id"] == latest["id"]
+
+def test_get_current_promotions(service_headers):
+    response = client.get("/promotions/current?limit=50", headers=service_headers)
+    assert response.status_code == 200
+    data = response.json()
+    student_ids = [p["student_id"] for p in data]
+    assert student_ids == sorted(set(student_ids))
+    assert all("belt_name" in p and "location_title" in p for p in data)
+
 
 
 
+
+def test_bulk_promotion_atomic_rejects_whole_batch(service_headers):
+    payload = {
+        "location_id": 1,
+        "atomic": True,
+        "items": [
+            {"person_id": 999999, "kind": "standard"},
+            {"person_id": 999999, "kind": "set"},
+        ],
+    }
+    response = client.post("/promotions/bulk", json=payload, headers=service_headers)
+    assert response.status_code == 400
+    data = response.json()
+    assert data["committed"] is False
+    assert data["created"] == 0
+    assert [r["status"] for r in data["results"]] == ["failed", "failed"]
@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from app import schemas
+from app.reference_data import ReferenceData, ReferenceRegistry
+from app import reference_data as reference_module
+
+CREATED = datetime(2025, 1, 1)
+
+
+def belt(id, name):
+    return schemas.BeltOut(id=id, name=name, is_stripe=False, korean_name=name, primary_colour=name,
+                           created_at=CREATED, modified_at=None)
+
+
+def make_data(version="v1"):
+    return ReferenceData(
+        belts=(belt(1, "White"), belt(2, "Yellow"), belt(5, "Black")),  # ids need not be contiguous
+        roles=(schemas.RoleOut(id=1, name="admin", created_at=CREATED, modified_at=None),),
+        age_categories=(),
+        event_types=(),
+        locations=(),
+        version=version,
+    )
+
+
+def test_belt_lookups():
+    data = make_data()
+
+    assert data.belt(2).name == "Yellow"
+    assert data.belt(3) is None
+    assert data.next_belt_id(1) == 2
+    assert data.next_belt_id(2) == 5
+    assert data.next_belt_id(5) is None
+    assert data.max_belt_id == 5
+    assert data.role(1).name == "admin"
+
+
+def test_registry_reloads_after_invalidate(monkeypatch):
+    loads = []
+    monkeypatch.setattr(reference_module, "load_reference_data", lambda db: loads.append(db) or make_data(f"v{len(loads)}"))
+    registry = ReferenceRegistry(ttl=300)
+
+    assert registry.get(db="session").version == "v1"
+    assert registry.get(db="session").version == "v1"
+    registry.invalidate()
+    assert registry.get(db="session").version == "v2"
+    assert len(loads) == 2
+
+
+def test_tournament_category_eligibility():
+    category = lambda id, name, black=False, upper=None: schemas.TournamentCategoryOut(
+        id=id, name=name, is_black_belt_only=black, upper_category=upper)
+    data = ReferenceData(
+        belts=(belt(1, "White"), belt(2, "Yellow"), belt(5, "Black")),
+        roles=(), age_categories=(), event_types=(), locations=(), version="v1",
+        tournament_categories=(
+            category(1, "Juniors", upper="Patterns"),
+            category(2, "Open", black=True, upper="Sparring"),
+            category(3, "Open", upper="Patterns"),
+            category(4, "Destruction"),
+        ),
+        tournament_category_belts=((1, 1), (1, 2)),
+    )
+
+    assert data.belt_eligible(1, 2)
+    assert not data.belt_eligible(1, 5)
+    assert data.belt_eligible(2, 5)
+    assert not data.belt_eligible(2, 1)
+    assert data.belt_eligible(4, 1)
+    assert data.find_tournament_category("juniors").id == 1
+    assert data.find_tournament_category("Sparring/Open").id == 2
+    assert data.find_tournament_category("Open") is None  # ambiguous
+    assert data.find_tournament_category("Kata") is None
@@ -0,0 +1,71 @@
+import json
+
+from pydantic import BaseModel
+
+from app.response_cache import MemoryBackend, ResponseCache
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+def make_cache():
+    calls = []
+
+    def build(name):
+        def run():
+            calls.append(name)
+            return [{"id": len(calls), "name": name}]
+        return run
+
+    return ResponseCache(MemoryBackend(maxsize=16, ttl=60), ttl=60), calls, build
+
+
+def test_hit_skips_build():
+    cache, calls, build = make_cache()
+    first = cache.json("items", 1, ["person:1"], build("a"), list[Item])
+    second = cache.json("items", 1, ["person:1"], build("a"), list[Item])
+
+    assert calls == ["a"]
+    assert first.body == second.body
+    assert json.loads(second.body) == [{"id": 1, "name": "a"}]
+    assert second.media_type == "application/json"
+
+
+def test_invalidate_only_affects_tagged_entries():
+    cache, calls, build = make_cache()
+    cache.json("items", 1, ["person:1"], build("a"), list[Item])
+    cache.json("items", 2, ["person:2"], build("b"), list[Item])
+
+    cache.invalidate("person:1")
+    cache.json("items", 1, ["person:1"], build("a"), list[Item])
+    cache.json("items", 2, ["person:2"], build("b"), list[Item])
+
+    assert calls == ["a", "b", "a"]
+
+
+def test_build_racing_a_write_is_not_served_afterwards():
+    cache, calls, build = make_cache()
+
+    def racing():
+        # The write commits and invalidates while this read is still building
+        cache.invalidate("person:1")
+        return build("stale")()
+
+    cache.json("items", 1, ["person:1"], racing, list[Item])
+    fresh = cache.json("items", 1, ["person:1"], build("fresh"), list[Item])
+
+    assert json.loads(fresh.body)[0]["name"] == "fresh"
+
+
+def test_headers_and_attribute_objects():
+    cache, _, _ = make_cache()
+
+    class Row:
+        id = 7
+        name = "row"
+
+    response = cache.json("item", 7, [], lambda: Row(), Item, headers={"ETag": '"x"'})
+    assert response.headers["etag"] == '"x"'
+    assert json.loads(response.body) == {"id": 7, "name": "row"}
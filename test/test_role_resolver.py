@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+from sqlalchemy import Column, MetaData, Table, Text, Uuid, create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models
+from app.cache import TTLCache
+from app.role_resolver import RoleResolver, role_resolver
+
+USER_ID = uuid.UUID("4a2e1f0c-0000-4000-8000-000000000001")
+EMAIL = "instructor@example.com"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    # Same columns as models.Users, without the Postgres-only server default
+    Table("users", MetaData(), Column("id", Uuid, primary_key=True), Column("role", Text), Column("email", Text)).create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    session = sessionmaker(bind=engine)()
+    session.add(models.Users(id=USER_ID, email=EMAIL, role="user"))
+    session.commit()
+    statements.clear()
+    session.info["statements"] = statements
+
+    role_resolver.clear()
+    yield session
+    session.close()
+    role_resolver.clear()
+
+
+def user_queries(db):
+    return [s for s in db.info["statements"] if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_repeat_lookups_served_from_cache(db):
+    resolver = RoleResolver(TTLCache(maxsize=10, ttl=60))
+
+    first = resolver.resolve(db, EMAIL)
+    second = resolver.resolve(db, EMAIL)
+
+    assert first.role == "user"
+    assert second is first
+    assert resolver.get_cached(USER_ID) is first
+    assert len(user_queries(db)) == 1
+
+
+def test_unknown_user_is_not_cached(db):
+    resolver = RoleResolver(TTLCache(maxsize=10, ttl=60))
+
+    assert resolver.resolve(db, "nobody@example.com") is None
+    assert resolver.resolve(db, "nobody@example.com") is None
+    assert len(user_queries(db)) == 2
+
+
+def test_update_user_role_invalidates_cache(db):
+    assert role_resolver.resolve(db, EMAIL).role == "user"
+
+    crud.update_user_role(db, USER_ID, "admin")
+
+    assert role_resolver.get_cached(USER_ID) is None
+    assert role_resolver.resolve(db, EMAIL).role == "admin"
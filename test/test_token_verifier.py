@@ -0,0 +1,224 @@
+import asyncio
+import gc
+import json
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.cache import TTLCache
+from app.exceptions import UnauthorizedError
+from app.token_verifier import TokenVerifier
+
+KID = "test-key"
+USER_ID = "4a2e1f0c-0000-4000-8000-000000000001"
+HS_SECRET = "super-secret-jwt-token-with-at-least-32-characters"
+
+
+class StandInSupabase:
+    """Local stand-in for the Supabase auth endpoints that counts every hit."""
+
+    def __init__(self):
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(self.private_key.public_key()))
+        public_jwk.update({"kid": KID, "alg": "RS256", "use": "sig"})
+        self.jwks = {"keys": [public_jwk]}
+        self.hits = {"jwks": 0, "user": 0}
+        self.user_status = 200
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like Supabase
+
+            def do_GET(self):
+                if self.path == "/auth/v1/.well-known/jwks.json":
+                    stand_in.hits["jwks"] += 1
+                    self._reply(200, stand_in.jwks)
+                elif self.path == "/auth/v1/user":
+                    stand_in.hits["user"] += 1
+                    body = {"id": USER_ID, "email": "remote@example.com", "role": "authenticated"}
+                    self._reply(stand_in.user_status, body)
+                else:
+                    self._reply(404, {})
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def total_hits(self):
+        return sum(self.hits.values())
+
+
+@pytest.fixture
+def supabase():
+    stand_in = StandInSupabase()
+    stand_in.thread.start()
+    yield stand_in
+    stand_in.server.shutdown()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_claims(**overrides):
+    claims = {
+        "sub": USER_ID,
+        "aud": "authenticated",
+        "role": "authenticated",
+        "email": "student@example.com",
+        "exp": int(time.time()) + 3600,
+    }
+    claims.update(overrides)
+    return claims
+
+
+def rs256_token(supabase, **overrides):
+    return jwt.encode(make_claims(**overrides), supabase.private_key, algorithm="RS256", headers={"kid": KID})
+
+
+def test_jwks_token_verified_locally_and_cached(supabase):
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = rs256_token(supabase)
+
+    user = run(verifier.verify(token))
+    assert user["id"] == USER_ID
+    assert user["email"] == "student@example.com"
+    assert supabase.hits == {"jwks": 1, "user": 0}
+
+    # Cache hit: no outbound call at all
+    hits_before = supabase.total_hits()
+    assert run(verifier.verify(token)) == user
+    assert supabase.total_hits() == hits_before
+
+
+def test_hs256_token_verified_with_secret_without_network(supabase):
+    verifier = TokenVerifier(supabase.url, "anon", jwt_secret=HS_SECRET)
+    token = jwt.encode(make_claims(), HS_SECRET, algorithm="HS256")
+
+    assert run(verifier.verify(token))["id"] == USER_ID
+    assert supabase.total_hits() == 0
+
+
+def test_falls_back_to_supabase_once_then_caches(supabase):
+    # No secret configured, so HS256 tokens can only be checked remotely
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = jwt.encode(make_claims(), HS_SECRET, algorithm="HS256")
+
+    assert run(verifier.verify(token))["email"] == "remote@example.com"
+    assert run(verifier.verify(token))["email"] == "remote@example.com"
+    assert supabase.hits["user"] == 1
+
+
+def test_expired_token_rejected_locally(supabase):
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = rs256_token(supabase, exp=int(time.time()) - 60)
+
+    with pytest.raises(UnauthorizedError):
+        run(verifier.verify(token))
+    assert supabase.hits["user"] == 0
+
+
+def test_bad_signature_rejected(supabase):
+    verifier = TokenVerifier(supabase.url, "anon", jwt_secret=HS_SECRET)
+    token = jwt.encode(make_claims(), "a-different-secret-that-is-long-enough!!", algorithm="HS256")
+
+    with pytest.raises(UnauthorizedError):
+        run(verifier.verify(token))
+
+
+def test_remote_rejection_is_not_cached(supabase):
+    supabase.user_status = 401
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = jwt.encode(make_claims(), HS_SECRET, algorithm="HS256")
+
+    for _ in range(2):
+        with pytest.raises(UnauthorizedError):
+            run(verifier.verify(token))
+    assert supabase.hits["user"] == 2
+
+
+def test_cache_entry_expires_with_token():
+    now = [1000.0]
+    cache = TTLCache(maxsize=2, ttl=300, timer=lambda: now[0])
+    cache.set("a", 1, ttl=10)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert "a" not in cache  # evicted, least recently used
+    now[0] += 301
+    assert cache.get("b") is None
+
+
+def test_concurrent_verifications_share_one_client(supabase):
+    verifier = TokenVerifier(supabase.url, "anon", max_concurrency=2)
+    tokens = [jwt.encode(make_claims(sub=f"user-{i}"), HS_SECRET, algorithm="HS256") for i in range(10)]
+
+    async def verify_all():
+        users = await asyncio.gather(*(verifier.verify(token) for token in tokens))
+        client = verifier._client
+        await verifier.aclose()
+        return users, client
+
+    users, client = run(verify_all())
+    assert len(users) == 10
+    assert client.is_closed
+    assert supabase.hits["user"] == 10
+
+
+def test_client_from_a_finished_loop_is_released(supabase):
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = jwt.encode(make_claims(), HS_SECRET, algorithm="HS256")
+
+    async def verify_remotely():
+        verifier.invalidate(token)
+        await verifier.verify(token)
+        return weakref.ref(verifier._client)
+
+    first = run(verify_remotely())
+    second = run(verify_remotely())
+    gc.collect()
+
+    assert second() is not None
+    assert first() is None
+    assert supabase.hits["user"] == 2
+
+
+def test_client_on_a_running_loop_is_closed_there(supabase):
+    verifier = TokenVerifier(supabase.url, "anon")
+    token = jwt.encode(make_claims(), HS_SECRET, algorithm="HS256")
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(verifier.verify(token), other).result(timeout=5)
+        first = verifier._client
+
+        verifier.invalidate(token)
+        run(verifier.verify(token))
+        deadline = time.monotonic() + 5
+        while not first.is_closed and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert first.is_closed
+        assert verifier._client is not first
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(timeout=5)
+        other.close()
@@ -0,0 +1,9 @@
+# vecel/reference.py
+"""
+Serverless entry point for the reference data: belts, roles, age categories
+and locations. Mounts only those routers, so a cold start skips importing
+and routing the rest of the API (see app/factory.py).
+"""
+from app.factory import create_app
+
+app = create_app(["belts", "role", "age_category", "location"])